@@ -78,6 +78,8 @@ from utils.utils import (
     initialize_logger,
     construct_message_link,
     check_message_for_sentences,
+    get_message_features,
+    canonicalize_text,
     get_latest_commit_info,
     extract_spammer_info,
     get_daily_spam_filename,
@@ -94,7 +96,8 @@ from utils.utils import (
     has_spam_entities,
     load_predetermined_sentences,
     # get_spammer_details,  # Add this line
-    store_message_to_db,
+    message_to_db_row,
+    store_messages_to_db,
     compute_message_hash,
     db_init,
     create_inline_keyboard,
@@ -115,23 +118,74 @@ from utils.utils import (
     get_user_baseline,
     get_active_user_baselines,
     update_user_baseline_status,
+    save_monitoring_schedule,
+    check_query_plans,
+    USER_MESSAGE_COUNT_QUERY,
+    USER_FIRST_MESSAGE_QUERY,
+    DUPLICATE_MESSAGES_QUERY,
+    DUPLICATE_USER_MESSAGES_QUERY,
+    REPORTED_MESSAGE_QUERY,
+    SPAMMER_DETAILS_QUERY,
+    SPAMMER_BY_SENDER_CONDITION,
+    SPAMMER_BY_CONTENT_HASH_CONDITION,
+    SPAMMER_BY_VIA_BOT_CONDITION,
+    SPAMMER_BY_DATE_CONDITION,
+    SPAMMER_BY_USER_ID_CONDITION,
+    SPAMMER_BY_FORWARDED_FROM_CONDITION,
+    to_epoch,
+    EPOCH_COLUMNS,
+    backfill_epoch_columns,
     # Banned users DB functions
     add_banned_user,
     is_user_banned,
     get_banned_users_count,
     get_banned_users,
     get_banned_user_ids,
+    add_known_spam_hashes,
+    load_known_spam_hashes,
+    record_known_spam_hit,
+    set_deletion_reasons,
     unban_user as db_unban_user,
     # Whois lookup
     get_user_whois,
     format_whois_response,
 )
 
-# Track usernames already posted to TECHNO_NAMES to avoid duplicates in runtime
-POSTED_USERNAMES = set()  # stores normalized usernames without '@'
-
 # Duration in hours for user monitoring after join/leave events
 MONITORING_DURATION_HOURS = 24
+
+# Monitoring ladder: seconds since monitoring start of each perform_checks() step
+MONITORING_SLEEP_TIMES = [
+    65,  # 1 min
+    185,  # 3 min
+    305,  # 5 min
+    605,  # 10 min
+    1205,  # 20 min
+    1805,  # 30 min
+    3605,  # 1 hr
+    7205,  # 2 hr
+    10805,  # 3 hr
+    21605,  # 6 hr
+    43205,  # 12 hr
+    MONITORING_DURATION_HOURS * 3600 + 5,  # final check
+]
+from utils.utils_cache import (
+    AdminRosterCache,
+    ExpiringDict,
+    ExpiringSet,
+    KnownSpamSet,
+    MembershipCache,
+    ProfileSnapshotCache,
+    VerdictCache,
+)
+from utils.utils_scheduler import DueTimeScheduler, ScheduledJob
+from utils.utils_db import AsyncDatabase, WriteBehindBuffer
+from utils.utils_spamwave import SpamWave, SpamWaveDetector
+from utils.utils_webhook import run_webhook
+from utils.utils_pipeline import UpdatePipeline
+from utils.utils_stages import StagedChecks, StageCost
+from utils.utils_ratelimit import ChatFanout, OutboundLane, OutboundScheduler, TokenBucket, outbound_lane
+from utils.utils_logbatch import LogBatcher
 from utils.utils_decorators import (
     is_not_bot_action,
     is_forwarded_from_unknown_channel_message,
@@ -275,6 +329,49 @@ from utils.utils_config import (
     NIGHT_START_MINUTE,
     NIGHT_END_HOUR,
     NIGHT_END_MINUTE,
+    ADMIN_CACHE_TTL_SECONDS,
+    SPAM_CACHE_POSITIVE_TTL_SECONDS,
+    SPAM_CACHE_NEGATIVE_TTL_SECONDS,
+    SPAM_CACHE_MAX_ENTRIES,
+    MONITORING_MAX_CONCURRENCY,
+    DB_READER_POOL_SIZE,
+    INGEST_FLUSH_INTERVAL_MS,
+    INGEST_FLUSH_MAX_ROWS,
+    SPAM_WAVE_WINDOW_SECONDS,
+    SPAM_WAVE_MIN_USERS,
+    SPAM_WAVE_MIN_CHATS,
+    SPAM_WAVE_SIMILARITY_PERCENT,
+    SPAM_WAVE_MAX_ENTRIES,
+    KNOWN_SPAM_MAX_ENTRIES,
+    KNOWN_SPAM_MIN_TEXT_LENGTH,
+    REPORT_TRACKING_TTL_HOURS,
+    REPORT_TRACKING_MAX_ENTRIES,
+    POSTED_USERNAMES_TTL_HOURS,
+    POSTED_USERNAMES_MAX_ENTRIES,
+    UPDATE_WORKERS,
+    UPDATE_QUEUE_SIZE,
+    UPDATE_SHED_PERCENT,
+    BAN_FANOUT_RATE_PER_SECOND,
+    BAN_FANOUT_CONCURRENCY,
+    OUTBOUND_GLOBAL_RATE_PER_SECOND,
+    OUTBOUND_GROUP_RATE_PER_MINUTE,
+    OUTBOUND_PRIVATE_RATE_PER_SECOND,
+    OUTBOUND_LOG_SHED_WAITING,
+    TECHNOLOG_BATCH_WINDOW_MS,
+    MEMBERSHIP_CACHE_TTL_SECONDS,
+    MEMBERSHIP_CACHE_MAX_ENTRIES,
+    MEMBERSHIP_PROBE_CONCURRENCY,
+    PROFILE_SNAPSHOT_TTL_SECONDS,
+    PROFILE_SNAPSHOT_MAX_ENTRIES,
+    UPDATES_MODE,
+    WEBHOOK_BASE_URL,
+    WEBHOOK_PATH,
+    WEBHOOK_LISTEN_HOST,
+    WEBHOOK_LISTEN_PORT,
+    WEBHOOK_SECRET,
+    WEBHOOK_SSL_CERT,
+    WEBHOOK_SSL_KEY,
+    WEBHOOK_MAX_CONNECTIONS,
 )
 
 # Parse command line arguments
@@ -356,26 +453,34 @@ def reset_session_ban_count() -> None:
 # Populated when processing messages, used for constructing public links
 chat_username_cache: dict[int, str | None] = {}
 
+# Duplicate-report trackers below forget entries after REPORT_TRACKING_TTL_HOURS
+# (or once REPORT_TRACKING_MAX_ENTRIES is exceeded, oldest first)
+_REPORT_TRACKING_TTL = REPORT_TRACKING_TTL_HOURS * 3600
+
 # Track messages that have been sent to autoreport to prevent duplicate suspicious notifications
-# Key: (chat_id, message_id) - cleared periodically or on message processing completion
-autoreported_messages: set[tuple[int, int]] = set()
+# Key: (chat_id, message_id) - cleared on message processing completion or after the TTL
+autoreported_messages = ExpiringSet(_REPORT_TRACKING_TTL, REPORT_TRACKING_MAX_ENTRIES)
 
 # Track users who have been autoreported (by user_id) to prevent duplicate reports
 # Key: user_id - once a user has been autoreported, don't autoreport again until they're processed
-autoreported_users: set[int] = set()
+autoreported_users = ExpiringSet(_REPORT_TRACKING_TTL, REPORT_TRACKING_MAX_ENTRIES)
 
 # Track messages that have been sent to suspicious thread to prevent duplicate reports
 # Key: (chat_id, message_id) - prevents same message being reported twice
-suspicious_reported_messages: set[tuple[int, int]] = set()
+suspicious_reported_messages = ExpiringSet(_REPORT_TRACKING_TTL, REPORT_TRACKING_MAX_ENTRIES)
 
 # Track users who have been reported to suspicious thread (by user_id) to prevent duplicate reports
 # Key: user_id - once a user has been suspicious reported, don't report again until they're processed
-suspicious_reported_users: set[int] = set()
+suspicious_reported_users = ExpiringSet(_REPORT_TRACKING_TTL, REPORT_TRACKING_MAX_ENTRIES)
 
 # Track processed media groups to prevent duplicate reports for multi-photo messages
-# Key: (chat_id, media_group_id) - cleared after 60 seconds
-processed_media_groups: dict[tuple[int, str], float] = {}
+# Key: (chat_id, media_group_id) - forgotten after MEDIA_GROUP_EXPIRY_SECONDS
 MEDIA_GROUP_EXPIRY_SECONDS = 60  # How long to remember processed media groups
+processed_media_groups = ExpiringSet(MEDIA_GROUP_EXPIRY_SECONDS, REPORT_TRACKING_MAX_ENTRIES)
+
+# Track usernames already posted to TECHNO_NAMES to avoid duplicates in runtime
+# Stores normalized usernames without '@'
+POSTED_USERNAMES = ExpiringSet(POSTED_USERNAMES_TTL_HOURS * 3600, POSTED_USERNAMES_MAX_ENTRIES)
 
 
 def was_autoreported(message: Message) -> bool:
@@ -439,22 +544,13 @@ def was_media_group_processed(message: Message) -> bool:
         return False  # Not a media group, process normally
     
     key = (message.chat.id, message.media_group_id)
-    current_time = datetime.now().timestamp()
-    
-    # Clean up old entries
-    expired_keys = [
-        k for k, v in processed_media_groups.items() 
-        if current_time - v > MEDIA_GROUP_EXPIRY_SECONDS
-    ]
-    for k in expired_keys:
-        del processed_media_groups[k]
-    
-    # Check if already processed
+
+    # Check if already processed (entries expire after MEDIA_GROUP_EXPIRY_SECONDS)
     if key in processed_media_groups:
         return True  # Already processed, skip
     
     # Mark as processed
-    processed_media_groups[key] = current_time
+    processed_media_groups.add(key)
     return False  # First message in group, process it
 
 
@@ -470,7 +566,11 @@ async def send_json_to_technolog(message: Message, reason: str, logger=None):
         logger: Optional logger instance for error logging
     """
     _logger = logger or LOGGER
-    
+
+    # Debug dump only: skipped while the update queue is backed up
+    if shed_optional_output("technolog_json"):
+        return
+
     # Serialize message to JSON
     try:
         message_dict = message.model_dump(mode="json")
@@ -538,9 +638,6 @@ async def send_json_to_technolog(message: Message, reason: str, logger=None):
                 message_thread_id=TECHNO_IN,
                 disable_web_page_preview=True,
             )
-            # Small delay between messages to avoid rate limiting
-            if i < total_parts:
-                await asyncio.sleep(0.3)
 
 
 def move_user_to_banned(
@@ -588,9 +685,9 @@ def move_user_to_banned(
         active_user_checks_dict.pop(user_id, None)
     banned_user_ids.add(user_id)
     increment_session_ban_count()
-    # Update database with full ban details
-    update_user_baseline_status(
-        CONN, user_id,
+    # Update database with full ban details (queued on the DB writer thread)
+    DB.submit_write(
+        update_user_baseline_status, user_id,
         monitoring_active=False,
         is_banned=True,
         ban_reason=ban_reason,
@@ -640,17 +737,168 @@ async def close_http_session():
 
 
 # Setting up SQLite Database
-CONN = sqlite3.connect("messages.db")
+# All runtime DB access goes through DB: writes on one writer thread, reads on a
+# pool of WAL reader connections, so commits and slow queries don't block the loop.
+# DB.conn is used directly only here, before the event loop starts.
+DB = AsyncDatabase("messages.db", readers=DB_READER_POOL_SIZE, logger=LOGGER)
 try:
-    _journal_mode = CONN.execute("PRAGMA journal_mode=WAL").fetchone()
-    CONN.execute("PRAGMA synchronous=NORMAL")
-    CONN.execute("PRAGMA busy_timeout=5000")
+    _journal_mode = DB.conn.execute("PRAGMA journal_mode=WAL").fetchone()
+    DB.conn.execute("PRAGMA synchronous=NORMAL")
     if _journal_mode and _journal_mode[0].lower() != "wal":
         LOGGER.warning("SQLite journal_mode is %s (expected WAL)", _journal_mode[0])
 except sqlite3.Error as e:
     LOGGER.warning("Failed to apply SQLite PRAGMAs: %s", e)
-CURSOR = CONN.cursor()
-db_init(CURSOR, CONN)
+db_init(DB.conn.cursor(), DB.conn)
+# Warn early if a hot query regressed to a full table scan
+check_query_plans(DB.conn, LOGGER)
+# Incoming messages are group-committed; lookups that must see the message
+# just received await INGEST_BUFFER.barrier()/flush() before querying.
+# Buffered rows never carry join/left markers, so check_user_legit() needs none.
+INGEST_BUFFER = WriteBehindBuffer(
+    DB,
+    lambda conn, rows: store_messages_to_db(conn.cursor(), conn, rows),
+    flush_interval_ms=INGEST_FLUSH_INTERVAL_MS,
+    max_rows=INGEST_FLUSH_MAX_ROWS,
+    logger=LOGGER,
+    name="ingest",
+)
+
+# Every update passes through a bounded worker pool before reaching the handlers
+# (registered as outer middleware in main()); same-user updates in a chat keep their order
+UPDATE_PIPELINE = UpdatePipeline(
+    workers=UPDATE_WORKERS,
+    max_queue=UPDATE_QUEUE_SIZE,
+    shed_ratio=UPDATE_SHED_PERCENT / 100,
+    logger=LOGGER,
+)
+
+# Every Bot API call waits for the global token bucket (message sends also for
+# their chat's bucket); a RetryAfter pauses all outbound calls. Waiting calls are
+# served moderation first, then admin alerts, then TECHNOLOG_GROUP_ID output
+OUTBOUND_SCHEDULER = OutboundScheduler(
+    global_rate=OUTBOUND_GLOBAL_RATE_PER_SECOND,
+    group_rate_per_minute=OUTBOUND_GROUP_RATE_PER_MINUTE,
+    private_rate=OUTBOUND_PRIVATE_RATE_PER_SECOND,
+    log_chat_ids={TECHNOLOG_GROUP_ID},
+    log_shed_waiting=OUTBOUND_LOG_SHED_WAITING,
+    logger=LOGGER,
+)
+BOT.session.middleware(OUTBOUND_SCHEDULER)
+
+
+async def _send_technolog_batch(chat_id: int, thread_id: int, text: str):
+    return await safe_send_message(
+        BOT,
+        chat_id,
+        text,
+        LOGGER,
+        parse_mode="HTML",
+        message_thread_id=thread_id,
+        disable_web_page_preview=True,
+    )
+
+
+# Short TECHNOLOG log lines (TECHNO_NAMES, notices) are packed per thread and sent
+# every TECHNOLOG_BATCH_WINDOW_MS instead of one message per line
+TECHNOLOG_BATCHER = LogBatcher(
+    _send_technolog_batch,
+    window_seconds=TECHNOLOG_BATCH_WINDOW_MS / 1000,
+    max_length=MAX_TELEGRAM_MESSAGE_LENGTH,
+    logger=LOGGER,
+    name="technolog",
+)
+
+
+def shed_optional_output(kind: str) -> bool:
+    """True if optional debug/log output of this kind should be skipped now.
+
+    That is while updates are backed up in UPDATE_PIPELINE or too many
+    TECHNOLOG messages already wait in the outbound log lane.
+    """
+    return UPDATE_PIPELINE.should_shed(kind) or OUTBOUND_SCHEDULER.should_shed(kind)
+
+
+# Bans/unbans over all monitored chats run concurrently under one token bucket;
+# a RetryAfter from any chat pauses all of them
+BAN_FANOUT = ChatFanout(
+    TokenBucket(BAN_FANOUT_RATE_PER_SECOND),
+    concurrency=BAN_FANOUT_CONCURRENCY,
+    logger=LOGGER,
+)
+
+
+# Admin roster cache for is_admin() - avoids get_chat_administrators on every message
+ADMIN_ROSTER_CACHE = AdminRosterCache(
+    BOT.get_chat_administrators, ttl_seconds=ADMIN_CACHE_TTL_SECONDS, logger=LOGGER
+)
+_ADMIN_STATUSES = {ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.CREATOR}
+
+# Who is (not) a member of which monitored chat, for get_user_other_chats();
+# kept current from chat_member updates, messages and bans
+CHAT_MEMBERSHIP = MembershipCache(
+    ttl=MEMBERSHIP_CACHE_TTL_SECONDS, max_entries=MEMBERSHIP_CACHE_MAX_ENTRIES
+)
+# Actually a member (not left/kicked/restricted)
+_MEMBER_STATUSES = {ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.CREATOR}
+
+
+def remember_chat_membership(chat_id: int, user_id: int, status) -> bool:
+    """Cache whether status means user_id is a member of chat_id and return it."""
+    is_member = status in _MEMBER_STATUSES
+    CHAT_MEMBERSHIP.set(chat_id, user_id, is_member)
+    return is_member
+
+
+# Latest names/username/photo count per user for profile-change checks;
+# names come with updates, photo counts from the monitoring steps (perform_checks)
+PROFILE_SNAPSHOTS = ProfileSnapshotCache(
+    ttl=PROFILE_SNAPSHOT_TTL_SECONDS, max_entries=PROFILE_SNAPSHOT_MAX_ENTRIES
+)
+
+
+async def refresh_profile_snapshot(user_id: int, chat_id: int | None = None):
+    """Ask Telegram for the current profile of user_id and cache it.
+
+    Names come from getChatMember in chat_id (skipped without one), the
+    photo count from getUserProfilePhotos. Returns the snapshot, or None
+    if the photo count could not be fetched.
+    """
+    if chat_id:
+        try:
+            member = await BOT.get_chat_member(chat_id, user_id)
+            remember_chat_membership(chat_id, user_id, member.status)
+            PROFILE_SNAPSHOTS.observe(member.user)
+        except (TelegramBadRequest, TelegramForbiddenError) as e:
+            LOGGER.debug("%s unable to fetch chat member for profile snapshot: %s", user_id, e)
+    try:
+        photos = await BOT.get_user_profile_photos(user_id, limit=1)
+    except (TelegramBadRequest, TelegramForbiddenError) as e:
+        LOGGER.debug("%s unable to fetch photo count for profile snapshot: %s", user_id, e)
+        return None
+    PROFILE_SNAPSHOTS.set_photo_count(user_id, getattr(photos, "total_count", 0) if photos else 0)
+    return PROFILE_SNAPSHOTS.get(user_id)
+
+
+async def get_profile_photo_count(user_id: int, default: int = 0) -> int:
+    """Fetch the current profile photo count of user_id for a baseline or comparison."""
+    snapshot = await refresh_profile_snapshot(user_id)
+    return snapshot.photo_count if snapshot else default
+
+
+def invalidate_admin_cache_on_update(update: ChatMemberUpdated):
+    """Drop the cached admin roster if the update promotes or demotes someone."""
+    old_is_admin = update.old_chat_member.status in _ADMIN_STATUSES
+    new_is_admin = update.new_chat_member.status in _ADMIN_STATUSES
+    if old_is_admin or new_is_admin:
+        ADMIN_ROSTER_CACHE.invalidate(update.chat.id)
+        LOGGER.info(
+            "\033[95mAdmin roster cache invalidated for %s: %s:%s %s --> %s\033[0m",
+            update.chat.id,
+            update.new_chat_member.user.id,
+            format_username_for_log(update.new_chat_member.user.username),
+            update.old_chat_member.status,
+            update.new_chat_member.status,
+        )
 
 
 def update_chat_username_cache(chat_id: int, username: str | None):
@@ -713,7 +961,7 @@ def build_chat_link(chat_id: int, chat_username: str | None = None, chat_title:
         return f"<a href='https://t.me/c/{chat_id_str}'>{title}</a>"
 
 
-def get_spammer_details(
+async def get_spammer_details(
     spammer_id,
     spammer_first_name,
     spammer_last_name,
@@ -765,16 +1013,22 @@ def get_spammer_details(
         via_bot_id,
     )
 
-    # Common SQL and parameters for both cases
-    base_query = """
-        SELECT chat_id, message_id, chat_username, user_id, user_name, user_first_name, user_last_name, received_date
-        FROM recent_messages
-        WHERE {condition} AND new_chat_member IS NULL AND left_chat_member IS NULL
-        ORDER BY received_date DESC
-        LIMIT 1
-    """
+    # The forwarded original may have arrived a moment ago and still be buffered
+    await INGEST_BUFFER.flush()
+
+    # Common SQL (shared with the startup query plan check) and parameters
+    base_query = SPAMMER_DETAILS_QUERY
+    # Dates are matched on the indexed epoch columns (text dates mix naive and +00:00 formats);
+    # rows not backfilled yet are matched on the text date, as naive UTC
+    message_forward_ts = to_epoch(message_forward_date)
+    message_forward_text = (
+        datetime.fromtimestamp(message_forward_ts, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        if message_forward_ts is not None
+        else None
+    )
     params = {
-        "message_forward_date": message_forward_date,
+        "message_forward_ts": message_forward_ts,
+        "message_forward_text": message_forward_text,
         "sender_first_name": spammer_first_name,
         "sender_last_name": spammer_last_name,
         "from_chat_title": forward_from_chat_title,
@@ -786,59 +1040,47 @@ def get_spammer_details(
 
     if (not forwarded_from_id) and (forward_sender_name != "Deleted Account"):
         # This is not a forwarded forwarded message
-        # Use REPLACE to strip +00:00 for compatibility with old DB records stored without timezone
-        condition = (
-            "(user_first_name = :sender_first_name AND REPLACE(received_date, '+00:00', '') = REPLACE(:message_forward_date, '+00:00', ''))"
-            " OR (user_id = :user_id)"
-            " OR (from_chat_title = :from_chat_title)"
-            " OR (user_id = :user_id AND user_first_name = :sender_first_name AND user_last_name = :sender_last_name)"
-            " OR (forward_sender_name = :forward_sender_name AND REPLACE(forward_date, '+00:00', '') = REPLACE(:message_forward_date, '+00:00', ''))"
-        )
+        condition = SPAMMER_BY_SENDER_CONDITION
         # Add content hash condition for precise matching (privacy-preserving)
         if message_content_hash:
-            condition += " OR (message_content_hash = :message_content_hash)"
-        # Add via_bot_id condition for inline bot messages (e.g., @postbot)
+            condition += f" OR ({SPAMMER_BY_CONTENT_HASH_CONDITION})"
+        # Add via_bot_id condition for inline bot messages (e.g., @postbot):
+        # by date, and by via_bot_id + first_name (name from forward_sender_name)
         if via_bot_id:
-            condition += " OR (via_bot_id = :via_bot_id AND REPLACE(received_date, '+00:00', '') = REPLACE(:message_forward_date, '+00:00', ''))"
-            # Also try matching by via_bot_id + first_name (name from forward_sender_name)
-            condition += " OR (via_bot_id = :via_bot_id AND user_first_name = :sender_first_name)"
+            condition += f" OR {SPAMMER_BY_VIA_BOT_CONDITION}"
     elif forward_sender_name == "Deleted Account":
         # Manage Deleted Account by message date only
-        condition = "REPLACE(received_date, '+00:00', '') = REPLACE(:message_forward_date, '+00:00', '')"
+        condition = SPAMMER_BY_DATE_CONDITION
         params = {
-            "message_forward_date": message_forward_date,
+            "message_forward_ts": message_forward_ts,
+            "message_forward_text": message_forward_text,
         }
         # Also try content hash for Deleted Accounts
         if message_content_hash:
-            condition += " OR (message_content_hash = :message_content_hash)"
+            condition += f" OR ({SPAMMER_BY_CONTENT_HASH_CONDITION})"
             params["message_content_hash"] = message_content_hash
     elif spammer_id:
         # This is a forwarded forwarded message with known user_id
-        condition = (
-            "(user_id = :user_id)"
-            " OR (user_id = :user_id AND user_first_name = :sender_first_name AND user_last_name = :sender_last_name)"
-        )
-        # Note: forward_date/forwarded_from_id not needed here - condition only uses user_id
+        condition = SPAMMER_BY_USER_ID_CONDITION
+        # Note: forward_ts/forwarded_from_id not needed here - condition only uses user_id
 
     else:
         # This is a forwarded forwarded message
-        condition = (
-            "forwarded_from_id = :forwarded_from_id AND REPLACE(forward_date, '+00:00', '') = REPLACE(:forward_date, '+00:00', '')"
-        )
+        condition = SPAMMER_BY_FORWARDED_FROM_CONDITION
         params.update(
             {
-                "forward_date": message_forward_date,
+                "forward_ts": message_forward_ts,
                 "forwarded_from_id": forwarded_from_id,
             }
         )
 
     query = base_query.format(condition=condition)
-    result = CURSOR.execute(query, params).fetchone()
+    result = await DB.fetchone(query, params)
 
     # Hash-only fallback: if no result and we have a content hash, try matching by hash alone
     if result is None and message_content_hash:
-        hash_query = base_query.format(condition="message_content_hash = :message_content_hash")
-        result = CURSOR.execute(hash_query, {"message_content_hash": message_content_hash}).fetchone()
+        hash_query = base_query.format(condition=SPAMMER_BY_CONTENT_HASH_CONDITION)
+        result = await DB.fetchone(hash_query, {"message_content_hash": message_content_hash})
         if result:
             LOGGER.info(
                 "\033[92mFound sender via content hash fallback (hash=%s...)\033[0m",
@@ -874,7 +1116,7 @@ def get_spammer_details(
     return result
 
 
-def get_duplicate_messages_by_hash(content_hash: str, user_id: int = None) -> list:
+async def get_duplicate_messages_by_hash(content_hash: str, user_id: int = None) -> list:
     """Find all messages with the same content hash (same text sent multiple times).
     
     Spammers often send the same message multiple times to evade single-message deletion.
@@ -890,25 +1132,12 @@ def get_duplicate_messages_by_hash(content_hash: str, user_id: int = None) -> li
     """
     if not content_hash:
         return []
+    await INGEST_BUFFER.barrier(message_content_hash=content_hash)
     
     if user_id:
-        query = """
-            SELECT chat_id, message_id, chat_username
-            FROM recent_messages
-            WHERE message_content_hash = :hash AND user_id = :user_id
-                AND new_chat_member IS NULL AND left_chat_member IS NULL
-            ORDER BY received_date DESC
-        """
-        results = CURSOR.execute(query, {"hash": content_hash, "user_id": user_id}).fetchall()
+        results = await DB.fetchall(DUPLICATE_USER_MESSAGES_QUERY, {"hash": content_hash, "user_id": user_id})
     else:
-        query = """
-            SELECT chat_id, message_id, chat_username
-            FROM recent_messages
-            WHERE message_content_hash = :hash
-                AND new_chat_member IS NULL AND left_chat_member IS NULL
-            ORDER BY received_date DESC
-        """
-        results = CURSOR.execute(query, {"hash": content_hash}).fetchall()
+        results = await DB.fetchall(DUPLICATE_MESSAGES_QUERY, {"hash": content_hash})
     
     return results
 
@@ -943,7 +1172,7 @@ async def submit_autoreport(message: Message, reason):
     # LOGGER.debug("DEBUG")
 
     # process the message automatically
-    found_message_data = get_spammer_details(
+    found_message_data = await get_spammer_details(
         message.from_user.id,
         message.from_user.first_name,
         message.from_user.last_name,
@@ -994,6 +1223,12 @@ async def on_startup():
             LOGGER.warning("Could not get chat info for %s: %s", chat_id, e)
     LOGGER.info("Chat username cache populated with %d entries", len(chat_username_cache))
 
+    # Warm up admin rosters so the first messages don't each hit get_chat_administrators
+    _admin_rosters = await ADMIN_ROSTER_CACHE.warm_up(
+        [*CHANNEL_IDS, ADMIN_GROUP_ID, SUPERADMIN_GROUP_ID]
+    )
+    LOGGER.info("Admin roster cache warmed up for %d chats", _admin_rosters)
+
     _commit_summary = _commit_info.splitlines()[0] if _commit_info else "N/A"
     bot_start_log_message = (
         f"Bot restarted at {bot_start_time} | commit: {_commit_summary} | "
@@ -1047,12 +1282,46 @@ async def on_startup():
     # await BOT.delete_message(-1002331876, 81190)
     # await lols_autoban(5697700097, "on_startup event", "banned during on_startup event")
 
+    INGEST_BUFFER.start()
+
+    # Start the monitoring scheduler before checks are loaded into it
+    MONITORING_SCHEDULER.start()
+
+    UPDATE_PIPELINE.start()
+    LOGGER.info("Message gate order: %s", ", ".join(MESSAGE_GATE.order()))
+
     # Call the function to load and start checks
     asyncio.create_task(load_and_start_checks())
     
     # Start periodic cleanup task for stale monitoring entries
     asyncio.create_task(periodic_stale_monitoring_cleanup())
 
+    # Fill epoch columns of rows stored before they existed, in the background
+    asyncio.create_task(backfill_epoch_timestamps())
+
+
+async def backfill_epoch_timestamps(batch_size: int = 5000, pause: float = 0.05):
+    """Backfill the integer epoch columns of pre-existing rows in small batches.
+
+    Each batch is its own transaction and the loop yields between batches,
+    so message handling is not blocked. Progress is kept in db_meta and a
+    finished table costs a single lookup on later starts.
+    """
+    for table in EPOCH_COLUMNS:
+        total = 0
+        while True:
+            try:
+                visited = await DB.write(backfill_epoch_columns, table, batch_size)
+            except sqlite3.Error as e:
+                LOGGER.error("Epoch backfill of %s failed after %d rows: %s", table, total, e)
+                break
+            if not visited:
+                break
+            total += visited
+            await asyncio.sleep(pause)
+        if total:
+            LOGGER.info("Epoch backfill of %s complete: %d rows", table, total)
+
 
 async def periodic_stale_monitoring_cleanup():
     """Periodically clean up stale monitoring entries.
@@ -1060,7 +1329,7 @@ async def periodic_stale_monitoring_cleanup():
     This task runs every hour and checks for users in the database with
     monitoring_active=1 where the record hasn't been updated in over MONITORING_DURATION_HOURS.
     
-    Uses updated_at instead of joined_at to handle cases where monitoring is
+    Uses updated_ts instead of joined_ts to handle cases where monitoring is
     restarted manually (e.g., by admin command or triggered by unusual user activity).
     
     This handles edge cases where perform_checks() tasks may have crashed or
@@ -1073,34 +1342,28 @@ async def periodic_stale_monitoring_cleanup():
         
         try:
             # Get all active baselines from DB
-            baselines = get_active_user_baselines(CONN)
+            baselines = await DB.read(get_active_user_baselines)
             stale_count = 0
-            now_utc = datetime.now(timezone.utc)
+            now_ts = time.time()
             
             for baseline in baselines:
                 user_id = baseline["user_id"]
-                # Use updated_at to handle restarted monitoring; fall back to joined_at
-                timestamp_str = baseline.get("updated_at") or baseline.get("joined_at")
-                
-                if not timestamp_str:
-                    continue
+                # Use updated_ts to handle restarted monitoring; fall back to joined_ts
+                record_ts = baseline.get("updated_ts") or baseline.get("joined_ts")
                 
-                try:
-                    record_time = datetime.fromisoformat(timestamp_str.replace(" ", "T"))
-                    # Handle naive timestamps (legacy UTC data)
-                    if record_time.tzinfo is None:
-                        record_time = record_time.replace(tzinfo=timezone.utc)
-                except ValueError:
+                if not record_ts:
                     continue
                 
-                elapsed_hours = (now_utc - record_time).total_seconds() / 3600
+                elapsed_hours = (now_ts - record_ts) / 3600
                 
                 # If monitoring should have completed (24hrs + 1hr grace period)
                 if elapsed_hours > MONITORING_DURATION_HOURS + 1:
                     username = baseline.get("username") or "!UNDEFINED!"
                     
-                    # Check if there's actually a running task for this user
-                    has_running_task = user_id in running_watchdogs and not running_watchdogs[user_id].done()
+                    # Check if there's actually a live schedule or running task for this user
+                    has_running_task = user_id in MONITORING_SCHEDULER or (
+                        user_id in running_watchdogs and not running_watchdogs[user_id].done()
+                    )
                     
                     if not has_running_task:
                         LOGGER.warning(
@@ -1108,9 +1371,7 @@ async def periodic_stale_monitoring_cleanup():
                             "(last updated %.1f hrs ago) with no running task - marking as complete\033[0m",
                             user_id,
                             format_username_for_log(username),
-                            (now_utc - datetime.fromisoformat(
-                                (baseline.get("joined_at") or timestamp_str).replace(" ", "T")
-                            ).replace(tzinfo=timezone.utc)).total_seconds() / 3600 if baseline.get("joined_at") else elapsed_hours,
+                            (now_ts - baseline["joined_ts"]) / 3600 if baseline.get("joined_ts") else elapsed_hours,
                             elapsed_hours,
                         )
                         
@@ -1119,7 +1380,7 @@ async def periodic_stale_monitoring_cleanup():
                             del active_user_checks_dict[user_id]
                         
                         # Mark monitoring as ended in database
-                        update_user_baseline_status(CONN, user_id, monitoring_active=False, is_legit=True)
+                        await DB.write(update_user_baseline_status, user_id, monitoring_active=False, is_legit=True)
                         stale_count += 1
             
             if stale_count > 0:
@@ -1146,9 +1407,6 @@ async def ban_rogue_chat_everywhere(
         - channel_username: Username of the rogue channel
         - failed_chats: List of (chat_id, error_message) tuples for failed bans
     """
-    failed_chats = []  # List of (chat_id, error) tuples
-    success_count = 0
-
     # Try to get chat information, handle case where bot is not a member
     try:
         chat = await BOT.get_chat(rogue_chat_id)
@@ -1164,32 +1422,30 @@ async def ban_rogue_chat_everywhere(
         rogue_chat_name = "!ROGUECHAT!"
         rogue_chat_username = "!ROGUECHAT!"
 
-    for chat_id in chan_list:
-        try:
-            await BOT.ban_chat_sender_chat(chat_id, rogue_chat_id)
-            success_count += 1
-            await asyncio.sleep(1)  # pause 1 sec
-        except (TelegramBadRequest, TelegramForbiddenError) as e:  # if bot not in chat or channel deleted
-            LOGGER.warning(
-                "\033[93m%s:%s error banning in chat %s: %s. Bot not in chat or channel deleted?\033[0m",
-                rogue_chat_id,
-                format_username_for_log(rogue_chat_username),
-                chat_id,
-                e,
-            )
-            failed_chats.append((chat_id, str(e)))
+    results = await BAN_FANOUT.run(
+        chan_list, lambda chat_id: BOT.ban_chat_sender_chat(chat_id, rogue_chat_id)
+    )
+    success_count = sum(result.ok for result in results)
+    failed_chats = []  # List of (chat_id, error) tuples
+    for result in results:
+        if result.ok:
             continue
+        # bot not in chat or channel deleted
+        LOGGER.warning(
+            "\033[93m%s:%s error banning in chat %s: %s. Bot not in chat or channel deleted?\033[0m",
+            rogue_chat_id,
+            format_username_for_log(rogue_chat_username),
+            result.chat_id,
+            result.error,
+        )
+        failed_chats.append((result.chat_id, result.error))
 
     # report rogue chat to the p2p server
     await report_spam_2p2p(rogue_chat_id, LOGGER, rogue_chat_username)
-    await safe_send_message(
-        BOT,
+    TECHNOLOG_BATCHER.add(
         TECHNOLOG_GROUP_ID,
-        f"Channel {rogue_chat_name} @{rogue_chat_username}(<code>{rogue_chat_id}</code>) reported to P2P spamcheck server.",
-        LOGGER,
-        parse_mode="HTML",
-        disable_web_page_preview=True,
-        message_thread_id=TECHNO_ADMIN,
+        TECHNO_ADMIN,
+        f"Channel {html.escape(rogue_chat_name)} @{rogue_chat_username}(<code>{rogue_chat_id}</code>) reported to P2P spamcheck server.",
     )
 
     if failed_chats:
@@ -1239,24 +1495,24 @@ async def unban_rogue_chat_everywhere(rogue_chat_id: int, chan_list: list) -> tu
         rogue_chat_name = "!ROGUECHAT!"
         rogue_chat_username = "!@ROGUECHAT!"
 
-    for chat_id in chan_list:
-        try:
-            await BOT.unban_chat_sender_chat(chat_id, rogue_chat_id)
-            await asyncio.sleep(1)  # pause 1 sec
-        except TelegramBadRequest as e:
-            # Get chat name from CHANNEL_DICT for better error reporting
-            chat_name = get_channel_name_by_id(CHANNEL_DICT, chat_id) or f"Unknown ({chat_id})"
-            LOGGER.error(
-                "%s %s @%s - error unbanning in chat %s (%s): %s. Deleted CHANNEL?",
-                rogue_chat_id,
-                rogue_chat_name,
-                rogue_chat_username,
-                chat_name,
-                chat_id,
-                e,
-            )
-            failed_chats.append((chat_id, chat_name, str(e)))
+    results = await BAN_FANOUT.run(
+        chan_list, lambda chat_id: BOT.unban_chat_sender_chat(chat_id, rogue_chat_id)
+    )
+    for result in results:
+        if result.ok:
             continue
+        # Get chat name from CHANNEL_DICT for better error reporting
+        chat_name = get_channel_name_by_id(CHANNEL_DICT, result.chat_id) or f"Unknown ({result.chat_id})"
+        LOGGER.error(
+            "%s %s @%s - error unbanning in chat %s (%s): %s. Deleted CHANNEL?",
+            rogue_chat_id,
+            rogue_chat_name,
+            rogue_chat_username,
+            chat_name,
+            result.chat_id,
+            result.error,
+        )
+        failed_chats.append((result.chat_id, chat_name, result.error))
 
     # Note:: Remove rogue chat from the p2p server report list?
     # await unreport_spam(rogue_chat_id, LOGGER)
@@ -1287,6 +1543,10 @@ async def get_user_other_chats(
 ) -> list:
     """
     Check which other monitored chats a user is still a member of.
+
+    Membership known from CHAT_MEMBERSHIP is used as is; the remaining chats
+    are asked with get_chat_member concurrently (at most
+    MEMBERSHIP_PROBE_CONCURRENCY at a time) and the answers are cached.
     
     Args:
         user_id: The user ID to check
@@ -1297,28 +1557,31 @@ async def get_user_other_chats(
     Returns:
         List of tuples (chat_id, chat_name, chat_username) where user is still a member
     """
+    chat_ids = [chat_id for chat_id in channel_ids if chat_id != exclude_chat_id]
+    membership = {chat_id: CHAT_MEMBERSHIP.get(chat_id, user_id) for chat_id in chat_ids}
+    probe_limit = asyncio.Semaphore(MEMBERSHIP_PROBE_CONCURRENCY)
+
+    async def probe(chat_id: int):
+        async with probe_limit:
+            try:
+                member = await BOT.get_chat_member(chat_id, user_id)
+            except TelegramBadRequest as e:
+                # User not in chat or bot can't access - skip silently
+                chat_name = channel_dict.get(chat_id, "Unknown")
+                LOGGER.warning(
+                    "\033[93m%s:!UNDEFINED! Cannot check user in chat %s (%s): %s\033[0m", user_id, chat_name, chat_id, e
+                )
+                return
+        membership[chat_id] = remember_chat_membership(chat_id, user_id, member.status)
+
+    await asyncio.gather(*(probe(chat_id) for chat_id, known in membership.items() if known is None))
+
     other_chats = []
-    for chat_id in channel_ids:
-        if chat_id == exclude_chat_id:
-            continue
-        try:
-            member = await BOT.get_chat_member(chat_id, user_id)
-            # Check if user is actually a member (not left/kicked/restricted)
-            if member.status in (
-                ChatMemberStatus.MEMBER,
-                ChatMemberStatus.ADMINISTRATOR,
-                ChatMemberStatus.CREATOR,
-            ):
-                chat_name = channel_dict.get(chat_id, str(chat_id))
-                chat_username = get_cached_chat_username(chat_id)
-                other_chats.append((chat_id, chat_name, chat_username))
-        except TelegramBadRequest as e:
-            # User not in chat or bot can't access - skip silently
-            chat_name = channel_dict.get(chat_id, "Unknown")
-            LOGGER.warning(
-                "\033[93m%s:!UNDEFINED! Cannot check user in chat %s (%s): %s\033[0m", user_id, chat_name, chat_id, e
-            )
-            continue
+    for chat_id in chat_ids:
+        if membership[chat_id]:
+            chat_name = channel_dict.get(chat_id, str(chat_id))
+            chat_username = get_cached_chat_username(chat_id)
+            other_chats.append((chat_id, chat_name, chat_username))
     return other_chats
 
 
@@ -1384,6 +1647,8 @@ def analyze_mentions_in_message(message) -> dict:
     - Fake mentions: text_link entities with t.me/m/ URLs hidden under @username-like text
     - Plain @username patterns in text
     - Total count of mentions
+
+    Built from the memoized get_message_features(message).
     
     Args:
         message: Telegram message object
@@ -1397,153 +1662,43 @@ def analyze_mentions_in_message(message) -> dict:
             - tme_deeplinks: list of full t.me/m/ URLs found
             - fake_mentions: list of dicts with visible_text and hidden_url for deceptive links
     """
-    # Invisible/zero-width characters commonly used by spammers
-    INVISIBLE_CHARS = {
-        '\u200b',  # Zero-width space
-        '\u200c',  # Zero-width non-joiner
-        '\u200d',  # Zero-width joiner
-        '\u200e',  # Left-to-right mark
-        '\u200f',  # Right-to-left mark
-        '\u2060',  # Word joiner
-        '\u2061',  # Function application
-        '\u2062',  # Invisible times
-        '\u2063',  # Invisible separator
-        '\u2064',  # Invisible plus
-        '\ufeff',  # Zero-width no-break space (BOM)
-        '\u034f',  # Combining grapheme joiner
-        '\u00ad',  # Soft hyphen
-        '\u180e',  # Mongolian vowel separator
-        '\u061c',  # Arabic letter mark
-    }
-    
+    features = get_message_features(message)
     result = {
         "mentions": [],
         "total_count": 0,
-        "hidden_mentions": [],
+        "hidden_mentions": list(features.hidden_mentions),
         "has_more": False,
-        "tme_deeplinks": [],
-        "fake_mentions": [],  # List of {visible_text, hidden_url} for deceptive links
+        "tme_deeplinks": list(features.tme_deeplinks),
+        "fake_mentions": list(features.fake_mentions),  # List of {visible_text, hidden_url} for deceptive links
     }
     
-    # Get entities and text (support both text and caption)
-    entities_to_check = []
-    text_to_check = None
-    if message.entities and message.text:
-        entities_to_check = message.entities
-        text_to_check = message.text
-    elif message.caption_entities and message.caption:
-        entities_to_check = message.caption_entities
-        text_to_check = message.caption
-    
-    # Regex for t.me/m/ profile deeplinks
-    tme_m_pattern = re.compile(r'(?:https?://)?(?:t\.me|telegram\.me)/m/([A-Za-z0-9_-]+)')
-    
-    # Even if no entities, check for text patterns (t.me/m/ links, @usernames)
-    if text_to_check:
-        # Detect t.me/m/ profile deeplinks in plain text (spam recruitment links)
-        tme_m_matches = tme_m_pattern.findall(text_to_check)
-        # Store full URLs, not just codes
-        for code in tme_m_matches:
-            result["tme_deeplinks"].append(f"https://t.me/m/{code}")
-        
-        # Detect plain @username patterns that may not be entity-detected
-        # (some messages have @username as plain text without entity)
-        username_pattern = re.compile(r'@([A-Za-z][A-Za-z0-9_]{4,31})')
-        plain_usernames = username_pattern.findall(text_to_check)
-        # Store plain usernames to compare with entity-based ones later
-        plain_username_set = set(u.lower() for u in plain_usernames)
-    else:
-        plain_username_set = set()
-    
-    if not entities_to_check:
-        # No entities but may have detected patterns above
-        # Add plain @usernames as mentions if found
-        max_buttons = 3
-        seen_usernames = set()
-        for username in plain_usernames if text_to_check else []:
-            if username.lower() not in seen_usernames and len(result["mentions"]) < max_buttons:
-                result["mentions"].append(("username", username, f"@{username}"))
-                seen_usernames.add(username.lower())
-                result["total_count"] += 1
-        result["has_more"] = len(plain_usernames if text_to_check else []) > max_buttons
-        return result
-    
     max_buttons = 3
     seen_usernames = set()  # Track usernames we've already added
     
-    for entity in entities_to_check:
-        entity_type = entity.get("type") if isinstance(entity, dict) else getattr(entity, "type", None)
-        
-        if entity_type == "mention":
+    for entity in features.entities:
+        if entity.type == "mention":
             result["total_count"] += 1
-            offset = entity.get("offset") if isinstance(entity, dict) else getattr(entity, "offset", 0)
-            length = entity.get("length") if isinstance(entity, dict) else getattr(entity, "length", 0)
-            mention = text_to_check[offset:offset + length]
-            
-            # Check for invisible characters around the mention
-            context_start = max(0, offset - 3)
-            context_end = min(len(text_to_check), offset + length + 3)
-            context = text_to_check[context_start:context_end]
-            has_invisible = any(char in context for char in INVISIBLE_CHARS)
-            
-            if mention.startswith("@"):
-                username_clean = mention.lstrip("@")
+            if entity.text.startswith("@"):
+                # Canonical form drops zero-width chars that would break the LOLS link
+                username_clean = canonicalize_text(entity.text).lstrip("@")
                 seen_usernames.add(username_clean.lower())
                 if len(result["mentions"]) < max_buttons:
-                    result["mentions"].append(("username", username_clean, mention))
-                if has_invisible:
-                    result["hidden_mentions"].append(mention)
-                    
-        elif entity_type == "text_mention":
+                    result["mentions"].append(("username", username_clean, entity.text))
+        elif entity.type == "text_mention":
             result["total_count"] += 1
-            user = entity.get("user") if isinstance(entity, dict) else getattr(entity, "user", None)
-            if user:
-                user_id = user.get("id") if isinstance(user, dict) else getattr(user, "id", None)
-                first_name = user.get("first_name", "") if isinstance(user, dict) else getattr(user, "first_name", "")
-                if user_id:
-                    display = first_name[:15] + "..." if len(first_name) > 15 else first_name
-                    if len(result["mentions"]) < max_buttons:
-                        result["mentions"].append(("user_id", str(user_id), display))
-                    
-                    # Check for invisible characters around the text_mention
-                    offset = entity.get("offset") if isinstance(entity, dict) else getattr(entity, "offset", 0)
-                    length = entity.get("length") if isinstance(entity, dict) else getattr(entity, "length", 0)
-                    context_start = max(0, offset - 3)
-                    context_end = min(len(text_to_check), offset + length + 3)
-                    context = text_to_check[context_start:context_end]
-                    has_invisible = any(char in context for char in INVISIBLE_CHARS)
-                    if has_invisible:
-                        result["hidden_mentions"].append(f"ID:{user_id}")
-        
-        elif entity_type == "text_link":
-            # Check if text_link contains t.me/m/ deeplink (hidden spam link)
-            url = entity.get("url", "") if isinstance(entity, dict) else getattr(entity, "url", "")
-            tme_m_match = tme_m_pattern.search(url)
-            if tme_m_match:
-                # This is a deceptive link - visible text hides a t.me/m/ deeplink
-                offset = entity.get("offset") if isinstance(entity, dict) else getattr(entity, "offset", 0)
-                length = entity.get("length") if isinstance(entity, dict) else getattr(entity, "length", 0)
-                visible_text = text_to_check[offset:offset + length]
-                
-                # Normalize URL to include https://
-                full_url = url if url.startswith("http") else f"https://{url}"
-                
-                result["fake_mentions"].append({
-                    "visible_text": visible_text,
-                    "hidden_url": full_url,
-                })
-                
-                # Also add to deeplinks list if not already there
-                if full_url not in result["tme_deeplinks"]:
-                    result["tme_deeplinks"].append(full_url)
+            if entity.user_id:
+                first_name = entity.user_first_name
+                display = first_name[:15] + "..." if len(first_name) > 15 else first_name
+                if len(result["mentions"]) < max_buttons:
+                    result["mentions"].append(("user_id", str(entity.user_id), display))
     
     # Add any plain text @usernames that weren't detected as entities (e.g., broken by invisible chars)
-    for username in plain_username_set:
-        if username not in seen_usernames:
+    for username in features.plain_usernames:
+        if username.lower() not in seen_usernames:
             result["total_count"] += 1
             if len(result["mentions"]) < max_buttons:
                 result["mentions"].append(("username", username, f"@{username}"))
-            seen_usernames.add(username)
+            seen_usernames.add(username.lower())
     
     result["has_more"] = result["total_count"] > max_buttons
     return result
@@ -1570,26 +1725,33 @@ async def load_banned_users():
                     except (ValueError, SyntaxError):
                         user_name = parts[1].strip()
                         user_id = int(parts[0])
-                    if not is_user_banned(CONN, user_id):
+                    if not await DB.read(is_user_banned, user_id):
                         username_str = user_name if isinstance(user_name, str) else None
-                        add_banned_user(CONN, user_id, username_str, ban_source="legacy_migration")
+                        await DB.write(add_banned_user, user_id, username_str, ban_source="legacy_migration")
                         migrated_count += 1
         os.rename(banned_users_filename, banned_users_filename + ".migrated")
         LOGGER.info("Migrated %d users from banned_users.txt to database", migrated_count)
     
     # Load all banned IDs from DB
     banned_user_ids.clear()
-    banned_user_ids.update(get_banned_user_ids(CONN))
+    banned_user_ids.update(await DB.read(get_banned_user_ids))
     LOGGER.info(
         "\033[91mBanned user IDs loaded from database: %d users\033[0m",
         len(banned_user_ids),
     )
 
+    # Load known spam fingerprints (oldest first so the newest survive eviction)
+    KNOWN_SPAM_HASHES.update(await DB.write(load_known_spam_hashes, KNOWN_SPAM_MAX_ENTRIES))
+    LOGGER.info(
+        "\033[91mKnown spam fingerprints loaded from database: %d\033[0m",
+        len(KNOWN_SPAM_HASHES),
+    )
+
 
 async def load_active_user_checks():
     """Coroutine to load checks non-blockingly from database"""
     # Load from database
-    baselines = get_active_user_baselines(CONN)
+    baselines = await DB.read(get_active_user_baselines)
     
     if not baselines:
         LOGGER.info("No active user baselines found in database")
@@ -1599,7 +1761,7 @@ async def load_active_user_checks():
             LOGGER.info("Found legacy file %s, migrating to database...", active_checks_filename)
             await _migrate_legacy_active_checks(active_checks_filename)
             # Re-load from database after migration
-            baselines = get_active_user_baselines(CONN)
+            baselines = await DB.read(get_active_user_baselines)
     
     for baseline in baselines:
         user_id = baseline["user_id"]
@@ -1631,7 +1793,12 @@ async def load_active_user_checks():
         # Extract start_time for resuming after restart
         start_time = None
         joined_at_str = baseline.get("joined_at")
-        if joined_at_str:
+        if baseline.get("monitoring_started_at"):
+            # Persisted schedule start (may differ from joined_at for non-join monitoring)
+            start_time = datetime.fromtimestamp(
+                baseline["monitoring_started_at"], tz=timezone.utc
+            )
+        elif joined_at_str:
             try:
                 # Handle both formats: with and without timezone
                 start_time = datetime.fromisoformat(joined_at_str.replace(" ", "T"))
@@ -1670,19 +1837,15 @@ async def load_active_user_checks():
             f"<a href='https://t.me/@id{user_id}'>IOS (Apple)</a>\n"
         )
         
-        # Start the check NON-BLOCKING
-        asyncio.create_task(
-            perform_checks(
-                user_id=user_id,
-                user_name=user_name_display,
-                event_record=event_message,
-                inout_logmessage=startup_logmessage,
-                start_time=start_time,
-            )
+        # Resume the monitoring ladder in MONITORING_SCHEDULER
+        schedule_user_checks(
+            user_id=user_id,
+            user_name=user_name_display,
+            event_record=event_message,
+            inout_logmessage=startup_logmessage,
+            start_time=start_time,
+            resume_step=baseline.get("monitoring_step"),
         )
-        
-        # Insert a 1-second interval between task creations
-        await asyncio.sleep(1)
     
     LOGGER.info(
         "\033[93mActive users checks dict (%s) loaded from database: %s\033[0m",
@@ -1714,8 +1877,8 @@ async def _migrate_legacy_active_checks(filename: str):
                 chat = baseline.get("chat", {})
                 # Normalize username - treat !UNDEFINED!/None/empty as None
                 _uname = normalize_username(user_name.get("username"))
-                save_user_baseline(
-                    conn=CONN,
+                await DB.write(
+                    save_user_baseline,
                     user_id=user_id,
                     username=_uname or None,
                     first_name=baseline.get("first_name"),
@@ -1729,8 +1892,8 @@ async def _migrate_legacy_active_checks(filename: str):
                 # Simple username string - minimal baseline
                 # Normalize username - treat !UNDEFINED!/None/empty as None
                 _uname = normalize_username(user_name)
-                save_user_baseline(
-                    conn=CONN,
+                await DB.write(
+                    save_user_baseline,
                     user_id=user_id,
                     username=_uname or None,
                 )
@@ -1743,7 +1906,7 @@ async def _migrate_legacy_active_checks(filename: str):
 
 
 async def load_and_start_checks():
-    """Load all unfinished checks from file and start them with 1 sec interval"""
+    """Load all unfinished checks from database and resume their schedules"""
 
     # Run the load_banned_users function as a background task
     asyncio.create_task(load_banned_users())
@@ -1772,6 +1935,12 @@ async def sequential_shutdown_tasks(_id, _uname):
 
 async def on_shutdown():
     """Function to handle the bot shutdown."""
+    # Finish updates already accepted from Telegram before anything else stops
+    await UPDATE_PIPELINE.stop()
+    # Stop scheduled monitoring steps; schedules are resumed from DB on restart
+    await MONITORING_SCHEDULER.stop()
+    # Write buffered messages before the final checks read the DB
+    await INGEST_BUFFER.stop()
     _users_count = len(active_user_checks_dict)
     LOGGER.info(
         "\033[95mBot is shutting down... Performing final spammer check for %d users...\033[0m",
@@ -1824,13 +1993,17 @@ async def on_shutdown():
     else:
         LOGGER.info("Shutdown tasks: %d completed successfully", _success)
 
+    # Send log lines still waiting in the batcher (the shutdown checks add some)
+    await TECHNOLOG_BATCHER.stop()
+
     # Database already has the current state - no need to save on shutdown
     # (baselines are saved on join, updated on ban/legit actions)
     # Banned users are stored in database (user_baselines.is_banned = 1)
+    banned_count = await DB.read(get_banned_users_count)
     LOGGER.info(
         "Shutdown: %d active users in monitoring, %d banned users (all persisted in database)",
         len(active_user_checks_dict),
-        get_banned_users_count(CONN),
+        banned_count,
     )
 
     # send message with short stats about previous session
@@ -1847,7 +2020,6 @@ async def on_shutdown():
     # number of active user checks forwarded to the next session
 
     try:
-        banned_count = get_banned_users_count(CONN)
         await safe_send_message(
             BOT,
             TECHNOLOG_GROUP,
@@ -1873,7 +2045,7 @@ async def on_shutdown():
         bot_start_time,
         len(active_user_checks_dict),
         session_ban_count,
-        get_banned_users_count(CONN),
+        banned_count,
     )
     
     # Close the global HTTP session used for spam checks
@@ -1894,12 +2066,12 @@ async def on_shutdown():
 
 
 async def is_admin(reporter_user_id: int, admin_group_id_check: int) -> bool:
-    """Function to check if the reporter is an admin in the Admin group."""
-    chat_admins = await BOT.get_chat_administrators(admin_group_id_check)
-    for admin in chat_admins:
-        if admin.user.id == reporter_user_id:
-            return True
-    return False
+    """Function to check if the reporter is an admin in the Admin group.
+
+    Admin lists are served from ADMIN_ROSTER_CACHE and only re-fetched
+    after ADMIN_CACHE_TTL_SECONDS or a promotion/demotion in that chat.
+    """
+    return await ADMIN_ROSTER_CACHE.is_admin(reporter_user_id, admin_group_id_check)
 
 
 async def handle_autoreports(
@@ -1924,9 +2096,11 @@ async def handle_autoreports(
     # Forward the message to the admin group
     technnolog_spam_message_copy = None
     try:  # if it was already removed earlier
-        technnolog_spam_message_copy = await BOT.forward_message(
-            TECHNOLOG_GROUP_ID, message.chat.id, message.message_id
-        )
+        # The TECHNOLOG copy (and its JSON dump) is skipped while updates are backed up
+        if not shed_optional_output("technolog_copy"):
+            technnolog_spam_message_copy = await BOT.forward_message(
+                TECHNOLOG_GROUP_ID, message.chat.id, message.message_id
+            )
     except TelegramBadRequest as fwd_err:
         LOGGER.warning(
             "%s:%s Failed to forward to TECHNOLOG (message may be deleted): %s - will still report to ADMIN",
@@ -1936,39 +2110,39 @@ async def handle_autoreports(
         )
         # Don't return - continue to report to ADMIN group even if TECHNOLOG forward fails
 
-    # Serialize message to JSON, handling aiogram Default objects
-    try:
-        message_as_json = json.dumps(message.model_dump(mode="json"), indent=4, ensure_ascii=False)
-    except (TypeError, ValueError) as ser_err:
-        # Fallback: use model_dump without mode="json" and handle non-serializable objects
-        LOGGER.warning("Message serialization failed: %s, using fallback", ser_err)
-        try:
-            message_dict = message.model_dump()
-            # Convert non-serializable objects to strings
-            def make_serializable(obj):
-                if isinstance(obj, dict):
-                    return {k: make_serializable(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [make_serializable(item) for item in obj]
-                elif hasattr(obj, '__class__') and 'Default' in obj.__class__.__name__:
-                    return f"<{obj.__class__.__name__}>"
-                else:
-                    try:
-                        json.dumps(obj)
-                        return obj
-                    except (TypeError, ValueError):
-                        return str(obj)
-            message_as_json = json.dumps(make_serializable(message_dict), indent=4, ensure_ascii=False)
-        except (TypeError, ValueError, AttributeError) as fallback_err:
-            LOGGER.error("Fallback serialization also failed: %s", fallback_err)
-            message_as_json = f"{{\"error\": \"Could not serialize message\", \"message_id\": {message.message_id}}}"
-    
-    # Truncate and add an indicator that the message has been truncated
-    if len(message_as_json) > MAX_TELEGRAM_MESSAGE_LENGTH - 3:
-        message_as_json = message_as_json[: MAX_TELEGRAM_MESSAGE_LENGTH - 3] + "..."
-    
-    # Only send to TECHNOLOG if we successfully forwarded the message
+    # Only serialize and send to TECHNOLOG if we successfully forwarded the message
     if technnolog_spam_message_copy:
+        # Serialize message to JSON, handling aiogram Default objects
+        try:
+            message_as_json = json.dumps(message.model_dump(mode="json"), indent=4, ensure_ascii=False)
+        except (TypeError, ValueError) as ser_err:
+            # Fallback: use model_dump without mode="json" and handle non-serializable objects
+            LOGGER.warning("Message serialization failed: %s, using fallback", ser_err)
+            try:
+                message_dict = message.model_dump()
+                # Convert non-serializable objects to strings
+                def make_serializable(obj):
+                    if isinstance(obj, dict):
+                        return {k: make_serializable(v) for k, v in obj.items()}
+                    elif isinstance(obj, list):
+                        return [make_serializable(item) for item in obj]
+                    elif hasattr(obj, '__class__') and 'Default' in obj.__class__.__name__:
+                        return f"<{obj.__class__.__name__}>"
+                    else:
+                        try:
+                            json.dumps(obj)
+                            return obj
+                        except (TypeError, ValueError):
+                            return str(obj)
+                message_as_json = json.dumps(make_serializable(message_dict), indent=4, ensure_ascii=False)
+            except (TypeError, ValueError, AttributeError) as fallback_err:
+                LOGGER.error("Fallback serialization also failed: %s", fallback_err)
+                message_as_json = f"{{\"error\": \"Could not serialize message\", \"message_id\": {message.message_id}}}"
+
+        # Truncate and add an indicator that the message has been truncated
+        if len(message_as_json) > MAX_TELEGRAM_MESSAGE_LENGTH - 3:
+            message_as_json = message_as_json[: MAX_TELEGRAM_MESSAGE_LENGTH - 3] + "..."
+
         await safe_send_message(BOT, TECHNOLOG_GROUP_ID, message_as_json, LOGGER)
         await safe_send_message(
             BOT, TECHNOLOG_GROUP_ID, "Please investigate this message.", LOGGER
@@ -1978,7 +2152,7 @@ async def handle_autoreports(
         if forward_sender_name == "Deleted Account":
             # Convert datetime to string to avoid Python 3.12+ sqlite3 DeprecationWarning
             _forward_date_str = message.forward_date.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00") if message.forward_date else None
-            found_message_data = get_spammer_details(
+            found_message_data = await get_spammer_details(
                 spammer_id,
                 spammer_first_name,
                 spammer_last_name,
@@ -2038,11 +2212,11 @@ async def handle_autoreports(
     else:
         report_id = int(str(message.chat.id) + str(message.message_id))
     # Save the message to the database
-    CURSOR.execute(
+    await DB.execute(
         """
         INSERT OR REPLACE INTO recent_messages 
-        (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, forward_date, received_date, forwarded_message_data)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, forward_date, received_date, forwarded_message_data, received_ts, forward_ts)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (
             message.chat.id,
@@ -2054,11 +2228,11 @@ async def handle_autoreports(
             message.forward_date.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00") if message.forward_date else None,
             received_date_utc,
             str(found_message_data),
+            to_epoch(message.date),
+            to_epoch(message.forward_date),
         ),
     )
 
-    CONN.commit()
-
     # Construct message link using chat username if available
     if message.chat.username:
         message_link = f"https://t.me/{message.chat.username}/{message.message_id}"
@@ -2268,111 +2442,329 @@ async def handle_autoreports(
     return
 
 
-async def spam_check(user_id):
-    """Function to check if a user is in the lols/cas/p2p/db spam list.
-    var: user_id: int: The ID of the user to check."""
-    # Check if the user is in the lols bot database
-    # https://api.lols.bot/account?id=
-    # https://api.cas.chat/check?user_id=
-    # P2P_SERVER_URL/check?user_id=
-    # Note: implement prime_radiant local DB check
-    session = get_http_session()
-    lols = False
-    cas = 0
-    is_spammer = False
+async def check_p2p_spam(session: aiohttp.ClientSession, user_id: int) -> bool | None:
+    """Check user_id against the local P2P server (P2P_SERVER_URL/check)."""
+    try:
+        async with session.get(
+            f"{P2P_SERVER_URL}/check?user_id={user_id}", timeout=10
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                return bool(data.get("is_spammer", False))
+    except aiohttp.ClientConnectorError as e:
+        LOGGER.warning("Local endpoint check error (ClientConnectorError): %s", e)
+    except asyncio.TimeoutError as e:
+        LOGGER.warning("Local endpoint check error (TimeoutError): %s", e)
+    return None  # no answer: inconclusive, not "clean"
+
+
+async def check_lols_spam(session: aiohttp.ClientSession, user_id: int) -> bool | None:
+    """Check user_id against https://api.lols.bot/account."""
+    try:
+        async with session.get(
+            f"https://api.lols.bot/account?id={user_id}", timeout=10
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                return bool(data.get("banned", False))
+    except aiohttp.ClientConnectorError as e:
+        LOGGER.warning("LOLS endpoint check error (ClientConnectorError): %s", e)
+    except asyncio.TimeoutError as e:
+        LOGGER.warning("LOLS endpoint check error (TimeoutError): %s", e)
+    return None  # no answer: inconclusive, not "clean"
+
+
+async def check_cas_spam(session: aiohttp.ClientSession, user_id: int) -> bool | None:
+    """Check user_id against https://api.cas.chat/check (any offenses count)."""
+    try:
+        async with session.get(
+            f"https://api.cas.chat/check?user_id={user_id}", timeout=10
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                if data.get("ok", False):
+                    return (data["result"].get("offenses", 0) or 0) > 0
+                return False  # ok=false: the user is not in CAS
+    except aiohttp.ClientConnectorError as e:
+        LOGGER.warning("CAS endpoint check error (ClientConnectorError): %s", e)
+    except asyncio.TimeoutError as e:
+        LOGGER.warning("CAS endpoint check error (TimeoutError): %s", e)
+    return None  # no answer: inconclusive, not "clean"
+
+
+# Reputation providers queried by spam_check()/spam_check_many(), by name
+SPAM_PROVIDERS = {
+    "p2p": check_p2p_spam,
+    "lols": check_lols_spam,
+    "cas": check_cas_spam,
+}
+
+
+def _provider_verdict(result, provider: str, user_id: int) -> bool | None:
+    """Turn a provider task result into a verdict, logging unexpected errors.
+
+    Returns None when the provider gave no answer (error, timeout, non-200):
+    such a check is inconclusive and must not be cached as "clean".
+    """
+    if isinstance(result, BaseException):
+        LOGGER.warning(
+            "%s spam check for %s failed: %s: %s",
+            provider,
+            user_id,
+            type(result).__name__,
+            result,
+        )
+        return None
+    if result is None:
+        return None
+    return result is True
 
-    async def check_local():
-        try:
-            async with session.get(
-                f"{P2P_SERVER_URL}/check?user_id={user_id}", timeout=10
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("is_spammer", False)
-        except aiohttp.ClientConnectorError as e:
-            LOGGER.warning(
-                "Local endpoint check error (ClientConnectorError): %s", e
-            )
-            return False
-        except asyncio.TimeoutError as e:
-            LOGGER.warning("Local endpoint check error (TimeoutError): %s", e)
-            return False
 
-    async def check_lols():
-        try:
-            async with session.get(
-                f"https://api.lols.bot/account?id={user_id}", timeout=10
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("banned", False)
-        except aiohttp.ClientConnectorError as e:
-            LOGGER.warning(
-                "LOLS endpoint check error (ClientConnectorError): %s", e
-            )
-            return False
-        except asyncio.TimeoutError as e:
-            LOGGER.warning("LOLS endpoint check error (TimeoutError): %s", e)
-            return False
+# Verdict cache in front of the reputation providers
+SPAM_VERDICT_CACHE = VerdictCache(
+    positive_ttl=SPAM_CACHE_POSITIVE_TTL_SECONDS,
+    negative_ttl=SPAM_CACHE_NEGATIVE_TTL_SECONDS,
+    max_entries=SPAM_CACHE_MAX_ENTRIES,
+)
 
-    async def check_cas():
-        try:
-            async with session.get(
-                f"https://api.cas.chat/check?user_id={user_id}", timeout=10
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data.get("ok", False):
-                        return data["result"].get("offenses", 0)
-        except aiohttp.ClientConnectorError as e:
-            LOGGER.warning("CAS endpoint check error (ClientConnectorError): %s", e)
-            return 0
-        except asyncio.TimeoutError as e:
-            LOGGER.warning("CAS endpoint check error (TimeoutError): %s", e)
-            return 0
+# Near-duplicate messages of monitored new users across chats (coordinated waves)
+SPAM_WAVE_DETECTOR = SpamWaveDetector(
+    window_seconds=SPAM_WAVE_WINDOW_SECONDS,
+    min_users=SPAM_WAVE_MIN_USERS,
+    min_chats=SPAM_WAVE_MIN_CHATS,
+    similarity=SPAM_WAVE_SIMILARITY_PERCENT / 100,
+    max_entries=SPAM_WAVE_MAX_ENTRIES,
+)
+# (chat_id, message_id) -> Message indexed above, so a new wave can act on all of its members
+SPAM_WAVE_MESSAGES = ExpiringDict(ttl=SPAM_WAVE_WINDOW_SECONDS, max_entries=SPAM_WAVE_MAX_ENTRIES)
 
-    try:
-        results = await asyncio.gather(
-            check_local(), check_lols(), check_cas(), return_exceptions=True
-        )
+# Content fingerprints (message_content_hash) of banned spam, checked on every message
+KNOWN_SPAM_HASHES = KnownSpamSet(max_entries=KNOWN_SPAM_MAX_ENTRIES)
 
-        is_spammer = results[0]
-        lols = results[1]
-        cas = results[2] if results[2] is not None else 0
 
-        if lols or is_spammer or cas > 0:
-            return True
-        else:
-            return False
-    except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
-        LOGGER.error("Unexpected error: %s", e)
-        return None
+async def remember_known_spam(texts, source: str):
+    """Fingerprint texts judged spam into KNOWN_SPAM_HASHES and persist them.
+
+    Only pass messages that were actually judged spam (the message a ban
+    acted on, admin-confirmed reports), never everything a banned user
+    wrote. Texts shorter than KNOWN_SPAM_MIN_TEXT_LENGTH are not
+    fingerprinted: short greetings repeat naturally.
+    """
+    content_hashes = [
+        compute_message_hash(text)
+        for text in texts
+        if text and len(text) >= KNOWN_SPAM_MIN_TEXT_LENGTH
+    ]
+    if not content_hashes:
+        return
+    new_count = sum(KNOWN_SPAM_HASHES.add(content_hash) for content_hash in content_hashes)
+    await DB.write(add_known_spam_hashes, content_hashes, source)
+    LOGGER.debug(
+        "Known spam fingerprints from %s: %d new, %d total",
+        source,
+        new_count,
+        len(KNOWN_SPAM_HASHES),
+    )
 
 
-def is_established_user(user_id: int) -> bool:
-    """Check if a user is considered 'established' based on message count and first message age.
-    
-    An established user meets ONE of these criteria:
-    1. Has >= ESTABLISHED_USER_MIN_MESSAGES AND first message is >= ESTABLISHED_USER_FIRST_MSG_DAYS old
-    2. Is marked as legit in the database
-    
-    Args:
-        user_id: The user ID to check
-        
-    Returns:
-        True if user is established, False otherwise
+async def remember_reported_spam(report_id: int, source: str):
+    """Fingerprint the reported message of an admin-confirmed report.
+
+    The text comes from the report state (the forwarded spam message); the
+    DB only keeps its hash, which says nothing about the text length.
     """
-    # Count user's messages
-    msg_count = CURSOR.execute(
-        "SELECT COUNT(*) FROM recent_messages WHERE user_id = ?",
-        (user_id,),
+    states = DP.get("forwarded_reports_states") or {}
+    reported = (states.get(report_id) or {}).get("original_forwarded_message")
+    if reported is None:
+        LOGGER.debug("Report %s has no stored message, not fingerprinted", report_id)
+        return
+    await remember_known_spam([reported.text or reported.caption], source)
+
+
+async def report_spam_wave(wave: SpamWave):
+    """Send the messages of a newly detected spam wave to the AUTOREPORT thread."""
+    LOGGER.warning(
+        "\033[91mSpam wave detected: %d near-identical messages from %d new users in %d chats (similarity >= %.2f)\033[0m",
+        len(wave.members),
+        len(wave.user_ids),
+        len(wave.chat_ids),
+        wave.similarity,
+    )
+    lines = [
+        f"🌊 <b>Spam wave</b>: {len(wave.members)} near-identical messages from "
+        f"{len(wave.user_ids)} new users in {len(wave.chat_ids)} chats"
+    ]
+    for chat_id, message_id, user_id in wave.members:
+        _link = construct_message_link([chat_id, message_id, None])
+        lines.append(
+            f"├ <code>{user_id}</code> in {html.escape(CHANNEL_DICT.get(chat_id, str(chat_id)))}: "
+            f"<a href='{_link}'>message</a>"
+        )
+    await safe_send_message(
+        BOT,
+        ADMIN_GROUP_ID,
+        "\n".join(lines),
+        LOGGER,
+        message_thread_id=ADMIN_AUTOREPORTS,
+        parse_mode="HTML",
+        disable_web_page_preview=True,
+    )
+
+
+def spam_wave_reason(wave: SpamWave, user_id: int) -> str:
+    """Return the check_n_ban/autoreport reason for a message of wave by user_id."""
+    return (
+        f"{user_id} message is part of a spam wave "
+        f"({len(wave.user_ids)} new users in {len(wave.chat_ids)} chats)"
+    )
+
+
+async def act_on_spam_wave(wave: SpamWave, message: Message):
+    """Ban or autoreport the members of a new spam wave posted before message.
+
+    message completed the wave and goes through the message handler's own
+    checks; the earlier members were indexed before the wave existed, so
+    they get check_n_ban/submit_autoreport here. Members whose Message is
+    no longer in SPAM_WAVE_MESSAGES are only listed in report_spam_wave().
+    """
+    for chat_id, message_id, user_id in wave.members:
+        if (chat_id, message_id) == (message.chat.id, message.message_id):
+            continue
+        member_message = SPAM_WAVE_MESSAGES.get((chat_id, message_id))
+        if member_message is None or user_id in banned_user_ids:
+            continue
+        the_reason = spam_wave_reason(wave, user_id)
+        if await check_n_ban(member_message, the_reason):
+            continue
+        if not was_user_autoreported(user_id):
+            await submit_autoreport(member_message, the_reason)
+
+
+async def _query_spam_providers(user_id: int) -> tuple[bool | None, str | None]:
+    """Query all providers for user_id, return (verdict, first flagging provider).
+
+    The verdict is None (inconclusive) if nobody flagged the user but a
+    provider did not answer.
+    """
+    session = get_http_session()
+    results = await asyncio.gather(
+        *(check(session, user_id) for check in SPAM_PROVIDERS.values()),
+        return_exceptions=True,
+    )
+    verdicts = [
+        _provider_verdict(result, provider, user_id)
+        for provider, result in zip(SPAM_PROVIDERS, results)
+    ]
+    for provider, verdict in zip(SPAM_PROVIDERS, verdicts):
+        if verdict:
+            return True, provider
+    if None in verdicts:
+        return None, None
+    return False, None
+
+
+async def spam_check(user_id, force_refresh: bool = False):
+    """Function to check if a user is in the lols/cas/p2p/db spam list.
+    var: user_id: int: The ID of the user to check.
+    var: force_refresh: bool: Bypass SPAM_VERDICT_CACHE (used by watchdog checks)."""
+    # Note: implement prime_radiant local DB check
+    verdict, _provider = await SPAM_VERDICT_CACHE.get_or_fetch(
+        user_id, lambda: _query_spam_providers(user_id), force_refresh=force_refresh
+    )
+    return verdict
+
+
+async def spam_check_many(user_ids) -> tuple[int | None, str | None]:
+    """Check several IDs (sender, forwarded user/chat...) against all providers at once.
+
+    All (id, provider) lookups run concurrently; the first positive answer
+    wins and the remaining in-flight requests are cancelled.
+
+    Returns:
+        (flagged_id, provider_name) or (None, None) if nobody is flagged.
+    """
+    user_ids = [_id for _id in dict.fromkeys(user_ids) if _id]
+    unchecked_ids = []
+    for _id in user_ids:
+        cached = SPAM_VERDICT_CACHE.get(_id)
+        if cached is None:
+            unchecked_ids.append(_id)
+        elif cached[0]:
+            SPAM_VERDICT_CACHE.hits += 1
+            return _id, cached[1]
+    if not unchecked_ids:
+        return None, None
+    SPAM_VERDICT_CACHE.misses += len(unchecked_ids)
+
+    session = get_http_session()
+    lookups = {
+        asyncio.create_task(check(session, _id)): (_id, provider)
+        for _id in unchecked_ids
+        for provider, check in SPAM_PROVIDERS.items()
+    }
+    # Providers still to answer per ID; an ID is cached clean once all said no
+    outstanding = {_id: len(SPAM_PROVIDERS) for _id in unchecked_ids}
+    # IDs a provider failed to answer for: not flagged, but not cached either
+    inconclusive = set()
+    pending = set(lookups)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                _id, provider = lookups[task]
+                result = task.exception() or task.result()
+                verdict = _provider_verdict(result, provider, _id)
+                if verdict:
+                    SPAM_VERDICT_CACHE.put(_id, True, provider)
+                    return _id, provider
+                if verdict is None:
+                    inconclusive.add(_id)
+                outstanding[_id] -= 1
+                if outstanding[_id] == 0:
+                    if _id in inconclusive:
+                        SPAM_VERDICT_CACHE.inconclusive += 1
+                    else:
+                        SPAM_VERDICT_CACHE.put(_id, False)
+    finally:
+        for task in pending:
+            task.cancel()
+    return None, None
+
+
+async def is_established_user(user_id: int) -> bool:
+    """Check if a user is considered 'established' based on message count and first message age.
+    
+    An established user meets ONE of these criteria:
+    1. Has >= ESTABLISHED_USER_MIN_MESSAGES AND first message is >= ESTABLISHED_USER_FIRST_MSG_DAYS old
+    2. Is marked as legit in the database
+    
+    Args:
+        user_id: The user ID to check
+        
+    Returns:
+        True if user is established, False otherwise
+    """
+    await INGEST_BUFFER.barrier(user_id=user_id)
+    # All lookups run in one hop on a DB reader thread
+    return await DB.read(_is_established_user, user_id)
+
+
+def _is_established_user(conn: sqlite3.Connection, user_id: int) -> bool:
+    """Blocking body of is_established_user(), run with a reader connection."""
+    cursor = conn.cursor()
+    # Count user's messages
+    msg_count = cursor.execute(
+        USER_MESSAGE_COUNT_QUERY,
+        (user_id,),
     ).fetchone()[0]
     
     # Check if user has any legit marker
-    is_legit = check_user_legit(CURSOR, user_id)
+    is_legit = check_user_legit(cursor, user_id)
     if not is_legit:
         # Also check baseline for is_legit flag
-        user_baseline = get_user_baseline(CONN, user_id)
+        user_baseline = get_user_baseline(conn, user_id)
         if user_baseline and user_baseline.get("is_legit"):
             is_legit = True
     
@@ -2381,8 +2773,8 @@ def is_established_user(user_id: int) -> bool:
         return True
     
     # Check first message age
-    first_msg = CURSOR.execute(
-        "SELECT received_date FROM recent_messages WHERE user_id = ? ORDER BY received_date ASC LIMIT 1",
+    first_msg = cursor.execute(
+        USER_FIRST_MESSAGE_QUERY,
         (user_id,),
     ).fetchone()
     
@@ -2402,6 +2794,122 @@ def is_established_user(user_id: int) -> bool:
     return msg_count >= ESTABLISHED_USER_MIN_MESSAGES and first_msg_old_enough
 
 
+# Entry checks of store_recent_messages, run cheapest first (memory before
+# network, see utils_stages). Verdicts: "skip" - don't process the message,
+# "pass" - process it without the remaining entry checks,
+# ("banned", (flagged_id, provider)) - delete it and ban the sender.
+MESSAGE_GATE = StagedChecks("message_gate", logger=LOGGER)
+
+
+@MESSAGE_GATE.stage("anonymous_admin", StageCost.MEMORY)
+def _gate_anonymous_admin(message: Message):
+    """Admin posting as the channel (777000): not spam, no provider checks."""
+    if message.from_user.id != TELEGRAM_ANONYMOUS_ADMIN_ID:
+        return None
+    LOGGER.debug(
+        "777000:ANONYMOUS_ADMIN Posted as channel in %s | msg: %s - skipping spam checks",
+        build_chat_link(message.chat.id, message.chat.username, message.chat.title),
+        construct_message_link([message.chat.id, message.message_id, message.chat.username]),
+    )
+    return "pass"
+
+
+@MESSAGE_GATE.stage("allowed_forward", StageCost.MEMORY)
+def _gate_allowed_forward(message: Message):
+    """Forward from this chat or from ALLOWED_FORWARD_CHANNEL_IDS: not tracked."""
+    if not message.forward_from_chat or message.forward_from_chat.id not in {
+        message.chat.id,
+        *ALLOWED_FORWARD_CHANNEL_IDS,
+    }:
+        return None
+    LOGGER.debug(
+        "\033[95m%s:%s FORWARDED from allowed channel, skipping the message %s in the chat %s.\033[0m\n\t\t\tMessage link: %s",
+        message.from_user.id,
+        format_username_for_log(message.from_user.username),
+        message.message_id,
+        message.chat.title,
+        construct_message_link([message.chat.id, message.message_id, message.chat.username]),
+    )
+    return "skip"
+
+
+def _banned_origin_verdict(message: Message):
+    """Return the banned verdict for the sender or a forward origin, if any."""
+    sender_id = message.from_user.id
+    if sender_id in banned_user_ids:
+        if sender_id in active_user_checks_dict:
+            # Note: Edge case - user in both active checks and banned (race condition)
+            LOGGER.warning(
+                "\033[47m\033[34m%s is in both active_user_checks_dict and banned_user_ids, check the message %s in the chat %s (%s)\033[0m",
+                sender_id,
+                message.message_id,
+                message.chat.title,
+                message.chat.id,
+            )
+            return "pass"
+        return "banned", (sender_id, "banned_user_ids")
+    for origin in (message.forward_from_chat, message.forward_from):
+        if origin and origin.id in banned_user_ids:
+            return "banned", (origin.id, "banned_user_ids")
+    return None
+
+
+@MESSAGE_GATE.stage("banned_origin", StageCost.MEMORY)
+async def _gate_banned_origin(message: Message):
+    """Sender, forwarded user or forwarded chat in banned_user_ids - decided from memory.
+
+    A banned verdict is rare and deletes the message, so the sender is
+    confirmed not to be an admin with is_admin() (not only the cached
+    rosters, which may just have been invalidated) before it is returned.
+    """
+    sender_id = message.from_user.id
+    if ADMIN_ROSTER_CACHE.is_cached_admin(
+        sender_id, message.chat.id
+    ) or ADMIN_ROSTER_CACHE.is_cached_admin(sender_id, ADMIN_GROUP_ID):
+        return None  # decided by the admin stage
+    verdict = _banned_origin_verdict(message)
+    if isinstance(verdict, tuple) and (
+        await is_admin(sender_id, message.chat.id)
+        or await is_admin(sender_id, ADMIN_GROUP_ID)
+    ):
+        return None  # decided by the admin stage (rosters are cached now)
+    return verdict
+
+
+@MESSAGE_GATE.stage("admin", StageCost.NETWORK)
+async def _gate_admin(message: Message):
+    """Admins of the chat or of the admin group are not tracked (rosters are cached)."""
+    if not (
+        await is_admin(message.from_user.id, message.chat.id)
+        or await is_admin(message.from_user.id, ADMIN_GROUP_ID)
+    ):
+        return None
+    LOGGER.debug(
+        "\033[95m%s:%s is admin, skipping the message %s in the chat %s.\033[0m\n\t\t\tMessage link: %s",
+        message.from_user.id,
+        format_username_for_log(message.from_user.username),
+        message.message_id,
+        message.chat.title,
+        construct_message_link([message.chat.id, message.message_id, message.chat.username]),
+    )
+    return "skip"
+
+
+@MESSAGE_GATE.stage("spam_providers", StageCost.NETWORK)
+async def _gate_spam_providers(message: Message):
+    """Sender and forward origins checked against lols/cas/p2p concurrently, first hit wins."""
+    spam_verdict = await spam_check_many(
+        [
+            message.from_user.id,
+            message.forward_from_chat.id if message.forward_from_chat else None,
+            message.forward_from.id if message.forward_from else None,
+        ]
+    )
+    if spam_verdict[0] is None:
+        return None
+    return "banned", spam_verdict
+
+
 async def save_report_file(file_type, data):
     """Function to create or load the daily spam file.
 
@@ -2442,42 +2950,32 @@ async def ban_user_from_all_chats(
     Returns:
         tuple: (success_count, fail_count, total_count)
     """
-    success_count = 0
-    fail_count = 0
-
-    for chat_id in channel_ids:
-        try:
-            await BOT.ban_chat_member(chat_id, user_id, revoke_messages=True)
-            success_count += 1
-            # LOGGER.debug("Successfully banned USER %s in chat %s", user_id, chat_id)
-        except TelegramBadRequest as e:  # if user were Deleted Account while banning
-            fail_count += 1
-            chat_name = get_channel_name_by_id(channel_dict, chat_id)
-            LOGGER.error(
-                "\033[93m%s:%s - error banning in chat %s (%s): %s. Deleted ACCOUNT or no BOT in CHAT? (Successfully banned: %d)\033[0m",
-                user_id,
-                format_username_for_log(user_name),
-                chat_name,
-                chat_id,
-                e,
-                success_count,
-            )
-            await asyncio.sleep(1)
-            # Note: Consider removing user_id check coroutine from monitoring list on ChatMigrated
-            continue
-        except TelegramForbiddenError as e:  # Catch permission errors
-            fail_count += 1
-            chat_name = get_channel_name_by_id(channel_dict, chat_id)
-            LOGGER.error(
-                "\033[93m%s:%s - unexpected error banning in chat %s (%s): %s\033[0m",
-                user_id,
-                format_username_for_log(user_name),
-                chat_name,
-                chat_id,
-                e,
-            )
-            await asyncio.sleep(1)
+    # All chats at once, rate limited by BAN_FANOUT
+    results = await BAN_FANOUT.run(
+        channel_ids,
+        lambda chat_id: BOT.ban_chat_member(chat_id, user_id, revoke_messages=True),
+    )
+    success_count = sum(result.ok for result in results)
+    fail_count = len(results) - success_count
+    for result in results:
+        if result.ok:
+            remember_chat_membership(result.chat_id, user_id, ChatMemberStatus.KICKED)
+
+    for result in results:
+        if result.ok:
             continue
+        # Deleted ACCOUNT, no BOT in CHAT or missing rights
+        # Note: Consider removing user_id check coroutine from monitoring list on ChatMigrated
+        chat_name = get_channel_name_by_id(channel_dict, result.chat_id)
+        LOGGER.error(
+            "\033[93m%s:%s - error banning in chat %s (%s): %s. Deleted ACCOUNT or no BOT in CHAT? (Successfully banned: %d)\033[0m",
+            user_id,
+            format_username_for_log(user_name),
+            chat_name,
+            result.chat_id,
+            result.error,
+            success_count,
+        )
 
     total_count = len(channel_ids)
     # RED color for the log
@@ -2512,6 +3010,12 @@ async def autoban(_id, user_name="!UNDEFINED!"):
             )
     
     # Cancel regular watchdog if running (user is being banned)
+    if MONITORING_SCHEDULER.cancel(_id):
+        LOGGER.info(
+            "%s:%s Monitoring schedule cancelled during autoban",
+            _id,
+            format_username_for_log(user_name),
+        )
     if _id in running_watchdogs:
         watchdog_task = running_watchdogs.pop(_id, None)
         if watchdog_task:
@@ -2524,7 +3028,7 @@ async def autoban(_id, user_name="!UNDEFINED!"):
 
     # Delete ALL stored messages for this user BEFORE removing from active_user_checks_dict
     if _id in active_user_checks_dict:
-        deleted_count, _ = await delete_all_user_messages(_id, user_name)
+        deleted_count, _ = await delete_all_user_messages(_id, user_name, reason="autoban")
         if deleted_count > 0:
             LOGGER.info(
                 "%s:%s Deleted %d spam messages during autoban",
@@ -2553,8 +3057,8 @@ async def autoban(_id, user_name="!UNDEFINED!"):
     )
 
     # Add to database and update baseline status (banned, not legit)
-    add_banned_user(CONN, _id, user_name, ban_source="lols_autoban")
-    update_user_baseline_status(CONN, _id, monitoring_active=False, is_legit=False, is_banned=True)
+    await DB.write(add_banned_user, _id, user_name, ban_source="lols_autoban")
+    await DB.write(update_user_baseline_status, _id, monitoring_active=False, is_legit=False, is_banned=True)
 
     # Normalize username for logging / notification using consistent normalize_username function
     norm_username = normalize_username(user_name)
@@ -2568,26 +3072,115 @@ async def autoban(_id, user_name="!UNDEFINED!"):
         LOGGER.debug("%s @%s already posted to TECHNO_NAMES, skipping (1156)", _id, norm_username)
         return
     POSTED_USERNAMES.add(norm_username)
-    await safe_send_message(
-        BOT,
-        TECHNOLOG_GROUP_ID,
-        f"<code>{_id}</code> @{norm_username} (1156)",
-        LOGGER,
-        parse_mode="HTML",
-        message_thread_id=TECHNO_NAMES,
-    )
+    TECHNOLOG_BATCHER.add(TECHNOLOG_GROUP_ID, TECHNO_NAMES, f"<code>{_id}</code> @{norm_username} (1156)")
+
+
+# Telegram's deleteMessages accepts up to 100 message IDs per call
+DELETE_MESSAGES_BATCH_SIZE = 100
+
+
+def _parse_message_key(msg_key: str) -> tuple[int, int]:
+    """Return (chat_id, message_id) of an active_user_checks_dict message key.
+
+    Keys are f"{chat_id}_{message_id}"; legacy keys stored the chat ID
+    without its -100 prefix (with or without the minus sign), which is
+    restored here.
+    """
+    chat_id_str, message_id_str = msg_key.rsplit("_", 1)
+    chat_id = int(chat_id_str)
+    if chat_id > 0:
+        chat_id = int(f"-100{chat_id}")
+    elif not str(chat_id).startswith("-100"):
+        chat_id = int(f"-100{str(chat_id).replace('-', '', 1)}")
+    return chat_id, int(message_id_str)
+
+
+async def _delete_message_batch(chat_id: int, message_ids: list[int], user_id: int, user_name: str) -> list[int]:
+    """Delete message_ids in one chat, return the IDs that were deleted.
+
+    One deleteMessages call per batch of 100 (messages that are already gone
+    are skipped by Telegram and count as deleted). A batch the bot can't
+    delete as a whole (e.g. a message too old to delete) falls back to one
+    call per message, so the deletable ones still go.
+    """
+    deleted = []
+    for start in range(0, len(message_ids), DELETE_MESSAGES_BATCH_SIZE):
+        batch = message_ids[start : start + DELETE_MESSAGES_BATCH_SIZE]
+        try:
+            try:
+                await BOT.delete_messages(chat_id, batch)
+            except RetryAfter as e:
+                LOGGER.warning(
+                    "%s:%s Rate limit hit, waiting %s seconds...",
+                    user_id,
+                    format_username_for_log(user_name),
+                    e.retry_after,
+                )
+                await asyncio.sleep(e.retry_after)
+                await BOT.delete_messages(chat_id, batch)
+            deleted.extend(batch)
+            continue
+        except (TelegramNotFound, TelegramForbiddenError) as e:
+            # Bot is not in the chat (any more): no single delete will work either
+            LOGGER.warning(
+                "%s:%s Cannot delete messages in chat %s: %s",
+                user_id,
+                format_username_for_log(user_name),
+                chat_id,
+                e,
+            )
+            return deleted
+        except (TelegramBadRequest, RetryAfter) as e:
+            LOGGER.debug(
+                "%s:%s Bulk delete in chat %s failed (%s), deleting one by one",
+                user_id,
+                format_username_for_log(user_name),
+                chat_id,
+                e,
+            )
+        for message_id in batch:
+            try:
+                await BOT.delete_message(chat_id, message_id)
+                deleted.append(message_id)
+            except RetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+                try:
+                    await BOT.delete_message(chat_id, message_id)
+                    deleted.append(message_id)
+                except (TelegramBadRequest, TelegramForbiddenError, RetryAfter):
+                    pass
+            except TelegramBadRequest as e:
+                # Covers MessageToDeleteNotFound, MessageCantBeDeleted, etc.
+                if "message to delete not found" in str(e).lower():
+                    deleted.append(message_id)
+                else:
+                    LOGGER.warning(
+                        "%s:%s Cannot delete message %s: %s",
+                        user_id,
+                        format_username_for_log(user_name),
+                        message_id,
+                        e,
+                    )
+            except (TelegramNotFound, TelegramForbiddenError) as e:
+                LOGGER.warning(
+                    "%s:%s Cannot delete message %s in chat %s: %s",
+                    user_id,
+                    format_username_for_log(user_name),
+                    message_id,
+                    chat_id,
+                    e,
+                )
+    return deleted
 
 
-async def delete_all_user_messages(user_id: int, user_name: str = "!UNDEFINED!"):
+async def delete_all_user_messages(user_id: int, user_name: str = "!UNDEFINED!", reason: str = "spammer_cleanup"):
     """Delete ALL stored messages for a user from active_user_checks_dict.
     
     Messages are stored with keys like 'chat_id_message_id' in the user's dict entry.
-    This function finds all such message keys and deletes each message.
-    
-    Rate limiting: Telegram allows ~30 API calls/second for bulk operations.
-    We add a small delay (0.05s = 50ms) between deletions to stay well under the limit
-    (max ~20 deletions/second). For typical spam cases (1-10 messages), this adds
-    only 50-500ms total delay which is acceptable.
+    They are grouped by chat and deleted with one deleteMessages call per chat
+    (per 100 messages), falling back to single deletes if a batch fails. The
+    chats are handled concurrently. Deleted messages get reason as their
+    recent_messages.deletion_reason, written in one transaction.
     
     Returns:
         tuple: (deleted_count, failed_count)
@@ -2620,79 +3213,13 @@ async def delete_all_user_messages(user_id: int, user_name: str = "!UNDEFINED!")
         len(message_keys),
         message_keys,
     )
-    
-    for i, msg_key in enumerate(message_keys):
-        # Rate limiting: add small delay between deletions to avoid hitting Telegram limits
-        # Skip delay for the first message
-        if i > 0:
-            await asyncio.sleep(0.05)  # 50ms delay = max 20 requests/second (well under 30/s limit)
-        
+
+    # chat_id -> message IDs, in stored order
+    messages_by_chat: dict[int, list[int]] = {}
+    for msg_key in message_keys:
         try:
-            parts = msg_key.split("_")
-            if len(parts) >= 2:
-                chat_id_str = parts[0]
-                message_id_str = parts[1]
-                
-                # Convert chat_id - add -100 prefix if needed
-                chat_id = int(chat_id_str)
-                if chat_id > 0:
-                    chat_id = int(f"-100{chat_id}")
-                elif not str(chat_id).startswith("-100"):
-                    chat_id = int(f"-100{str(chat_id).replace('-', '', 1)}")
-                
-                message_id = int(message_id_str)
-                
-                try:
-                    await BOT.delete_message(chat_id, message_id)
-                    deleted_count += 1
-                    LOGGER.debug(
-                        "%s:%s Deleted message %s in chat %s",
-                        user_id,
-                        format_username_for_log(user_name),
-                        message_id,
-                        chat_id,
-                    )
-                except TelegramBadRequest as e:
-                    # Covers MessageToDeleteNotFound, MessageCantBeDeleted, etc.
-                    if "message to delete not found" in str(e).lower():
-                        LOGGER.debug(
-                            "%s:%s Message %s not found (already deleted?)",
-                            user_id,
-                            format_username_for_log(user_name),
-                            message_id,
-                        )
-                    else:
-                        LOGGER.warning(
-                            "%s:%s Cannot delete message %s: %s",
-                            user_id,
-                            format_username_for_log(user_name),
-                            message_id,
-                            e,
-                        )
-                    failed_count += 1
-                except TelegramNotFound:
-                    LOGGER.warning(
-                        "%s:%s Chat %s not found for message deletion",
-                        user_id,
-                        format_username_for_log(user_name),
-                        chat_id,
-                    )
-                    failed_count += 1
-                except RetryAfter as e:
-                    # Telegram rate limit hit - wait and retry
-                    LOGGER.warning(
-                        "%s:%s Rate limit hit, waiting %s seconds...",
-                        user_id,
-                        format_username_for_log(user_name),
-                        e.retry_after,
-                    )
-                    await asyncio.sleep(e.retry_after)
-                    try:
-                        await BOT.delete_message(chat_id, message_id)
-                        deleted_count += 1
-                    except (TelegramBadRequest, TelegramForbiddenError):
-                        failed_count += 1
-        except (ValueError, IndexError) as e:
+            chat_id, message_id = _parse_message_key(msg_key)
+        except ValueError as e:
             LOGGER.warning(
                 "%s:%s Invalid message key format '%s': %s",
                 user_id,
@@ -2701,14 +3228,37 @@ async def delete_all_user_messages(user_id: int, user_name: str = "!UNDEFINED!")
                 e,
             )
             failed_count += 1
-    
+            continue
+        message_ids = messages_by_chat.setdefault(chat_id, [])
+        if message_id not in message_ids:
+            message_ids.append(message_id)
+
+    chat_ids = list(messages_by_chat)
+    results = await asyncio.gather(
+        *(
+            _delete_message_batch(chat_id, messages_by_chat[chat_id], user_id, user_name)
+            for chat_id in chat_ids
+        )
+    )
+    deleted_messages = []
+    for chat_id, deleted in zip(chat_ids, results):
+        deleted_messages.extend((chat_id, message_id) for message_id in deleted)
+        failed_count += len(messages_by_chat[chat_id]) - len(deleted)
+    deleted_count = len(deleted_messages)
+
+    if deleted_messages:
+        # Rows of the latest messages may still be waiting in the ingest buffer
+        await INGEST_BUFFER.barrier(user_id=user_id)
+        await DB.write(set_deletion_reasons, deleted_messages, reason)
+
     if deleted_count > 0 or failed_count > 0:
         LOGGER.info(
-            "\033[91m%s:%s Deleted %d/%d messages (failed: %d)\033[0m",
+            "\033[91m%s:%s Deleted %d/%d messages in %d chats (failed: %d)\033[0m",
             user_id,
             format_username_for_log(user_name),
             deleted_count,
             deleted_count + failed_count,
+            len(chat_ids),
             failed_count,
         )
     
@@ -2774,7 +3324,7 @@ async def check_and_autoban(
             return True
 
         # Delete ALL stored messages for this user (not just one)
-        _del_count, _fail_count = await delete_all_user_messages(user_id, user_name)
+        _del_count, _fail_count = await delete_all_user_messages(user_id, user_name, reason="check_and_autoban")
         LOGGER.debug(
             "\033[93m%s:%s check_and_autoban deleted %d messages (failed: %d)\033[0m",
             user_id,
@@ -2848,14 +3398,7 @@ async def check_and_autoban(
             _norm_username_990 = normalize_username(user_name)
             if _norm_username_990 and _norm_username_990 not in POSTED_USERNAMES:
                 POSTED_USERNAMES.add(_norm_username_990)
-                await safe_send_message(
-                    BOT,
-                    TECHNOLOG_GROUP_ID,
-                    f"<code>{user_id}</code> @{_norm_username_990} (990)",
-                    LOGGER,
-                    parse_mode="HTML",
-                    message_thread_id=TECHNO_NAMES,
-                )
+                TECHNOLOG_BATCHER.add(TECHNOLOG_GROUP_ID, TECHNO_NAMES, f"<code>{user_id}</code> @{_norm_username_990} (990)")
             elif not _norm_username_990:
                 LOGGER.debug(
                     "%s:%s username undefined; skipping 990 notification line", user_id, format_username_for_log(user_name)
@@ -2905,14 +3448,7 @@ async def check_and_autoban(
             _norm_username = normalize_username(user_name)
             if _norm_username and _norm_username not in POSTED_USERNAMES:
                 POSTED_USERNAMES.add(_norm_username)
-                await safe_send_message(
-                    BOT,
-                    TECHNOLOG_GROUP_ID,
-                    f"<code>{user_id}</code> @{_norm_username} (1526)",
-                    LOGGER,
-                    parse_mode="HTML",
-                    message_thread_id=TECHNO_NAMES,
-                )
+                TECHNOLOG_BATCHER.add(TECHNOLOG_GROUP_ID, TECHNO_NAMES, f"<code>{user_id}</code> @{_norm_username} (1526)")
             elif not _norm_username:
                 LOGGER.debug(
                     "%s:%s username undefined; skipping 1526 notification line", user_id, format_username_for_log(user_name)
@@ -2969,14 +3505,7 @@ async def check_and_autoban(
             _norm_username_1054 = normalize_username(user_name)
             if _norm_username_1054 and _norm_username_1054 not in POSTED_USERNAMES:
                 POSTED_USERNAMES.add(_norm_username_1054)
-                await safe_send_message(
-                    BOT,
-                    TECHNOLOG_GROUP_ID,
-                    f"<code>{user_id}</code> @{_norm_username_1054} (1054)",
-                    LOGGER,
-                    parse_mode="HTML",
-                    message_thread_id=TECHNO_NAMES,
-                )
+                TECHNOLOG_BATCHER.add(TECHNOLOG_GROUP_ID, TECHNO_NAMES, f"<code>{user_id}</code> @{_norm_username_1054} (1054)")
             elif not _norm_username_1054:
                 LOGGER.debug(
                     "%s:%s username undefined; skipping 1054 notification line", user_id, format_username_for_log(user_name)
@@ -3022,10 +3551,10 @@ async def check_n_ban(message: Message, reason: str):
             )
         banned_user_ids.add(message.from_user.id)
         increment_session_ban_count()
-        # stop the perform_checks coroutine if it is running for author_id
-        for task in asyncio.all_tasks():
-            if task.get_name() == str(message.from_user.id):
-                task.cancel()
+        await remember_known_spam([message.text or message.caption], "check_n_ban")
+        # stop monitoring the author: drop the scheduled checks and the active entry
+        MONITORING_SCHEDULER.cancel(message.from_user.id)
+        active_user_checks_dict.pop(message.from_user.id, None)
         # forward the telefragged message to the admin group
         try:
             if message is not None:
@@ -3173,14 +3702,7 @@ async def check_n_ban(message: Message, reason: str):
         _uname_1191 = normalize_username(message.from_user.username)
         if _uname_1191 and _uname_1191 not in POSTED_USERNAMES:
             POSTED_USERNAMES.add(_uname_1191)
-            await safe_send_message(
-                BOT,
-                TECHNOLOG_GROUP_ID,
-                f"<code>{message.from_user.id}</code> @{_uname_1191} (1191)",
-                LOGGER,
-                parse_mode="HTML",
-                message_thread_id=TECHNO_NAMES,
-            )
+            TECHNOLOG_BATCHER.add(TECHNOLOG_GROUP_ID, TECHNO_NAMES, f"<code>{message.from_user.id}</code> @{_uname_1191} (1191)")
         # remove spammer from all groups
         await autoban(message.from_user.id, message.from_user.username)
         event_record = (
@@ -3228,103 +3750,90 @@ async def check_n_ban(message: Message, reason: str):
         return False
 
 
-async def perform_checks(
+@dataclass
+class MonitoringJob:
+    """State of one user's monitoring ladder, owned by MONITORING_SCHEDULER."""
+    user_id: int
+    user_name: str = "!UNDEFINED!"
+    event_record: str = ""
+    inout_logmessage: str = ""
+    message_to_delete: list | None = None
+    start_time: datetime | None = None  # aware UTC, MONITORING_SLEEP_TIMES are offsets from it
+    step: int = 0  # index into MONITORING_SLEEP_TIMES of the next check
+
+
+def schedule_user_checks(
     message_to_delete=None,
     event_record="",
     user_id=None,
     inout_logmessage="",
     user_name="!UNDEFINED!",
     start_time=None,  # Optional: when monitoring started (for resuming after restart)
+    resume_step=None,  # Optional: persisted index of the next check (for resuming after restart)
 ):
-    """Corutine to perform checks for spam and take action if necessary.
+    """Register a user in MONITORING_SCHEDULER to run perform_checks() on the MONITORING_SLEEP_TIMES ladder.
     param message_to_delete: tuple: chat_id, message_id: The message to delete.
     param event_record: str: The event record to log to inout file.
     param user_id: int: The ID of the user to check for spam.
     param inout_logmessage: str: The log message for the user's activity.
     param start_time: datetime: When monitoring started (to resume after bot restart).
-    """
-
-    # immediate check
-    # lols_spam = await lols_check(user_id)
-    # if await check_and_autoban(user_id, inout_logmessage,lols_spam=lols_spam):
-    #     return
+    param resume_step: int: Persisted monitoring_step; checks missed during downtime
+        are collapsed into one immediate catch-up check.
 
-    # Define a dictionary to map lols_spam values to ANSI color codes
-    color_map = {
-        False: "\033[93m",  # Yellow for False (still checking)
-        True: "\033[91m",  # Red for True
-        None: "\033[93m",  # Yellow for None or other values
-    }
-
-    try:
-
-        # List of sleep times in seconds (cumulative from start)
-        sleep_times = [
-            65,  # 1 min
-            185,  # 3 min
-            305,  # 5 min
-            605,  # 10 min
-            1205,  # 20 min
-            1805,  # 30 min
-            3605,  # 1 hr
-            7205,  # 2 hr
-            10805,  # 3 hr
-            21605,  # 6 hr
-            43205,  # 12 hr
-            MONITORING_DURATION_HOURS * 3600 + 5,  # final check
-        ]
-
-        # Calculate elapsed time if resuming after restart
-        elapsed_seconds = 0
-        skipped_intervals = []
-        if start_time:
-            # Handle both naive and timezone-aware start_time
-            # DB timestamps are UTC (naive=old UTC, aware=new +00:00 format)
-            # Convert naive UTC to aware UTC, then compare with aware UTC now
-            if start_time.tzinfo is None:
-                start_time = start_time.replace(tzinfo=timezone.utc)
-            elapsed_seconds = (datetime.now(timezone.utc) - start_time).total_seconds()
-            if elapsed_seconds >= sleep_times[-1]:
-                # Monitoring period already completed - perform final check before cleanup
-                LOGGER.info(
-                    "%s:%s monitoring period already completed (%.1f hrs elapsed), performing final check",
-                    user_id,
-                    format_username_for_log(user_name),
-                    elapsed_seconds / 3600,
-                )
-                # Perform the final spam check that was missed
-                lols_spam = await spam_check(user_id)
-                
-                # Get the color code based on the value of lols_spam
-                color_code = color_map.get(lols_spam, "\033[93m")
-                
-                # Log the final check result
-                LOGGER.debug(
-                    "%s%s:%s FINAL check (missed) lols_cas_spam: %s\033[0m",
-                    color_code,
-                    user_id,
-                    format_username_for_log(user_name),
-                    lols_spam,
-                )
-                
-                # Perform autoban check if user is spam
-                if await check_and_autoban(
-                    event_record,
-                    user_id,
-                    inout_logmessage,
-                    user_name,
-                    lols_spam=lols_spam,
-                    message_to_delete=message_to_delete,
-                ):
-                    return
-                
-                # If not banned, clean up normally (will be marked as legit in finally block)
-                # The finally block will handle the cleanup, so just return here
-                return
-            # Collect skipped intervals for single log line
-            for st in sleep_times:
-                if st <= elapsed_seconds:
-                    skipped_intervals.append(f"{st // 60}min")
+    If the user is already scheduled the existing ladder is kept, so the
+    earliest monitoring window still decides when the user is cleared.
+    The ladder position is persisted in user_baselines after every step.
+    """
+    existing = MONITORING_SCHEDULER.get(user_id)
+    if existing is not None:
+        if message_to_delete:
+            existing.payload.message_to_delete = message_to_delete
+        LOGGER.debug(
+            "%s:%s already scheduled for monitoring (next check %d/%d)",
+            user_id,
+            format_username_for_log(user_name),
+            existing.payload.step + 1,
+            len(MONITORING_SLEEP_TIMES),
+        )
+        return existing
+
+    now = datetime.now(timezone.utc)
+    resuming = start_time is not None
+    if start_time is None:
+        start_time = now
+    elif start_time.tzinfo is None:
+        # DB timestamps are UTC (naive=old UTC, aware=new +00:00 format)
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    elapsed_seconds = (now - start_time).total_seconds()
+
+    step = next(
+        (i for i, st in enumerate(MONITORING_SLEEP_TIMES) if st > elapsed_seconds),
+        None,
+    )
+    if step is None:
+        # Monitoring period already completed - perform the missed final check now
+        LOGGER.info(
+            "%s:%s monitoring period already completed (%.1f hrs elapsed), performing final check",
+            user_id,
+            format_username_for_log(user_name),
+            elapsed_seconds / 3600,
+        )
+        step = len(MONITORING_SLEEP_TIMES) - 1
+        due_at = time.time()
+    elif resume_step is not None and resume_step < step:
+        # Checks came due while the bot was down - run one catch-up check now
+        LOGGER.info(
+            "%s:%s %d check(s) missed during downtime (%.1f min elapsed), running one catch-up check",
+            user_id,
+            format_username_for_log(user_name),
+            step - resume_step,
+            elapsed_seconds / 60,
+        )
+        step -= 1
+        due_at = time.time()
+    else:
+        if resuming:
+            skipped_intervals = [f"{st // 60}min" for st in MONITORING_SLEEP_TIMES[:step]]
             if skipped_intervals:
                 LOGGER.info(
                     "%s:%s resuming from %.1f min, skipped: %s",
@@ -3340,391 +3849,398 @@ async def perform_checks(
                     format_username_for_log(user_name),
                     elapsed_seconds / 60,
                 )
+        due_at = start_time.timestamp() + MONITORING_SLEEP_TIMES[step]
 
-        for sleep_time in sleep_times:
-            # Skip intervals that have already passed (when resuming)
-            if elapsed_seconds > 0 and sleep_time <= elapsed_seconds:
-                continue
+    DB.submit_write(save_monitoring_schedule, user_id, step, due_at, started_at=start_time.timestamp())
+    return MONITORING_SCHEDULER.schedule(
+        user_id,
+        due_at,
+        MonitoringJob(
+            user_id=user_id,
+            user_name=user_name,
+            event_record=event_record,
+            inout_logmessage=inout_logmessage,
+            message_to_delete=message_to_delete,
+            start_time=start_time,
+            step=step,
+        ),
+    )
 
-            # Calculate adjusted sleep time (subtract already elapsed time for first remaining interval)
-            adjusted_sleep = sleep_time - elapsed_seconds if elapsed_seconds > 0 else sleep_time
-            elapsed_seconds = 0  # Reset after first adjusted sleep
 
-            if user_id not in active_user_checks_dict:  # if user banned somewhere else
-                return
+async def perform_checks(job: ScheduledJob) -> float | None:
+    """Run one due step of the MONITORING_SLEEP_TIMES ladder for a monitored user.
+    Called by MONITORING_SCHEDULER, see schedule_user_checks().
 
-            await asyncio.sleep(adjusted_sleep)
-            lols_spam = await spam_check(user_id)
+    Returns the epoch time of the next step, or None when monitoring is over
+    (user banned or removed elsewhere, or the last step passed as legit).
+    """
+    check: MonitoringJob = job.payload
+    user_id = check.user_id
+    user_name = check.user_name
+    event_record = check.event_record
+    inout_logmessage = check.inout_logmessage
+    message_to_delete = check.message_to_delete
+    sleep_time = MONITORING_SLEEP_TIMES[check.step]
 
-            # Get the color code based on the value of lols_spam
-            color_code = color_map.get(
-                lols_spam, "\033[93m"
-            )  # Default to yellow if lols_spam is not in the map
+    # Define a dictionary to map lols_spam values to ANSI color codes
+    color_map = {
+        False: "\033[93m",  # Yellow for False (still checking)
+        True: "\033[91m",  # Red for True
+        None: "\033[93m",  # Yellow for None or other values
+    }
 
-            # Log the message with the appropriate color
-            LOGGER.debug(
-                "%s%s:%s %02dmin check lols_cas_spam: %s\033[0m (IDs to check left: %s)",
-                color_code,
-                user_id,
-                format_username_for_log(user_name),
-                sleep_time // 60,
-                lols_spam,
-                len(active_user_checks_dict),
-            )
+    if user_id not in active_user_checks_dict:  # if user banned somewhere else
+        return None
 
-            # getting message to delete link if it is in the checks dict
-            # Note: Currently returns first message link - consider handling multiple links
-            if user_id in active_user_checks_dict:
-                if isinstance(active_user_checks_dict[user_id], dict):
-                    # Detect post-join profile changes (name/username/photo)
-                    _entry = active_user_checks_dict[user_id]
-                    baseline = (
-                        _entry.get("baseline") if isinstance(_entry, dict) else None
-                    )
-                    already_notified = (
-                        _entry.get("notified_profile_change")
-                        if isinstance(_entry, dict)
-                        else False
-                    )
-                    if baseline and not already_notified:
-                        _chat_info = (
-                            baseline.get("chat", {})
-                            if isinstance(baseline, dict)
-                            else {}
+    try:
+        lols_spam = await spam_check(user_id, force_refresh=True)
+
+        # Get the color code based on the value of lols_spam
+        color_code = color_map.get(
+            lols_spam, "\033[93m"
+        )  # Default to yellow if lols_spam is not in the map
+
+        # Log the message with the appropriate color
+        LOGGER.debug(
+            "%s%s:%s %02dmin check lols_cas_spam: %s\033[0m (IDs to check left: %s)",
+            color_code,
+            user_id,
+            format_username_for_log(user_name),
+            sleep_time // 60,
+            lols_spam,
+            len(active_user_checks_dict),
+        )
+
+        # getting message to delete link if it is in the checks dict
+        # Note: Currently returns first message link - consider handling multiple links
+        if user_id in active_user_checks_dict:
+            if isinstance(active_user_checks_dict[user_id], dict):
+                # Detect post-join profile changes (name/username/photo)
+                _entry = active_user_checks_dict[user_id]
+                baseline = (
+                    _entry.get("baseline") if isinstance(_entry, dict) else None
+                )
+                already_notified = (
+                    _entry.get("notified_profile_change")
+                    if isinstance(_entry, dict)
+                    else False
+                )
+                if baseline and not already_notified:
+                    _chat_info = (
+                        baseline.get("chat", {})
+                        if isinstance(baseline, dict)
+                        else {}
+                    )
+                    _chat_id = _chat_info.get("id")
+
+                    # Start from baseline and override with live data if available
+                    cur_first = baseline.get("first_name", "")
+                    cur_last = baseline.get("last_name", "")
+                    cur_username = baseline.get("username", "")
+                    cur_photo_count = baseline.get("photo_count", 0)
+
+                    # Live data: one refresh per monitoring step, which also
+                    # feeds the snapshot the message handler reads between steps.
+                    # getChatMember stays: deleted accounts send no updates.
+                    with outbound_lane(OutboundLane.BACKGROUND):
+                        _snapshot = await refresh_profile_snapshot(user_id, _chat_id)
+                    _snapshot = _snapshot or PROFILE_SNAPSHOTS.get(user_id)
+                    if _snapshot:
+                        # Names stay None until seen: never mistake them for a deleted account
+                        if _snapshot.first_name is not None:
+                            cur_first = _snapshot.first_name
+                            cur_last = _snapshot.last_name
+                            cur_username = _snapshot.username
+                        cur_photo_count = _snapshot.photo_count
+                    else:
+                        LOGGER.debug(
+                            "%s:%s no profile snapshot for profile-change check",
+                            user_id,
+                            format_username_for_log(user_name),
                         )
-                        _chat_id = _chat_info.get("id")
 
-                        # Start from baseline and override with live data if available
-                        cur_first = baseline.get("first_name", "")
-                        cur_last = baseline.get("last_name", "")
-                        cur_username = baseline.get("username", "")
-                        cur_photo_count = baseline.get("photo_count", 0)
+                    changed = []
+                    if cur_first != baseline.get("first_name", ""):
+                        changed.append("first name")
+                    if cur_last != baseline.get("last_name", ""):
+                        changed.append("last name")
+                    # Normalize usernames before comparison to handle !UNDEFINED!/None/empty equivalence
+                    if normalize_username(cur_username) != normalize_username(baseline.get("username", "")):
+                        changed.append("username")
+                    if baseline.get("photo_count", 0) == 0 and cur_photo_count > 0:
+                        changed.append("profile photo")
 
-                        # Only fetch live data if we have a valid chat_id
-                        if _chat_id:
-                            try:
-                                _member = await BOT.get_chat_member(_chat_id, user_id)
-                                _user = getattr(_member, "user", None) or _member
-                                cur_first = getattr(_user, "first_name", "") or ""
-                                cur_last = getattr(_user, "last_name", "") or ""
-                                cur_username = getattr(_user, "username", "") or ""
-                            except TelegramBadRequest as _e:
-                                LOGGER.debug(
-                                    "%s:%s unable to fetch chat member for profile-change check: %s",
-                                    user_id,
-                                    format_username_for_log(user_name),
-                                    _e,
-                                )
+                    # Check if account was deleted by Telegram:
+                    # All profile fields become empty when account is deleted
+                    _had_name = baseline.get("first_name", "") or baseline.get("last_name", "")
+                    _now_empty = not cur_first and not cur_last and not cur_username
+                    _is_deleted_account = _had_name and _now_empty
+
+                    # Handle deleted account separately - ban globally and report to autoban
+                    if _is_deleted_account:
+                        chat_username = _chat_info.get("username")
+                        chat_title = _chat_info.get("title") or ""
+                        universal_chatlink = build_chat_link(_chat_id, chat_username, chat_title) if _chat_id else "(unknown chat)"
+                        _ts = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
 
+                        # Get original username from baseline for logging
+                        _orig_username = baseline.get("username", "!UNDEFINED!")
+                        _orig_first = baseline.get("first_name", "")
+                        _orig_last = baseline.get("last_name", "")
+
+                        # Get list of other chats user was member of (before banning)
+                        other_chats_info = ""
                         try:
-                            _photos = await BOT.get_user_profile_photos(
-                                user_id, limit=1
-                            )
-                            cur_photo_count = (
-                                getattr(_photos, "total_count", 0)
-                                if _photos
-                                else cur_photo_count
-                            )
-                        except TelegramBadRequest as _e:
-                            LOGGER.debug(
-                                "%s:%s unable to fetch photo count during checks: %s",
-                                user_id,
-                                format_username_for_log(user_name),
-                                _e,
+                            other_chats = await get_user_other_chats(
+                                user_id, _chat_id or 0, CHANNEL_IDS, CHANNEL_DICT
                             )
-
-                        changed = []
-                        if cur_first != baseline.get("first_name", ""):
-                            changed.append("first name")
-                        if cur_last != baseline.get("last_name", ""):
-                            changed.append("last name")
-                        # Normalize usernames before comparison to handle !UNDEFINED!/None/empty equivalence
-                        if normalize_username(cur_username) != normalize_username(baseline.get("username", "")):
-                            changed.append("username")
-                        if baseline.get("photo_count", 0) == 0 and cur_photo_count > 0:
-                            changed.append("profile photo")
-                        
-                        # Check if account was deleted by Telegram:
-                        # All profile fields become empty when account is deleted
-                        _had_name = baseline.get("first_name", "") or baseline.get("last_name", "")
-                        _now_empty = not cur_first and not cur_last and not cur_username
-                        _is_deleted_account = _had_name and _now_empty
-                        
-                        # Handle deleted account separately - ban globally and report to autoban
-                        if _is_deleted_account:
-                            chat_username = _chat_info.get("username")
-                            chat_title = _chat_info.get("title") or ""
-                            universal_chatlink = build_chat_link(_chat_id, chat_username, chat_title) if _chat_id else "(unknown chat)"
-                            _ts = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-                            
-                            # Get original username from baseline for logging
-                            _orig_username = baseline.get("username", "!UNDEFINED!")
-                            _orig_first = baseline.get("first_name", "")
-                            _orig_last = baseline.get("last_name", "")
-                            
-                            # Get list of other chats user was member of (before banning)
-                            other_chats_info = ""
-                            try:
-                                other_chats = await get_user_other_chats(
-                                    user_id, _chat_id or 0, CHANNEL_IDS, CHANNEL_DICT
+                            if other_chats:
+                                other_chats_links = []
+                                for oc_id, oc_name, oc_username in other_chats:
+                                    if oc_username:
+                                        other_chats_links.append(
+                                            f"<a href='https://t.me/{oc_username}'>@{oc_username}</a> ({html.escape(oc_name)})"
+                                        )
+                                    else:
+                                        oc_id_str = str(oc_id)[4:] if str(oc_id).startswith("-100") else str(oc_id)
+                                        other_chats_links.append(
+                                            f"<a href='https://t.me/c/{oc_id_str}'>{html.escape(oc_name)}</a>"
+                                        )
+                                other_chats_list = "\n   • ".join(other_chats_links)
+                                other_chats_info = (
+                                    f"\n👥 <b>Was member of {len(other_chats)} other chat(s):</b>\n   • {other_chats_list}\n"
                                 )
-                                if other_chats:
-                                    other_chats_links = []
-                                    for oc_id, oc_name, oc_username in other_chats:
-                                        if oc_username:
-                                            other_chats_links.append(
-                                                f"<a href='https://t.me/{oc_username}'>@{oc_username}</a> ({html.escape(oc_name)})"
-                                            )
-                                        else:
-                                            oc_id_str = str(oc_id)[4:] if str(oc_id).startswith("-100") else str(oc_id)
-                                            other_chats_links.append(
-                                                f"<a href='https://t.me/c/{oc_id_str}'>{html.escape(oc_name)}</a>"
-                                            )
-                                    other_chats_list = "\n   • ".join(other_chats_links)
-                                    other_chats_info = (
-                                        f"\n👥 <b>Was member of {len(other_chats)} other chat(s):</b>\n   • {other_chats_list}\n"
-                                    )
-                            except (TelegramBadRequest, TelegramForbiddenError, KeyError) as e:
-                                LOGGER.debug("Failed to get other chats for deleted account %s: %s", user_id, e)
-                            
-                            # Ban from all chats
-                            success_count, _fail_count, total_count = await ban_user_from_all_chats(
-                                user_id, _orig_username, CHANNEL_IDS, CHANNEL_DICT
-                            )
-                            
-                            # Cancel intensive watchdog if running (user is being banned)
-                            if user_id in running_intensive_watchdogs:
-                                intensive_task = running_intensive_watchdogs.pop(user_id, None)
-                                if intensive_task:
-                                    intensive_task.cancel()
-                                    LOGGER.info(
-                                        "%s:%s Intensive watchdog cancelled during deleted account ban",
-                                        user_id,
-                                        format_username_for_log(_orig_username),
-                                    )
-                            
-                            # Remove from active checks and add to banned set
-                            if user_id in active_user_checks_dict:
-                                del active_user_checks_dict[user_id]
-                            banned_user_ids.add(user_id)
-                            increment_session_ban_count()
-                            
-                            # Add to database and update baseline status (banned)
-                            add_banned_user(CONN, user_id, _orig_username, ban_source="deleted_account", 
-                                          first_name=_orig_first, last_name=_orig_last)
-                            update_user_baseline_status(CONN, user_id, monitoring_active=False, is_legit=False, is_banned=True)
-                            
-                            profile_links = (
-                                f"🔗 <b>Profile links:</b>\n"
-                                f"   ├ <a href='tg://user?id={user_id}'>id based profile link</a>\n"
-                                f"   └ <a href='tg://openmessage?user_id={user_id}'>Android</a>, <a href='https://t.me/@id{user_id}'>IOS (Apple)</a>"
-                            )
-                            
-                            # Format username for display using the standard helper function
-                            _username_display = format_username_for_log(_orig_username)
-                            
-                            # Send report to AUTOBAN thread (not AUTOREPORT - these are auto-banned)
-                            deleted_report = (
-                                f"⚠️ <b>DELETED ACCOUNT DETECTED & BANNED</b>\n\n"
-                                f"User: {html.escape(_orig_first)} {html.escape(_orig_last)} {_username_display} (<code>{user_id}</code>)\n"
-                                f"Chat: {universal_chatlink}\n"
-                                f"Detected at: {_ts}\n"
-                                f"Banned from: {success_count}/{total_count} chats"
-                                f"{other_chats_info}\n"
-                                f"{profile_links}"
-                            )
-                            await safe_send_message(
-                                BOT,
-                                ADMIN_GROUP_ID,
-                                deleted_report,
-                                LOGGER,
-                                message_thread_id=ADMIN_AUTOBAN,
-                                parse_mode="HTML",
-                                disable_web_page_preview=True,
-                            )
-                            LOGGER.info(
-                                "\033[91m%s:%s DELETED ACCOUNT detected during periodic check, banned from %d/%d chats\033[0m",
-                                user_id,
-                                format_username_for_log(_orig_username),
-                                success_count,
-                                total_count,
-                            )
-                            continue  # Skip normal suspicious handling for deleted accounts
-
-                        if changed:
-                            chat_username = _chat_info.get("username")
-                            chat_title = _chat_info.get("title") or ""
-                            universal_chatlink = build_chat_link(_chat_id, chat_username, chat_title) if _chat_id else "(unknown chat)"
-                            _ts = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
-                            kb = make_lols_kb(user_id)
-                            _chat_id_for_gban = baseline.get("chat", {}).get("id")
-                            # Consolidated actions menu (expands to Ban / Global Ban / Delete)
-                            # Use 0 for message_id - this is a profile change event, not a message
-                            kb.add(
-                                InlineKeyboardButton(
-                                    text="⚙️ Actions (Ban / Delete) ⚙️",
-                                    callback_data=f"sa_{_chat_id_for_gban}_0_{user_id}_0",
+                        except (TelegramBadRequest, TelegramForbiddenError, KeyError) as e:
+                            LOGGER.debug("Failed to get other chats for deleted account %s: %s", user_id, e)
+
+                        # Ban from all chats
+                        success_count, _fail_count, total_count = await ban_user_from_all_chats(
+                            user_id, _orig_username, CHANNEL_IDS, CHANNEL_DICT
+                        )
+
+                        # Cancel intensive watchdog if running (user is being banned)
+                        if user_id in running_intensive_watchdogs:
+                            intensive_task = running_intensive_watchdogs.pop(user_id, None)
+                            if intensive_task:
+                                intensive_task.cancel()
+                                LOGGER.info(
+                                    "%s:%s Intensive watchdog cancelled during deleted account ban",
+                                    user_id,
+                                    format_username_for_log(_orig_username),
                                 )
-                            )
 
-                            def _fmt(old, new, label, username=False):
-                                if username:
-                                    old_disp = f"@{old}" if old else "!UNDEFINED!"
-                                    new_disp = f"@{new}" if new else "!UNDEFINED!"
-                                else:
-                                    old_disp = html.escape(old) if old else ""
-                                    new_disp = html.escape(new) if new else ""
-                                if old != new:
-                                    return f"{label}: {old_disp or '∅'} ➜ <b>{new_disp or '∅'}</b>"
-                                return f"{label}: {new_disp or '∅'}"
-
-                            field_lines = [
-                                _fmt(
-                                    baseline.get("first_name", ""),
-                                    cur_first,
-                                    "First name",
-                                ),
-                                _fmt(
-                                    baseline.get("last_name", ""), cur_last, "Last name"
-                                ),
-                                _fmt(
-                                    baseline.get("username", ""),
-                                    cur_username,
-                                    "Username",
-                                    username=True,
-                                ),
-                                f"User ID: <code>{user_id}</code>",
-                            ]
-                            if (
-                                baseline.get("photo_count", 0) == 0
-                                and cur_photo_count > 0
-                            ):
-                                field_lines.append("Profile photo: none ➜ <b>set</b>")
-
-                            profile_links = (
-                                f"🔗 <b>Profile links:</b>\n"
-                                f"   ├ <a href='tg://user?id={user_id}'>id based profile link</a>\n"
-                                f"   └ <a href='tg://openmessage?user_id={user_id}'>Android</a>, <a href='https://t.me/@id{user_id}'>IOS (Apple)</a>"
-                            )
-                            # Compute elapsed time since join if we have a joined_at
-                            joined_at_raw = baseline.get("joined_at")
-                            elapsed_line = ""
-                            if joined_at_raw:
-                                try:
-                                    # Handle both formats: with and without timezone (+00:00)
-                                    joined_dt = datetime.fromisoformat(
-                                        joined_at_raw.replace(" ", "T")
-                                    )
-                                    # All timestamps in DB are UTC (naive=UTC, aware=+00:00)
-                                    # Convert naive to aware for comparison
-                                    if joined_dt.tzinfo is None:
-                                        joined_dt = joined_dt.replace(tzinfo=timezone.utc)
-                                    delta = datetime.now(timezone.utc) - joined_dt
-                                    # human friendly formatting
-                                    days = delta.days
-                                    hours, rem = divmod(delta.seconds, 3600)
-                                    minutes, seconds = divmod(rem, 60)
-                                    parts = []
-                                    if days:
-                                        parts.append(f"{days}d")
-                                    if hours:
-                                        parts.append(f"{hours}h")
-                                    if minutes and not days:
-                                        parts.append(f"{minutes}m")
-                                    if seconds and not days and not hours:
-                                        parts.append(f"{seconds}s")
-                                    human_elapsed = " ".join(parts) or f"{seconds}s"
-                                    elapsed_line = f"\nJoined at: {joined_at_raw} (elapsed: {human_elapsed})"
-                                except ValueError:
-                                    elapsed_line = f"\nJoined at: {joined_at_raw}"
-
-                            message_text = (
-                                f"Suspicious profile change detected after joining {universal_chatlink}.\n"
-                                + "\n".join(field_lines)
-                                + f"\nChanges: <b>{', '.join(changed)}</b> at {_ts}."
-                                + elapsed_line
-                                + "\n"
-                                + profile_links
-                            )
+                        # Remove from active checks and add to banned set
+                        if user_id in active_user_checks_dict:
+                            del active_user_checks_dict[user_id]
+                        banned_user_ids.add(user_id)
+                        increment_session_ban_count()
 
-                            await safe_send_message(
-                                BOT,
-                                ADMIN_GROUP_ID,
-                                message_text,
-                                LOGGER,
-                                message_thread_id=ADMIN_SUSPICIOUS,
-                                parse_mode="HTML",
-                                disable_web_page_preview=True,
-                                reply_markup=kb.as_markup(),
-                            )
-                            # Log periodic profile change
-                            await log_profile_change(
-                                user_id=user_id,
-                                username=cur_username,
-                                context="periodic",
-                                chat_id=_chat_id,
-                                chat_title=chat_title,
-                                changed=changed,
-                                old_values=make_profile_dict(
-                                    baseline.get("first_name", ""),
-                                    baseline.get("last_name", ""),
-                                    baseline.get("username", ""),
-                                    baseline.get("photo_count", 0),
-                                ),
-                                new_values=make_profile_dict(
-                                    cur_first,
-                                    cur_last,
-                                    cur_username,
-                                    cur_photo_count,
-                                ),
-                                photo_changed=("profile photo" in changed),
+                        # Add to database and update baseline status (banned)
+                        await DB.write(add_banned_user, user_id, _orig_username, ban_source="deleted_account", 
+                                       first_name=_orig_first, last_name=_orig_last)
+                        await DB.write(update_user_baseline_status, user_id, monitoring_active=False, is_legit=False, is_banned=True)
+
+                        profile_links = (
+                            f"🔗 <b>Profile links:</b>\n"
+                            f"   ├ <a href='tg://user?id={user_id}'>id based profile link</a>\n"
+                            f"   └ <a href='tg://openmessage?user_id={user_id}'>Android</a>, <a href='https://t.me/@id{user_id}'>IOS (Apple)</a>"
+                        )
+
+                        # Format username for display using the standard helper function
+                        _username_display = format_username_for_log(_orig_username)
+
+                        # Send report to AUTOBAN thread (not AUTOREPORT - these are auto-banned)
+                        deleted_report = (
+                            f"⚠️ <b>DELETED ACCOUNT DETECTED & BANNED</b>\n\n"
+                            f"User: {html.escape(_orig_first)} {html.escape(_orig_last)} {_username_display} (<code>{user_id}</code>)\n"
+                            f"Chat: {universal_chatlink}\n"
+                            f"Detected at: {_ts}\n"
+                            f"Banned from: {success_count}/{total_count} chats"
+                            f"{other_chats_info}\n"
+                            f"{profile_links}"
+                        )
+                        await safe_send_message(
+                            BOT,
+                            ADMIN_GROUP_ID,
+                            deleted_report,
+                            LOGGER,
+                            message_thread_id=ADMIN_AUTOBAN,
+                            parse_mode="HTML",
+                            disable_web_page_preview=True,
+                        )
+                        LOGGER.info(
+                            "\033[91m%s:%s DELETED ACCOUNT detected during periodic check, banned from %d/%d chats\033[0m",
+                            user_id,
+                            format_username_for_log(_orig_username),
+                            success_count,
+                            total_count,
+                        )
+                        return None  # Skip normal suspicious handling for deleted accounts
+
+                    if changed:
+                        chat_username = _chat_info.get("username")
+                        chat_title = _chat_info.get("title") or ""
+                        universal_chatlink = build_chat_link(_chat_id, chat_username, chat_title) if _chat_id else "(unknown chat)"
+                        _ts = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+                        kb = make_lols_kb(user_id)
+                        _chat_id_for_gban = baseline.get("chat", {}).get("id")
+                        # Consolidated actions menu (expands to Ban / Global Ban / Delete)
+                        # Use 0 for message_id - this is a profile change event, not a message
+                        kb.add(
+                            InlineKeyboardButton(
+                                text="⚙️ Actions (Ban / Delete) ⚙️",
+                                callback_data=f"sa_{_chat_id_for_gban}_0_{user_id}_0",
                             )
-                            active_user_checks_dict[user_id][
-                                "notified_profile_change"
-                            ] = True
-
-                    suspicious_messages = {
-                        k: v
-                        for k, v in active_user_checks_dict[user_id].items()
-                        if isinstance(k, str)
-                        and "_" in k
-                        and k not in ("username", "baseline", "notified_profile_change")
-                    }
-                    if suspicious_messages:
-                        chat_id, message_id = next(iter(suspicious_messages)).split("_")
-                        message_to_delete = [
-                            int(str(chat_id).replace("-100", "", 1)),
-                            int(message_id),
+                        )
+
+                        def _fmt(old, new, label, username=False):
+                            if username:
+                                old_disp = f"@{old}" if old else "!UNDEFINED!"
+                                new_disp = f"@{new}" if new else "!UNDEFINED!"
+                            else:
+                                old_disp = html.escape(old) if old else ""
+                                new_disp = html.escape(new) if new else ""
+                            if old != new:
+                                return f"{label}: {old_disp or '∅'} ➜ <b>{new_disp or '∅'}</b>"
+                            return f"{label}: {new_disp or '∅'}"
+
+                        field_lines = [
+                            _fmt(
+                                baseline.get("first_name", ""),
+                                cur_first,
+                                "First name",
+                            ),
+                            _fmt(
+                                baseline.get("last_name", ""), cur_last, "Last name"
+                            ),
+                            _fmt(
+                                baseline.get("username", ""),
+                                cur_username,
+                                "Username",
+                                username=True,
+                            ),
+                            f"User ID: <code>{user_id}</code>",
                         ]
-            else:
-                LOGGER.warning(
-                    "%s:%s User ID not found in active_user_checks_dict. Skipping...",
-                    user_id,
-                    format_username_for_log(user_name),
-                )
-                await cancel_named_watchdog(user_id, user_name)
-                # stop cycle
-                break
+                        if (
+                            baseline.get("photo_count", 0) == 0
+                            and cur_photo_count > 0
+                        ):
+                            field_lines.append("Profile photo: none ➜ <b>set</b>")
 
-            if await check_and_autoban(
-                event_record,
+                        profile_links = (
+                            f"🔗 <b>Profile links:</b>\n"
+                            f"   ├ <a href='tg://user?id={user_id}'>id based profile link</a>\n"
+                            f"   └ <a href='tg://openmessage?user_id={user_id}'>Android</a>, <a href='https://t.me/@id{user_id}'>IOS (Apple)</a>"
+                        )
+                        # Compute elapsed time since join if we have a joined_at
+                        joined_at_raw = baseline.get("joined_at")
+                        elapsed_line = ""
+                        if joined_at_raw:
+                            try:
+                                # Handle both formats: with and without timezone (+00:00)
+                                joined_dt = datetime.fromisoformat(
+                                    joined_at_raw.replace(" ", "T")
+                                )
+                                # All timestamps in DB are UTC (naive=UTC, aware=+00:00)
+                                # Convert naive to aware for comparison
+                                if joined_dt.tzinfo is None:
+                                    joined_dt = joined_dt.replace(tzinfo=timezone.utc)
+                                delta = datetime.now(timezone.utc) - joined_dt
+                                # human friendly formatting
+                                days = delta.days
+                                hours, rem = divmod(delta.seconds, 3600)
+                                minutes, seconds = divmod(rem, 60)
+                                parts = []
+                                if days:
+                                    parts.append(f"{days}d")
+                                if hours:
+                                    parts.append(f"{hours}h")
+                                if minutes and not days:
+                                    parts.append(f"{minutes}m")
+                                if seconds and not days and not hours:
+                                    parts.append(f"{seconds}s")
+                                human_elapsed = " ".join(parts) or f"{seconds}s"
+                                elapsed_line = f"\nJoined at: {joined_at_raw} (elapsed: {human_elapsed})"
+                            except ValueError:
+                                elapsed_line = f"\nJoined at: {joined_at_raw}"
+
+                        message_text = (
+                            f"Suspicious profile change detected after joining {universal_chatlink}.\n"
+                            + "\n".join(field_lines)
+                            + f"\nChanges: <b>{', '.join(changed)}</b> at {_ts}."
+                            + elapsed_line
+                            + "\n"
+                            + profile_links
+                        )
+
+                        await safe_send_message(
+                            BOT,
+                            ADMIN_GROUP_ID,
+                            message_text,
+                            LOGGER,
+                            message_thread_id=ADMIN_SUSPICIOUS,
+                            parse_mode="HTML",
+                            disable_web_page_preview=True,
+                            reply_markup=kb.as_markup(),
+                        )
+                        # Log periodic profile change
+                        await log_profile_change(
+                            user_id=user_id,
+                            username=cur_username,
+                            context="periodic",
+                            chat_id=_chat_id,
+                            chat_title=chat_title,
+                            changed=changed,
+                            old_values=make_profile_dict(
+                                baseline.get("first_name", ""),
+                                baseline.get("last_name", ""),
+                                baseline.get("username", ""),
+                                baseline.get("photo_count", 0),
+                            ),
+                            new_values=make_profile_dict(
+                                cur_first,
+                                cur_last,
+                                cur_username,
+                                cur_photo_count,
+                            ),
+                            photo_changed=("profile photo" in changed),
+                        )
+                        active_user_checks_dict[user_id][
+                            "notified_profile_change"
+                        ] = True
+
+                suspicious_messages = {
+                    k: v
+                    for k, v in active_user_checks_dict[user_id].items()
+                    if isinstance(k, str)
+                    and "_" in k
+                    and k not in ("username", "baseline", "notified_profile_change")
+                }
+                if suspicious_messages:
+                    chat_id, message_id = next(iter(suspicious_messages)).split("_")
+                    message_to_delete = [
+                        int(str(chat_id).replace("-100", "", 1)),
+                        int(message_id),
+                    ]
+        else:
+            LOGGER.warning(
+                "%s:%s User ID not found in active_user_checks_dict. Skipping...",
                 user_id,
-                inout_logmessage,
-                user_name,
-                lols_spam=lols_spam,
-                message_to_delete=message_to_delete,
-            ):
-                return
+                format_username_for_log(user_name),
+            )
+            await cancel_named_watchdog(user_id, user_name)
+            # stop cycle
+            return None
 
-    except asyncio.exceptions.CancelledError:
-        # Shutdown in progress - persist ban state
-        # Don't spam logs - on_shutdown will log summary
-        if user_id in active_user_checks_dict:
-            active_user_checks_dict.pop(user_id, None)
-            banned_user_ids.add(user_id)
-            increment_session_ban_count()
-        # Re-raise to let caller know task was cancelled
-        raise
+        if await check_and_autoban(
+            event_record,
+            user_id,
+            inout_logmessage,
+            user_name,
+            lols_spam=lols_spam,
+            message_to_delete=message_to_delete,
+        ):
+            return None
 
     except aiohttp.ServerDisconnectedError as e:
         LOGGER.warning(
@@ -3733,51 +4249,102 @@ async def perform_checks(
             e,
         )
 
-    finally:
-        # Remove the user ID from the active set when done
-        # Finally Block:
-        # The `finally` block ensures that the `user_id`
-        # is removed from the `active_user_checks` dict
-        # after all checks are completed or
-        # if the function exits early due to a `return` statement:
-        if (
-            user_id in active_user_checks_dict
-        ):  # avoid case when manually banned by admin same time
-            # remove user from active checks dict as LEGIT / cleanup baseline
-            try:
-                del active_user_checks_dict[user_id]
-            except KeyError:
-                active_user_checks_dict.pop(user_id, None)
-            # Mark monitoring as ended (completed without ban = legit)
-            update_user_baseline_status(CONN, user_id, monitoring_active=False, is_legit=True)
-            if len(active_user_checks_dict) > 3:
-                active_user_checks_dict_last3_list = list(
-                    active_user_checks_dict.items()
-                )[-3:]
-                active_user_checks_dict_last3_str = ", ".join(
-                    [
-                        f"{uid}: {uname}"
-                        for uid, uname in active_user_checks_dict_last3_list
-                    ]
-                )
-                LOGGER.info(
-                    "\033[92m%s:%s removed from active_user_checks_dict in finally block:\n\t\t\t%s... %d totally\033[0m",
-                    user_id,
-                    format_username_for_log(user_name),
-                    active_user_checks_dict_last3_str,  # Last 3 elements
-                    len(active_user_checks_dict),  # Number of elements left
-                )
-            else:
-                LOGGER.info(
-                    "\033[92m%s:%s removed from active_user_checks_dict in finally block:\n\t\t\t%s\033[0m",
-                    user_id,
-                    format_username_for_log(user_name),
-                    active_user_checks_dict,
-                )
+    check.message_to_delete = message_to_delete
+    return await advance_monitoring_step(check)
+
+
+async def advance_monitoring_step(check: MonitoringJob) -> float | None:
+    """Move check to its next ladder step and return when it is due (None when over)."""
+    check.step += 1
+    # Collapse steps that are already overdue (late dispatch) into the next one
+    elapsed_seconds = time.time() - check.start_time.timestamp()
+    while (
+        check.step < len(MONITORING_SLEEP_TIMES) - 1
+        and MONITORING_SLEEP_TIMES[check.step] <= elapsed_seconds
+    ):
+        check.step += 1
+    if check.step >= len(MONITORING_SLEEP_TIMES):
+        finish_user_monitoring(check.user_id, check.user_name)
+        return None
+    next_check_at = check.start_time.timestamp() + MONITORING_SLEEP_TIMES[check.step]
+    await DB.write(save_monitoring_schedule, check.user_id, check.step, next_check_at)
+    return next_check_at
+
+
+async def skip_failed_monitoring_step(job: ScheduledJob, error: Exception) -> float | None:
+    """Give-up handler of MONITORING_SCHEDULER: a step that kept failing is
+    skipped, so the rest of the ladder still runs and the last step still
+    finishes monitoring (instead of leaving the user in active checks)."""
+    check: MonitoringJob = job.payload
+    if check.user_id not in active_user_checks_dict:  # banned or removed meanwhile
+        return None
+    LOGGER.warning(
+        "%s:%s monitoring step %d skipped after repeated errors: %s",
+        check.user_id,
+        format_username_for_log(check.user_name),
+        check.step,
+        error,
+    )
+    return await advance_monitoring_step(check)
+
+
+def finish_user_monitoring(user_id: int, user_name: str = "!UNDEFINED!"):
+    """Remove a user who passed the whole monitoring ladder and mark them legit."""
+    if (
+        user_id in active_user_checks_dict
+    ):  # avoid case when manually banned by admin same time
+        # remove user from active checks dict as LEGIT / cleanup baseline
+        try:
+            del active_user_checks_dict[user_id]
+        except KeyError:
+            active_user_checks_dict.pop(user_id, None)
+        # Mark monitoring as ended (completed without ban = legit)
+        DB.submit_write(update_user_baseline_status, user_id, monitoring_active=False, is_legit=True)
+        if len(active_user_checks_dict) > 3:
+            active_user_checks_dict_last3_list = list(
+                active_user_checks_dict.items()
+            )[-3:]
+            active_user_checks_dict_last3_str = ", ".join(
+                [
+                    f"{uid}: {uname}"
+                    for uid, uname in active_user_checks_dict_last3_list
+                ]
+            )
+            LOGGER.info(
+                "\033[92m%s:%s removed from active_user_checks_dict after monitoring completed:\n\t\t\t%s... %d totally\033[0m",
+                user_id,
+                format_username_for_log(user_name),
+                active_user_checks_dict_last3_str,  # Last 3 elements
+                len(active_user_checks_dict),  # Number of elements left
+            )
+        else:
+            LOGGER.info(
+                "\033[92m%s:%s removed from active_user_checks_dict after monitoring completed:\n\t\t\t%s\033[0m",
+                user_id,
+                format_username_for_log(user_name),
+                active_user_checks_dict,
+            )
+
+
+# Single scheduler owning all monitoring ladders (replaces one sleeping task per user)
+MONITORING_SCHEDULER = DueTimeScheduler(
+    perform_checks,
+    max_concurrency=MONITORING_MAX_CONCURRENCY,
+    logger=LOGGER,
+    name="monitoring",
+    on_give_up=skip_failed_monitoring_step,
+)
 
 
 async def cancel_named_watchdog(user_id: int, user_name: str = "!UNDEFINED!"):
     """Cancels a running watchdog task for a given user ID (also cancels intensive watchdog if running)."""
+    # Drop the monitoring ladder from the scheduler
+    if MONITORING_SCHEDULER.cancel(user_id):
+        LOGGER.info(
+            "%s:%s Monitoring schedule cancelled.",
+            user_id,
+            format_username_for_log(user_name),
+        )
     # Also cancel intensive watchdog if running
     if user_id in running_intensive_watchdogs:
         intensive_task = running_intensive_watchdogs.pop(user_id, None)
@@ -3882,7 +4449,9 @@ async def mark_user_as_legit(
             )
         
         # Update baseline status to mark as legit
-        update_user_baseline_status(CONN, user_id, monitoring_active=False, is_legit=True)
+        await DB.write(update_user_baseline_status, user_id, monitoring_active=False, is_legit=True)
+        # A cached "spam" verdict would otherwise outlive the admin's decision for hours
+        SPAM_VERDICT_CACHE.invalidate(user_id)
         
         log_msg = f"{user_id}:{format_username_for_log(user_name)} marked as legit by {legitimized_by}"
         if notes:
@@ -3955,7 +4524,7 @@ async def perform_intensive_checks(
                 return
             
             await asyncio.sleep(10)
-            lols_spam = await spam_check(user_id)
+            lols_spam = await spam_check(user_id, force_refresh=True)
             
             color_code = color_map.get(lols_spam, "\033[93m")
             LOGGER.debug(
@@ -3998,7 +4567,7 @@ async def perform_intensive_checks(
                 return
             
             await asyncio.sleep(30)
-            lols_spam = await spam_check(user_id)
+            lols_spam = await spam_check(user_id, force_refresh=True)
             
             color_code = color_map.get(lols_spam, "\033[93m")
             LOGGER.debug(
@@ -4040,7 +4609,7 @@ async def perform_intensive_checks(
                 return
             
             await asyncio.sleep(60)
-            lols_spam = await spam_check(user_id)
+            lols_spam = await spam_check(user_id, force_refresh=True)
             
             color_code = color_map.get(lols_spam, "\033[93m")
             LOGGER.debug(
@@ -4262,6 +4831,29 @@ async def log_lists(group=TECHNOLOG_GROUP_ID, msg_thread_id=TECHNO_ADMIN):
         len(active_user_checks_dict),
         active_user_checks_dict,
     )
+    LOGGER.info("\033[93mAdmin roster cache: %s\033[0m", ADMIN_ROSTER_CACHE.stats())
+    LOGGER.info("\033[93mSpam verdict cache: %s\033[0m", SPAM_VERDICT_CACHE.stats())
+    LOGGER.info("\033[93mSpam wave index: %s\033[0m", SPAM_WAVE_DETECTOR.stats())
+    LOGGER.info("\033[93mKnown spam fingerprints: %s\033[0m", KNOWN_SPAM_HASHES.stats())
+    LOGGER.info("\033[93mMonitoring scheduler: %s\033[0m", MONITORING_SCHEDULER.stats())
+    LOGGER.info("\033[93mDatabase: %s\033[0m", DB.stats())
+    LOGGER.info("\033[93mIngest buffer: %s\033[0m", INGEST_BUFFER.stats())
+    LOGGER.info("\033[93mUpdate pipeline: %s\033[0m", UPDATE_PIPELINE.stats())
+    LOGGER.info("\033[93mMessage gate: %s\033[0m", MESSAGE_GATE.stats())
+    LOGGER.info("\033[93mBan fan-out: %s\033[0m", BAN_FANOUT.stats())
+    LOGGER.info("\033[93mOutbound scheduler: %s\033[0m", OUTBOUND_SCHEDULER.stats())
+    LOGGER.info("\033[93mTECHNOLOG batcher: %s\033[0m", TECHNOLOG_BATCHER.stats())
+    LOGGER.info("\033[93mChat membership cache: %s\033[0m", CHAT_MEMBERSHIP.stats())
+    LOGGER.info("\033[93mProfile snapshots: %s\033[0m", PROFILE_SNAPSHOTS.stats())
+    LOGGER.info(
+        "\033[93mReport trackers: autoreported messages %s / users %s, suspicious messages %s / users %s, media groups %s, posted usernames %s\033[0m",
+        len(autoreported_messages),
+        len(autoreported_users),
+        len(suspicious_reported_messages),
+        len(suspicious_reported_users),
+        len(processed_media_groups),
+        len(POSTED_USERNAMES),
+    )
     # Note: move inout and daily_spam logs to the dedicated folders
     # save banned users list to the file
     # Get yesterday's date
@@ -4275,7 +4867,7 @@ async def log_lists(group=TECHNOLOG_GROUP_ID, msg_thread_id=TECHNO_ADMIN):
 
     # Save daily archive of banned users to inout folder (for historical records)
     # Query database directly
-    db_banned_users = get_banned_users(CONN)
+    db_banned_users = await DB.read(get_banned_users)
     with open(filename, "w", encoding="utf-8") as file:
         for bu in db_banned_users:
             _id = bu["user_id"]
@@ -4311,7 +4903,7 @@ async def log_lists(group=TECHNOLOG_GROUP_ID, msg_thread_id=TECHNO_ADMIN):
                     if k != "username" and isinstance(v, str) and v.startswith("http"):
                         active_user_checks_list.append(v)
         # Create a list for banned users by querying database
-        db_banned_users = get_banned_users(CONN)
+        db_banned_users = await DB.read(get_banned_users)
         banned_users_list = [
             f"<code>{bu['user_id']}</code>  {extract_username(bu['username'] or bu['first_name'] or '!UNDEFINED!')}"
             for bu in db_banned_users
@@ -4458,6 +5050,12 @@ if __name__ == "__main__":
         """Checks for change in the chat members statuses and check if they are spammers."""
         # Update chat username cache
         update_chat_username_cache(update.chat.id, update.chat.username)
+        # Promotions/demotions make the cached admin roster stale
+        invalidate_admin_cache_on_update(update)
+        remember_chat_membership(
+            update.chat.id, update.new_chat_member.user.id, update.new_chat_member.status
+        )
+        PROFILE_SNAPSHOTS.observe(update.new_chat_member.user)
 
         # Who did the action
         by_user = None
@@ -4852,11 +5450,12 @@ if __name__ == "__main__":
                         
                         # Mark as legit in database
                         try:
-                            CURSOR.execute(
+                            _received_at = datetime.now(timezone.utc)
+                            await DB.execute(
                                 """
                                 INSERT OR REPLACE INTO recent_messages
-                                (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, received_date, new_chat_member, left_chat_member)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, received_date, new_chat_member, left_chat_member, received_ts)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                                 """,
                                 (
                                     update.chat.id,
@@ -4865,12 +5464,12 @@ if __name__ == "__main__":
                                     inout_username if inout_username != "!UNDEFINED!" else None,
                                     inout_userfirstname,
                                     inout_userlastname if inout_userlastname else None,
-                                    datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00"),
+                                    _received_at.strftime("%Y-%m-%d %H:%M:%S+00:00"),
                                     1,
                                     1,
+                                    int(_received_at.timestamp()),
                                 ),
                             )
-                            CONN.commit()
                             LOGGER.info(
                                 "\033[92m%s:%s marked as legitimate in database by admin %s:%s re-add action\033[0m",
                                 inout_userid,
@@ -4886,6 +5485,7 @@ if __name__ == "__main__":
                         # Remove from P2P network spam list
                         try:
                             p2p_removed = await remove_spam_from_2p2p(inout_userid, LOGGER, inout_username)
+                            SPAM_VERDICT_CACHE.invalidate(inout_userid)
                             if p2p_removed:
                                 LOGGER.info(
                                     "\033[92m%s:%s removed from P2P spam list by admin re-add\033[0m",
@@ -4904,12 +5504,12 @@ if __name__ == "__main__":
                             )
                         
                         # Notify tech group
-                        await safe_send_message(
-                            BOT,
+                        TECHNOLOG_BATCHER.add(
                             TECHNOLOG_GROUP_ID,
-                            f"User {inout_userid} (@{inout_username}) manually re-added to {inout_chattitle} by admin {admin_id}:@{admin_username}. Marked as legitimate.",
-                            LOGGER,
-                            message_thread_id=TECHNO_ADMIN,
+                            TECHNO_ADMIN,
+                            html.escape(
+                                f"User {inout_userid} (@{inout_username}) manually re-added to {inout_chattitle} by admin {admin_id}:@{admin_username}. Marked as legitimate."
+                            ),
                         )
                         
                         return  # Skip further processing
@@ -4930,25 +5530,11 @@ if __name__ == "__main__":
             if inout_userid not in active_user_checks_dict:
                 # Only capture baseline on join (is_member True) to compare later on leave
                 if "is_member" in locals() and is_member:
-                    try:
-                        photos = await BOT.get_user_profile_photos(
-                            inout_userid, limit=1
-                        )
-                        _photo_count = (
-                            getattr(photos, "total_count", 0) if photos else 0
-                        )
-                    except TelegramBadRequest as _e:
-                        _photo_count = 0
-                        LOGGER.debug(
-                            "%s:%s unable to fetch initial photo count: %s",
-                            inout_userid,
-                            inout_username_log,
-                            _e,
-                        )
+                    _photo_count = await get_profile_photo_count(inout_userid)
 
                     # Save baseline to database
-                    save_user_baseline(
-                        conn=CONN,
+                    await DB.write(
+                        save_user_baseline,
                         user_id=inout_userid,
                         username=update.old_chat_member.user.username,
                         first_name=update.old_chat_member.user.first_name or "",
@@ -4975,19 +5561,16 @@ if __name__ == "__main__":
                             },
                         },
                     }
-                # create task with user_id as name
-                asyncio.create_task(
-                    perform_checks(
-                        event_record=event_record,
-                        user_id=update.old_chat_member.user.id,
-                        inout_logmessage=inout_logmessage,
-                        user_name=(
-                            update.old_chat_member.user.username
-                            if update.old_chat_member.user.username
-                            else "!UNDEFINED!"
-                        ),
+                # schedule monitoring ladder for the user
+                schedule_user_checks(
+                    event_record=event_record,
+                    user_id=update.old_chat_member.user.id,
+                    inout_logmessage=inout_logmessage,
+                    user_name=(
+                        update.old_chat_member.user.username
+                        if update.old_chat_member.user.username
+                        else "!UNDEFINED!"
                     ),
-                    name=str(inout_userid),
                 )
             else:
                 LOGGER.debug(
@@ -5000,11 +5583,11 @@ if __name__ == "__main__":
         if not lols_spam:
             # Store UTC timestamps with timezone suffix (+00:00) for database portability
             update_date_utc = update.date.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00") if update.date else None
-            CURSOR.execute(
+            await DB.execute(
                 """
                 INSERT OR REPLACE INTO recent_messages
-                (chat_id, chat_username, message_id, user_id, user_name, user_first_name, user_last_name, forward_date, forward_sender_name, received_date, from_chat_title, forwarded_from_id, forwarded_from_username, forwarded_from_first_name, forwarded_from_last_name, new_chat_member, left_chat_member, membership_status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                (chat_id, chat_username, message_id, user_id, user_name, user_first_name, user_last_name, forward_date, forward_sender_name, received_date, from_chat_title, forwarded_from_id, forwarded_from_username, forwarded_from_first_name, forwarded_from_last_name, new_chat_member, left_chat_member, membership_status, received_ts, forward_ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     getattr(update.chat, "id", None),
@@ -5027,9 +5610,10 @@ if __name__ == "__main__":
                     is_member,
                     was_member,
                     str(inout_status),  # Store the actual status (member, left, kicked, restricted)
+                    to_epoch(update.date),
+                    to_epoch(update.date),
                 ),
             )
-            CONN.commit()
 
         # checking if user joins and leave chat in 1 minute or less
         if inout_status == ChatMemberStatus.LEFT:
@@ -5048,21 +5632,9 @@ if __name__ == "__main__":
                     cur_first = getattr(_u, "first_name", "") or ""
                     cur_last = getattr(_u, "last_name", "") or ""
                     cur_username = getattr(_u, "username", "") or ""
-                    try:
-                        _p = await BOT.get_user_profile_photos(inout_userid, limit=1)
-                        cur_photo_count = (
-                            getattr(_p, "total_count", 0)
-                            if _p
-                            else _baseline.get("photo_count", 0)
-                        )
-                    except TelegramBadRequest as _e:
-                        cur_photo_count = _baseline.get("photo_count", 0)
-                        LOGGER.debug(
-                            "%s:%s unable to fetch photo count on leave: %s",
-                            inout_userid,
-                            inout_username_log,
-                            _e,
-                        )
+                    cur_photo_count = await get_profile_photo_count(
+                        inout_userid, default=_baseline.get("photo_count", 0)
+                    )
 
                     _changed = []
                     if cur_first != _baseline.get("first_name", ""):
@@ -5172,16 +5744,17 @@ if __name__ == "__main__":
                             "notified_profile_change"
                         ] = True
 
-                last2_join_left_event = CURSOR.execute(
+                await INGEST_BUFFER.barrier(user_id=inout_userid)
+                last2_join_left_event = await DB.fetchall(
                     """
                     SELECT received_date, new_chat_member, left_chat_member
                     FROM recent_messages
                     WHERE user_id = ?
-                    ORDER BY received_date DESC
+                    ORDER BY received_ts DESC
                     LIMIT 2
                     """,
                     (inout_userid,),
-                ).fetchall()
+                )
                 # Handle both formats: with and without timezone
                 # Parse both timestamps, stripping timezone to avoid naive/aware mismatch
                 _dt0 = datetime.fromisoformat(last2_join_left_event[0][0].replace(" ", "T"))
@@ -5230,14 +5803,7 @@ if __name__ == "__main__":
                     )
                     if _uname_1790 and _uname_1790 not in POSTED_USERNAMES:
                         POSTED_USERNAMES.add(_uname_1790)
-                        await safe_send_message(
-                            BOT,
-                            TECHNOLOG_GROUP_ID,
-                            f"<code>{inout_userid}</code> @{_uname_1790} (1790)",
-                            LOGGER,
-                            parse_mode="HTML",
-                            message_thread_id=TECHNO_NAMES,
-                        )
+                        TECHNOLOG_BATCHER.add(TECHNOLOG_GROUP_ID, TECHNO_NAMES, f"<code>{inout_userid}</code> @{_uname_1790} (1790)")
             except IndexError:
                 LOGGER.debug(
                     "%s:%s left and has no previous join/leave events or was already in lols/cas spam",
@@ -5336,7 +5902,7 @@ if __name__ == "__main__":
         _content_hash = compute_message_hash(message.text or message.caption)
         
         if spammer_id:
-            found_message_data = get_spammer_details(
+            found_message_data = await get_spammer_details(
                 spammer_id,
                 spammer_first_name,
                 spammer_last_name,
@@ -5356,7 +5922,7 @@ if __name__ == "__main__":
 
         # For users with open profiles, or if previous fetch didn't work.
         if not found_message_data:
-            found_message_data = get_spammer_details(
+            found_message_data = await get_spammer_details(
                 spammer_id,
                 spammer_first_name,
                 spammer_last_name,
@@ -5376,7 +5942,7 @@ if __name__ == "__main__":
 
         # Try getting details for forwarded messages from channels.
         if not found_message_data:
-            found_message_data = get_spammer_details(
+            found_message_data = await get_spammer_details(
                 spammer_id,
                 spammer_first_name,
                 spammer_last_name,
@@ -5395,7 +5961,7 @@ if __name__ == "__main__":
 
         if not found_message_data:
             if forward_sender_name == "Deleted Account":
-                found_message_data = get_spammer_details(
+                found_message_data = await get_spammer_details(
                     spammer_id,
                     spammer_first_name,
                     spammer_last_name,
@@ -5652,11 +6218,11 @@ if __name__ == "__main__":
                 await message.answer(f"Thank you for the report. Report ID: {report_id}")
             else:
                 await message.answer(f"Report ID: {report_id}")
-        CURSOR.execute(
+        await DB.execute(
             """
             INSERT OR REPLACE INTO recent_messages 
-            (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, forward_date, received_date, forwarded_message_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, forward_date, received_date, forwarded_message_data, received_ts, forward_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 message.chat.id,
@@ -5668,11 +6234,11 @@ if __name__ == "__main__":
                 message.forward_date.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00") if message.forward_date else None,
                 received_date_utc,
                 str(found_message_data),
+                to_epoch(message.date),
+                to_epoch(message.forward_date),
             ),
         )
 
-        CONN.commit()
-
         # Found message data:
         #        0           1           2            3            4        5           6            7
         #     chat ID       msg #   chat username  user ID     username  first name  last name     date
@@ -5686,7 +6252,7 @@ if __name__ == "__main__":
 
         # Find duplicate messages (same content sent multiple times by the spammer)
         user_id = found_message_data[3]
-        duplicate_messages = get_duplicate_messages_by_hash(_content_hash, user_id)
+        duplicate_messages = await get_duplicate_messages_by_hash(_content_hash, user_id)
         # Exclude the primary message we already found from the duplicates list
         primary_key = (found_message_data[0], found_message_data[1])
         duplicate_messages = [
@@ -6111,10 +6677,9 @@ if __name__ == "__main__":
                 )
                 banned_user_ids.add(author_id)
                 increment_session_ban_count()
-                # cancel watchdog if running
-                for task in asyncio.all_tasks():
-                    if task.get_name() == str(author_id):
-                        task.cancel()
+                # stop monitoring: drop the scheduled checks and the active entry
+                MONITORING_SCHEDULER.cancel(author_id)
+                active_user_checks_dict.pop(author_id, None)
                 lols_check_kb = make_lols_kb(author_id)
                 await safe_send_message(
                     BOT,
@@ -6131,11 +6696,11 @@ if __name__ == "__main__":
             original_spam_message: Message = forwarded_report_state.get(
                 "original_forwarded_message"
             )
-            CURSOR.execute(
-                "SELECT chat_id, message_id, forwarded_message_data, received_date FROM recent_messages WHERE message_id = ?",
+            await INGEST_BUFFER.barrier(message_id=report_id_to_ban)
+            result = await DB.fetchone(
+                REPORTED_MESSAGE_QUERY,
                 (report_id_to_ban,),
             )
-            result = CURSOR.fetchone()
 
             if not result:
                 await callback_query.message.reply(
@@ -6217,10 +6782,9 @@ if __name__ == "__main__":
                     button_pressed_by,
                     len(active_user_checks_dict),
                 )
-                # stop the perform_checks coroutine if it is running for author_id
-                for task in asyncio.all_tasks():
-                    if task.get_name() == str(author_id):
-                        task.cancel()
+                # stop monitoring author_id: drop the scheduled checks and the active entry
+                MONITORING_SCHEDULER.cancel(author_id)
+                active_user_checks_dict.pop(author_id, None)
 
             # save event to the ban file
             _admin_for_record = f"@{button_pressed_by}" if button_pressed_by else "!UNDEFINED!"
@@ -6242,6 +6806,7 @@ if __name__ == "__main__":
             # add to the banned users set
             banned_user_ids.add(int(author_id))
             increment_session_ban_count()
+            await remember_reported_spam(report_id_to_ban, "admin_ban")
 
             # Select all messages from the user in chats with usernames
             # Note: Private chats are excluded (chat_username IS NOT NULL) since they don't have public usernames
@@ -6254,7 +6819,8 @@ if __name__ == "__main__":
                 AND chat_username IS NOT NULL
                 """
             params = {"author_id": author_id}
-            result = CURSOR.execute(query, params).fetchall()
+            await INGEST_BUFFER.barrier(user_id=author_id)
+            result = await DB.fetchall(query, params)
             # delete them one by one
             spam_messages_count = len(result)
             _raw_name = forwarded_message_data[4]
@@ -6405,9 +6971,6 @@ if __name__ == "__main__":
                 # )
 
                 try:
-                    # pause 0.02 second to prevent flood control errors
-                    await asyncio.sleep(0.02)
-
                     # ban the user and delete their messages if revoke is wotking
                     await BOT.ban_chat_member(
                         chat_id=channel_id,
@@ -6495,14 +7058,7 @@ if __name__ == "__main__":
             _uname_3088 = normalize_username(forwarded_message_data[4])
             if _uname_3088 and _uname_3088 not in POSTED_USERNAMES:
                 POSTED_USERNAMES.add(_uname_3088)
-                await safe_send_message(
-                    BOT,
-                    TECHNOLOG_GROUP_ID,
-                    f"<code>{author_id}</code> @{_uname_3088} (3088)",
-                    LOGGER,
-                    parse_mode="HTML",
-                    message_thread_id=TECHNO_NAMES,
-                )
+                TECHNOLOG_BATCHER.add(TECHNOLOG_GROUP_ID, TECHNO_NAMES, f"<code>{author_id}</code> @{_uname_3088} (3088)")
             banned_user_ids.add(author_id)
             increment_session_ban_count()
             if forwarded_message_data[3] in active_user_checks_dict:
@@ -6763,14 +7319,7 @@ if __name__ == "__main__":
             _uname_manual = normalize_username(username)
             if _uname_manual and _uname_manual not in POSTED_USERNAMES:
                 POSTED_USERNAMES.add(_uname_manual)
-                await safe_send_message(
-                    BOT,
-                    TECHNOLOG_GROUP_ID,
-                    f"<code>{user_id}</code> @{_uname_manual} (manual)",
-                    LOGGER,
-                    parse_mode="HTML",
-                    message_thread_id=TECHNO_NAMES,
-                )
+                TECHNOLOG_BATCHER.add(TECHNOLOG_GROUP_ID, TECHNO_NAMES, f"<code>{user_id}</code> @{_uname_manual} (manual)")
 
             LOGGER.info(
                 "\033[91m%s:%s manually banned from all chats by @%s\033[0m",
@@ -7523,6 +8072,8 @@ if __name__ == "__main__":
                     e,
                 )
                 # Continue processing despite error
+            if shed_optional_output("channel_debug_json"):
+                return  # Debug dump skipped while updates are backed up
             try:
                 # Convert the Message object to a dictionary, handling serialization errors
                 try:
@@ -7563,44 +8114,23 @@ if __name__ == "__main__":
             [message.chat.id, message.message_id, message.chat.username]
         )
 
-        # check if sender is an admin in the channel or admin group then log and skip the message
-        if await is_admin(message.from_user.id, message.chat.id) or await is_admin(
-            message.from_user.id, ADMIN_GROUP_ID
-        ):
-            LOGGER.debug(
-                "\033[95m%s:%s is admin, skipping the message %s in the chat %s.\033[0m\n\t\t\tMessage link: %s",
-                message.from_user.id,
-                format_username_for_log(message.from_user.username),
-                message.message_id,
-                message.chat.title,
-                message_link,
-            )
-            return  # Stop processing - don't track admin messages
-
-        # check if message is forward from allowed channels
-        if message.forward_from_chat and message.forward_from_chat.id in {
-            message.chat.id,
-            *ALLOWED_FORWARD_CHANNEL_IDS,
-        }:
-            LOGGER.debug(
-                "\033[95m%s:%s FORWARDED from allowed channel, skipping the message %s in the chat %s.\033[0m\n\t\t\tMessage link: %s",
-                message.from_user.id,
-                format_username_for_log(message.from_user.username),
-                message.message_id,
-                message.chat.title,
-                message_link,
-            )
-            return
-
-        lols_link = f"https://t.me/oLolsBot?start={message.from_user.id}"
-
-        inline_kb = create_inline_keyboard(message_link, lols_link, message)
+        ### AUTOBAHN MESSAGE CHECKING ###
+        # Entry checks, cheapest first: anonymous admin, allowed forwards and
+        # banned senders/origins from memory, then admin rosters and spam
+        # providers (network). A banned sender is decided without any API call.
+        _gate_stage, gate_verdict = await MESSAGE_GATE.run(message)
+        if gate_verdict == "skip":
+            return  # Stop processing - admins and allowed forwards are not tracked
+        sender_banned = isinstance(gate_verdict, tuple) and gate_verdict[0] == "banned"
+        # (flagged_id, provider) of a banned verdict
+        spam_verdict = gate_verdict[1] if sender_banned else (None, None)
 
         # If user is under active checks and changed profile, immediately forward to ADMIN_SUSPICIOUS with buttons
         try:
             _uid = message.from_user.id
             _entry = active_user_checks_dict.get(_uid)
-            if isinstance(_entry, dict):
+            # Banned senders go straight to the ban below, no profile photo call
+            if isinstance(_entry, dict) and not sender_banned:
                 _baseline = _entry.get("baseline")
                 _already_notified = _entry.get("notified_profile_change", False)
                 if _baseline and not _already_notified:
@@ -7612,18 +8142,10 @@ if __name__ == "__main__":
                     new_first = getattr(message.from_user, "first_name", "") or ""
                     new_last = getattr(message.from_user, "last_name", "") or ""
                     new_usern = getattr(message.from_user, "username", "") or ""
-                    new_pcnt = old_pcnt
-                    # Try to detect uploaded photo (0 -> >0)
-                    try:
-                        _p = await BOT.get_user_profile_photos(_uid, limit=1)
-                        new_pcnt = getattr(_p, "total_count", 0) if _p else old_pcnt
-                    except TelegramBadRequest as _e:
-                        LOGGER.debug(
-                            "%s:%s unable to fetch photo count on message: %s",
-                            _uid,
-                            format_username_for_log(new_usern),
-                            _e,
-                        )
+                    # Uploaded photo (0 -> >0) as of the last monitoring step;
+                    # no API call per message
+                    _snapshot = PROFILE_SNAPSHOTS.get(_uid)
+                    new_pcnt = _snapshot.photo_count if _snapshot else old_pcnt
 
                     changed = []
                     diffs = []
@@ -7786,51 +8308,8 @@ if __name__ == "__main__":
         except (TelegramBadRequest, KeyError, TypeError) as _e:
             LOGGER.debug("Immediate profile-change check failed: %s", _e)
 
-        ### AUTOBAHN MESSAGE CHECKING ###
-        # check if message is from user from active_user_checks_dict
-        # and banned_user_ids set
-        # Note: Edge case - user in both active checks and banned (race condition)
-        # Skip all spam checks for Telegram's anonymous admin ID (777000)
-        # This is when admin posts as channel name, not spam
-        if message.from_user.id == TELEGRAM_ANONYMOUS_ADMIN_ID:
-            _channel_post_link = construct_message_link([message.chat.id, message.message_id, message.chat.username])
-            _channel_chat_link = build_chat_link(message.chat.id, message.chat.username, message.chat.title)
-            LOGGER.debug(
-                "777000:ANONYMOUS_ADMIN Posted as channel in %s | msg: %s - skipping spam checks",
-                _channel_chat_link,
-                _channel_post_link,
-            )
-        elif (
-            message.from_user.id in active_user_checks_dict
-            and message.from_user.id in banned_user_ids
-        ):
-            LOGGER.warning(
-                "\033[47m\033[34m%s is in both active_user_checks_dict and banned_user_ids, check the message %s in the chat %s (%s)\033[0m",
-                message.from_user.id,
-                message.message_id,
-                message.chat.title,
-                message.chat.id,
-            )
-        elif (
-            (
-                message.from_user.id in banned_user_ids
-                or await spam_check(message.from_user.id) is True
-            )
-            or (
-                message.forward_from_chat
-                and (
-                    message.forward_from_chat.id in banned_user_ids
-                    or await spam_check(message.forward_from_chat.id) is True
-                )
-            )
-            or (
-                message.forward_from
-                and (
-                    message.forward_from.id in banned_user_ids
-                    or await spam_check(message.forward_from.id) is True
-                )
-            )
-        ):
+        # Sender verdict of MESSAGE_GATE: delete the message and ban
+        if sender_banned:
             if (
                 message.from_user and message.from_user.id in banned_user_ids
             ):  # user_id BANNED
@@ -7848,8 +8327,8 @@ if __name__ == "__main__":
                 message.forward_from and message.forward_from.id in banned_user_ids
             ):  # forward_from.id BANNED
                 logger_text = f"\033[41m\033[37m{message.from_user.id}:@{message.from_user.username if message.from_user.username else '!UNDEFINED!'} FORWARDED FROM USER: {message.forward_from.id}:@{getattr(message.forward_from, 'username', None) or message.forward_from.first_name} is in banned_user_ids, DELETING the message {message.message_id} in the chat {message.chat.title} ({message.chat.id})\033[0m"
-            else:  # marked as a SPAM by P2P server
-                logger_text = f"\033[41m\033[37m{message.from_user.id}:@{message.from_user.username if message.from_user.username else '!UNDEFINED!'} is marked as SPAMMER by spam_check, DELETING the message {message.message_id} in the chat {message.chat.title} ({message.chat.id})\033[0m"
+            else:  # marked as a SPAM by P2P server / lols / cas
+                logger_text = f"\033[41m\033[37m{message.from_user.id}:@{message.from_user.username if message.from_user.username else '!UNDEFINED!'} is marked as SPAMMER by spam_check ({spam_verdict[0]} flagged by {spam_verdict[1]}), DELETING the message {message.message_id} in the chat {message.chat.title} ({message.chat.id})\033[0m"
 
             # Forward banned user message to ADMIN AUTOBAN
             try:
@@ -7894,36 +8373,26 @@ if __name__ == "__main__":
                 )
             )
             # Add LOLS check buttons for mentioned users in the spam message (up to 3)
-            if message.entities and message.text:
-                max_mention_buttons = 3
-                mention_buttons_added = 0
-                for entity in message.entities:
-                    if mention_buttons_added >= max_mention_buttons:
-                        break
-                    entity_type = entity.get("type") if isinstance(entity, dict) else getattr(entity, "type", None)
-                    if entity_type == "mention":
-                        offset = entity.get("offset") if isinstance(entity, dict) else getattr(entity, "offset", 0)
-                        length = entity.get("length") if isinstance(entity, dict) else getattr(entity, "length", 0)
-                        mention = message.text[offset:offset + length]
-                        if mention.startswith("@"):
-                            username_clean = mention.lstrip("@")
-                            mention_lols_link = f"https://t.me/oLolsBot?start=u-{username_clean}"
-                            autoban_kb.add(
-                                InlineKeyboardButton(text=f"🔍 Check {mention}", url=mention_lols_link, style=ButtonStyle.PRIMARY)
-                            )
-                            mention_buttons_added += 1
-                    elif entity_type == "text_mention":
-                        user = entity.get("user") if isinstance(entity, dict) else getattr(entity, "user", None)
-                        if user:
-                            user_id = user.get("id") if isinstance(user, dict) else getattr(user, "id", None)
-                            if user_id:
-                                mention_lols_link = f"https://t.me/oLolsBot?start={user_id}"
-                                first_name = user.get("first_name", "") if isinstance(user, dict) else getattr(user, "first_name", "")
-                                display = first_name[:15] + "..." if len(first_name) > 15 else first_name
-                                autoban_kb.add(
-                                    InlineKeyboardButton(text=f"🔍 Check ID:{user_id} ({display})", url=mention_lols_link, style=ButtonStyle.PRIMARY)
-                                )
-                                mention_buttons_added += 1
+            max_mention_buttons = 3
+            mention_buttons_added = 0
+            for entity in get_message_features(message).entities:
+                if mention_buttons_added >= max_mention_buttons:
+                    break
+                if entity.type == "mention" and entity.text.startswith("@"):
+                    username_clean = entity.text.lstrip("@")
+                    mention_lols_link = f"https://t.me/oLolsBot?start=u-{username_clean}"
+                    autoban_kb.add(
+                        InlineKeyboardButton(text=f"🔍 Check {entity.text}", url=mention_lols_link, style=ButtonStyle.PRIMARY)
+                    )
+                    mention_buttons_added += 1
+                elif entity.type == "text_mention" and entity.user_id:
+                    mention_lols_link = f"https://t.me/oLolsBot?start={entity.user_id}"
+                    first_name = entity.user_first_name
+                    display = first_name[:15] + "..." if len(first_name) > 15 else first_name
+                    autoban_kb.add(
+                        InlineKeyboardButton(text=f"🔍 Check ID:{entity.user_id} ({display})", url=mention_lols_link, style=ButtonStyle.PRIMARY)
+                    )
+                    mention_buttons_added += 1
 
             await safe_send_message(
                 BOT,
@@ -7972,8 +8441,9 @@ if __name__ == "__main__":
                 else ""
             )
             if rogue_chan_id and (
-                is_user_banned(CONN, message.from_user.id)
-                or is_user_banned(CONN, rogue_chan_id)
+                await DB.read(is_user_banned, message.from_user.id)
+                or await DB.read(is_user_banned, rogue_chan_id)
+                or spam_verdict[0] == message.from_user.id
                 or await spam_check(message.from_user.id)
             ):
                 try:
@@ -8018,7 +8488,7 @@ if __name__ == "__main__":
                     # ban channel in the rest of chats - check database first
                     ban_rogue_chan_task = None
                     if rogue_chan_id:
-                        if is_user_banned(CONN, rogue_chan_id):
+                        if await DB.read(is_user_banned, rogue_chan_id):
                             LOGGER.info(
                                 "Channel %s (%s) is already banned (DB check), skipping ban_rogue_chat_everywhere",
                                 rogue_chan_id,
@@ -8128,8 +8598,54 @@ if __name__ == "__main__":
 
         ### STORE MESSAGES AND AUTOREPORT EM###
         try:
-            # Store message data to DB
-            store_message_to_db(CURSOR, CONN, message)
+            # Store message data to DB (group-committed by INGEST_BUFFER)
+            _row = message_to_db_row(message)
+            INGEST_BUFFER.add((_row["chat_id"], _row["message_id"]), _row)
+            if not message.sender_chat:
+                # Whoever writes in the chat is in it
+                remember_chat_membership(message.chat.id, message.from_user.id, ChatMemberStatus.MEMBER)
+                # Names/username as of this message for profile-change checks
+                PROFILE_SNAPSHOTS.observe(message.from_user)
+
+            # Exact repost of a text already banned as spam: act on first sight
+            _content_hash = _row["message_content_hash"]
+            if (
+                not message.sender_chat  # channels/anonymous admins are not "new users"
+                and _content_hash in KNOWN_SPAM_HASHES
+                and len(message.text or message.caption) >= KNOWN_SPAM_MIN_TEXT_LENGTH
+                and not await is_established_user(message.from_user.id)
+            ):
+                KNOWN_SPAM_HASHES.hit(_content_hash)
+                DB.submit_write(record_known_spam_hit, _content_hash)
+                LOGGER.info(
+                    "\033[91m%s:%s reposted known spam (fingerprint %s) in %s (%s), message %s\033[0m",
+                    message.from_user.id,
+                    format_username_for_log(message.from_user.username),
+                    _content_hash[:12],
+                    message.chat.title,
+                    message.chat.id,
+                    message.message_id,
+                )
+                await submit_autoreport(message, "Known spam content repost")
+                try:
+                    await message.delete()
+                    await INGEST_BUFFER.barrier(
+                        chat_id=message.chat.id, message_id=message.message_id
+                    )
+                    await DB.execute(
+                        "UPDATE recent_messages SET deletion_reason = ? WHERE chat_id = ? AND message_id = ?",
+                        ("known_spam", message.chat.id, message.message_id),
+                    )
+                except TelegramBadRequest as e:
+                    LOGGER.error(
+                        "%s:%s failed to delete known spam message %s in %s: %s",
+                        message.from_user.id,
+                        format_username_for_log(message.from_user.username),
+                        message.message_id,
+                        message.chat.id,
+                        e,
+                    )
+                return
 
             # Skip duplicate processing for media groups (multi-photo messages) EARLY
             # This avoids redundant DB queries for join date, spam checks, etc.
@@ -8143,6 +8659,25 @@ if __name__ == "__main__":
                 )
                 return
 
+            # Entities, mentions, links, canonical text (NFKC, no zero-width chars,
+            # homoglyphs folded) and caps/emoji stats, parsed once and memoized
+            # for the detectors below
+            message_features = get_message_features(message)
+
+            # Index new (monitored) users' messages to catch near-duplicate waves across chats
+            spam_wave = None
+            if message.from_user.id in active_user_checks_dict:
+                spam_wave = SPAM_WAVE_DETECTOR.add(
+                    message_features.canonical_text,
+                    message.chat.id,
+                    message.message_id,
+                    message.from_user.id,
+                )
+                SPAM_WAVE_MESSAGES[(message.chat.id, message.message_id)] = message
+                if spam_wave is not None and spam_wave.new:
+                    await report_spam_wave(spam_wave)
+                    await act_on_spam_wave(spam_wave, message)
+
             # =====================================================
             # NEW SPAM DETECTION: Forwarded from channel + bot mention/link
             # If message is forwarded from a channel AND contains a bot mention or t.me/...bot link
@@ -8152,67 +8687,11 @@ if __name__ == "__main__":
                 _fwd_has_bot_mention = False
                 _fwd_bot_mention_name = None
                 
-                # Check for @botname mentions in entities
-                if message.entities and message.text:
-                    for entity in message.entities:
-                        entity_type = entity.get("type") if isinstance(entity, dict) else getattr(entity, "type", None)
-                        offset = entity.get("offset") if isinstance(entity, dict) else getattr(entity, "offset", 0)
-                        length = entity.get("length") if isinstance(entity, dict) else getattr(entity, "length", 0)
-                        
-                        if entity_type == "mention":
-                            mention = message.text[offset:offset + length].lower()
-                            if mention.endswith("bot"):
-                                _fwd_has_bot_mention = True
-                                _fwd_bot_mention_name = message.text[offset:offset + length]
-                                break
-                        
-                        elif entity_type == "url":
-                            # Check for t.me/...bot links
-                            url = message.text[offset:offset + length].lower()
-                            if ("t.me/" in url or "telegram.me/" in url) and url.rstrip("/").endswith("bot"):
-                                _fwd_has_bot_mention = True
-                                _fwd_bot_mention_name = message.text[offset:offset + length]
-                                break
-                        
-                        elif entity_type == "text_link":
-                            # Check hidden URLs that point to bots
-                            url = entity.get("url") if isinstance(entity, dict) else getattr(entity, "url", "")
-                            if url:
-                                url_lower = url.lower()
-                                if ("t.me/" in url_lower or "telegram.me/" in url_lower) and url_lower.rstrip("/").endswith("bot"):
-                                    _fwd_has_bot_mention = True
-                                    _fwd_bot_mention_name = url
-                                    break
-                
-                # Also check caption entities for media messages
-                if not _fwd_has_bot_mention and message.caption_entities and message.caption:
-                    for entity in message.caption_entities:
-                        entity_type = entity.get("type") if isinstance(entity, dict) else getattr(entity, "type", None)
-                        offset = entity.get("offset") if isinstance(entity, dict) else getattr(entity, "offset", 0)
-                        length = entity.get("length") if isinstance(entity, dict) else getattr(entity, "length", 0)
-                        
-                        if entity_type == "mention":
-                            mention = message.caption[offset:offset + length].lower()
-                            if mention.endswith("bot"):
-                                _fwd_has_bot_mention = True
-                                _fwd_bot_mention_name = message.caption[offset:offset + length]
-                                break
-                        
-                        elif entity_type == "url":
-                            url = message.caption[offset:offset + length].lower()
-                            if ("t.me/" in url or "telegram.me/" in url) and url.rstrip("/").endswith("bot"):
-                                _fwd_has_bot_mention = True
-                                _fwd_bot_mention_name = message.caption[offset:offset + length]
-                                break
-                        
-                        elif entity_type == "text_link":
-                            url = entity.get("url") if isinstance(entity, dict) else getattr(entity, "url", "")
-                            if url:
-                                url_lower = url.lower()
-                                if ("t.me/" in url_lower or "telegram.me/" in url_lower) and url_lower.rstrip("/").endswith("bot"):
-                                    _fwd_has_bot_mention = True
-                                    _fwd_bot_mention_name = url
-                                    break
+                # Check for @botname mentions and t.me/...bot links (visible or hidden in text_link)
+                _fwd_bot_refs = message_features.bot_mentions + message_features.bot_links
+                if _fwd_bot_refs:
+                    _fwd_has_bot_mention = True
+                    _fwd_bot_mention_name = _fwd_bot_refs[0]
                 
                 if _fwd_has_bot_mention:
                     LOGGER.info(
@@ -8266,11 +8745,11 @@ if __name__ == "__main__":
                     _fwd_chan_name = message.forward_from_chat.title or "!UNDEFINED!"
                     _fwd_chan_username = getattr(message.forward_from_chat, "username", None) or "!UNDEFINED!"
                     
-                    if not is_user_banned(CONN, _fwd_chan_id):
+                    if not await DB.read(is_user_banned, _fwd_chan_id):
                         await ban_rogue_chat_everywhere(_fwd_chan_id, CHANNEL_IDS)
                         # Add to banned users in DB
-                        add_banned_user(
-                            CONN,
+                        await DB.write(
+                            add_banned_user,
                             _fwd_chan_id,
                             _fwd_chan_username,
                             first_name=_fwd_chan_name,
@@ -8288,8 +8767,8 @@ if __name__ == "__main__":
                         increment_session_ban_count()
                     
                     # Add to DB
-                    add_banned_user(
-                        CONN,
+                    await DB.write(
+                        add_banned_user,
                         message.from_user.id,
                         _user_name,
                         first_name=message.from_user.first_name,
@@ -8430,10 +8909,10 @@ if __name__ == "__main__":
                     )
                     
                     # Also ban the source channel
-                    if not is_user_banned(CONN, _fwd_chan_id):
+                    if not await DB.read(is_user_banned, _fwd_chan_id):
                         await ban_rogue_chat_everywhere(_fwd_chan_id, CHANNEL_IDS)
-                        add_banned_user(
-                            CONN,
+                        await DB.write(
+                            add_banned_user,
                             _fwd_chan_id,
                             _fwd_chan_username,
                             first_name=_fwd_chan_name,
@@ -8451,8 +8930,8 @@ if __name__ == "__main__":
                         increment_session_ban_count()
                     
                     # Add to DB
-                    add_banned_user(
-                        CONN,
+                    await DB.write(
+                        add_banned_user,
                         message.from_user.id,
                         _user_name,
                         first_name=message.from_user.first_name,
@@ -8522,10 +9001,10 @@ if __name__ == "__main__":
                 return
 
             # search for the latest user join chat event date using user_id in the DB
-            user_join_chat_date_str = CURSOR.execute(
-                "SELECT received_date FROM recent_messages WHERE user_id = ? AND new_chat_member = 1 ORDER BY received_date DESC LIMIT 1",
+            user_join_chat_date_str = await DB.fetchone(
+                "SELECT received_date FROM recent_messages WHERE user_id = ? AND new_chat_member = 1 ORDER BY received_ts DESC LIMIT 1",
                 (message.from_user.id,),
-            ).fetchone()
+            )
             
             # Debug: log what we found for join date
             _debug_msg_link = construct_message_link([message.chat.id, message.message_id, message.chat.username])
@@ -8542,10 +9021,12 @@ if __name__ == "__main__":
             user_first_seen_unknown = False
             missed_join_notification_sent = False  # Track if we sent missed join notification
             if not user_join_chat_date_str:
-                user_first_message_date = CURSOR.execute(
-                    "SELECT received_date FROM recent_messages WHERE user_id = ? ORDER BY received_date ASC LIMIT 1",
+                # The first-message check compares against this very message
+                await INGEST_BUFFER.barrier(user_id=message.from_user.id)
+                user_first_message_date = await DB.fetchone(
+                    "SELECT received_date, received_ts FROM recent_messages WHERE user_id = ? ORDER BY received_ts ASC LIMIT 1",
                     (message.from_user.id,),
-                ).fetchone()
+                )
                 if user_first_message_date:
                     # Use first message date as proxy for join date
                     user_join_chat_date_str = user_first_message_date
@@ -8609,15 +9090,14 @@ if __name__ == "__main__":
                     if not should_notify_missed_join and not is_first_message_ever:
                         try:
                             # Mark the oldest message as new_chat_member = 1
-                            CURSOR.execute(
+                            await DB.execute(
                                 """
                                 UPDATE recent_messages 
                                 SET new_chat_member = 1 
-                                WHERE user_id = ? AND received_date = ?
+                                WHERE user_id = ? AND received_ts = ?
                                 """,
-                                (message.from_user.id, first_msg_date_str),
+                                (message.from_user.id, user_first_message_date[1]),
                             )
-                            CONN.commit()
                             LOGGER.info(
                                 "%s:%s Retroactively marked first message (%s) as join event - user seen earlier without join record",
                                 message.from_user.id,
@@ -8637,16 +9117,16 @@ if __name__ == "__main__":
                     _skip_missed_join_banner = False
                     if should_notify_missed_join:
                         # Count user's messages
-                        _user_msg_count = CURSOR.execute(
-                            "SELECT COUNT(*) FROM recent_messages WHERE user_id = ?",
+                        _user_msg_count = (await DB.fetchone(
+                            USER_MESSAGE_COUNT_QUERY,
                             (message.from_user.id,),
-                        ).fetchone()[0]
+                        ))[0]
                         
                         # Check if user has any legit marker (either in recent_messages or baselines)
-                        _is_user_legit = check_user_legit(CURSOR, message.from_user.id)
+                        _is_user_legit = await DB.read(lambda conn: check_user_legit(conn.cursor(), message.from_user.id))
                         if not _is_user_legit:
                             # Also check baseline for is_legit flag
-                            _user_baseline = get_user_baseline(CONN, message.from_user.id)
+                            _user_baseline = await DB.read(get_user_baseline, message.from_user.id)
                             if _user_baseline and _user_baseline.get("is_legit"):
                                 _is_user_legit = True
                         
@@ -8673,65 +9153,26 @@ if __name__ == "__main__":
                         # Only flag if the bot is NOT a member of the current chat
                         _has_bot_mention = False
                         _bot_mention_name = None
-                        if message.entities and message.text:
-                            for entity in message.entities:
-                                entity_type = entity.get("type") if isinstance(entity, dict) else getattr(entity, "type", None)
-                                offset = entity.get("offset") if isinstance(entity, dict) else getattr(entity, "offset", 0)
-                                length = entity.get("length") if isinstance(entity, dict) else getattr(entity, "length", 0)
-                                
-                                if entity_type == "mention":
-                                    # Direct @botname mention
-                                    mention = message.text[offset:offset + length].lower()
-                                    if mention.endswith("bot"):
-                                        # Check if this bot is NOT in the chat
-                                        if not await is_bot_in_chat(mention, message.chat.id):
-                                            _has_bot_mention = True
-                                            _bot_mention_name = message.text[offset:offset + length]
-                                            LOGGER.debug(
-                                                "%s:%s Bot mention %s detected (NOT in chat %s)",
-                                                message.from_user.id,
-                                                format_username_for_log(message.from_user.username),
-                                                _bot_mention_name,
-                                                message.chat.id,
-                                            )
-                                            break
-                                        else:
-                                            LOGGER.debug(
-                                                "%s:%s Bot mention %s IGNORED (bot IS member of chat %s)",
-                                                message.from_user.id,
-                                                format_username_for_log(message.from_user.username),
-                                                message.text[offset:offset + length],
-                                                message.chat.id,
-                                            )
-                                
-                                elif entity_type == "bot_command":
-                                    # Bot command like /start@botname
-                                    command = message.text[offset:offset + length]
-                                    if "@" in command:
-                                        # Extract bot username from command
-                                        bot_part = command.split("@", 1)[1].lower()
-                                        if bot_part.endswith("bot"):
-                                            # Check if this bot is NOT in the chat
-                                            if not await is_bot_in_chat(bot_part, message.chat.id):
-                                                _has_bot_mention = True
-                                                _bot_mention_name = f"@{command.split('@', 1)[1]}"
-                                                LOGGER.debug(
-                                                    "%s:%s Bot command %s detected (bot %s NOT in chat %s)",
-                                                    message.from_user.id,
-                                                    format_username_for_log(message.from_user.username),
-                                                    command,
-                                                    _bot_mention_name,
-                                                    message.chat.id,
-                                                )
-                                                break
-                                            else:
-                                                LOGGER.debug(
-                                                    "%s:%s Bot command %s IGNORED (bot IS member of chat %s)",
-                                                    message.from_user.id,
-                                                    format_username_for_log(message.from_user.username),
-                                                    command,
-                                                    message.chat.id,
-                                                )
+                        for _bot_ref in message_features.bot_mentions + message_features.bot_commands:
+                            # Direct @botname mention or /command@botname
+                            if not await is_bot_in_chat(_bot_ref.lower(), message.chat.id):
+                                _has_bot_mention = True
+                                _bot_mention_name = _bot_ref
+                                LOGGER.debug(
+                                    "%s:%s Bot mention %s detected (NOT in chat %s)",
+                                    message.from_user.id,
+                                    format_username_for_log(message.from_user.username),
+                                    _bot_mention_name,
+                                    message.chat.id,
+                                )
+                                break
+                            LOGGER.debug(
+                                "%s:%s Bot mention %s IGNORED (bot IS member of chat %s)",
+                                message.from_user.id,
+                                format_username_for_log(message.from_user.username),
+                                _bot_ref,
+                                message.chat.id,
+                            )
                         
                         # Check if established user
                         _is_established = (_user_msg_count >= ESTABLISHED_USER_MIN_MESSAGES and _first_msg_old_enough) or _is_user_legit
@@ -8752,18 +9193,17 @@ if __name__ == "__main__":
                             )
                             # Mark first message as join event (just like after notification)
                             try:
-                                CURSOR.execute(
+                                await DB.execute(
                                     """
                                     UPDATE recent_messages 
                                     SET new_chat_member = 1 
-                                    WHERE user_id = ? AND received_date = ?
+                                    WHERE user_id = ? AND received_ts = ?
                                     """,
                                     (
                                         message.from_user.id,
-                                        user_first_message_date[0],
+                                        user_first_message_date[1],
                                     ),
                                 )
-                                CONN.commit()
                                 LOGGER.debug(
                                     "%s:%s Marked first message as join event for established user",
                                     message.from_user.id,
@@ -8879,14 +9319,10 @@ if __name__ == "__main__":
                             
                             # Add to active checks (even though established) because bot mention is suspicious
                             if message.from_user.id not in active_user_checks_dict:
-                                try:
-                                    _photos = await BOT.get_user_profile_photos(message.from_user.id, limit=1)
-                                    _photo_count = getattr(_photos, "total_count", 0) if _photos else 0
-                                except TelegramBadRequest:
-                                    _photo_count = 0
+                                _photo_count = await get_profile_photo_count(message.from_user.id)
                                 
-                                save_user_baseline(
-                                    conn=CONN,
+                                await DB.write(
+                                    save_user_baseline,
                                     user_id=message.from_user.id,
                                     username=message.from_user.username,
                                     first_name=message.from_user.first_name or "",
@@ -8920,14 +9356,11 @@ if __name__ == "__main__":
                                 )
                             
                             # Start 24hr monitoring
-                            asyncio.create_task(
-                                perform_checks(
-                                    event_record=f"{datetime.now().strftime('%H:%M:%S.%f')[:-3]}: {message.from_user.id:<10} bot mention ({_bot_mention_name}) in {'@' + message.chat.username + ': ' if message.chat.username else ''}{message.chat.title:<30}",
-                                    user_id=message.from_user.id,
-                                    inout_logmessage=f"{message.from_user.id} established user mentioned bot {_bot_mention_name}, starting monitoring...",
-                                    user_name=message.from_user.username if message.from_user.username else "!UNDEFINED!",
-                                ),
-                                name=str(message.from_user.id),
+                            schedule_user_checks(
+                                event_record=f"{datetime.now().strftime('%H:%M:%S.%f')[:-3]}: {message.from_user.id:<10} bot mention ({_bot_mention_name}) in {'@' + message.chat.username + ': ' if message.chat.username else ''}{message.chat.title:<30}",
+                                user_id=message.from_user.id,
+                                inout_logmessage=f"{message.from_user.id} established user mentioned bot {_bot_mention_name}, starting monitoring...",
+                                user_name=message.from_user.username if message.from_user.username else "!UNDEFINED!",
                             )
                             LOGGER.debug(
                                 "\033[93m%s:%s Started 24hr monitoring (established user bot mention)\033[0m",
@@ -8961,15 +9394,11 @@ if __name__ == "__main__":
                         # Add missed join user to active checks first (simulating join event)
                         if message.from_user.id not in active_user_checks_dict:
                             # Get photo count for baseline
-                            try:
-                                _photos = await BOT.get_user_profile_photos(message.from_user.id, limit=1)
-                                _photo_count = getattr(_photos, "total_count", 0) if _photos else 0
-                            except TelegramBadRequest:
-                                _photo_count = 0
+                            _photo_count = await get_profile_photo_count(message.from_user.id)
                             
                             # Save baseline to database
-                            save_user_baseline(
-                                conn=CONN,
+                            await DB.write(
+                                save_user_baseline,
                                 user_id=message.from_user.id,
                                 username=message.from_user.username,
                                 first_name=message.from_user.first_name or "",
@@ -9004,14 +9433,11 @@ if __name__ == "__main__":
                             )
                             
                             # Start monitoring for this user
-                            asyncio.create_task(
-                                perform_checks(
-                                    event_record=f"{datetime.now().strftime('%H:%M:%S.%f')[:-3]}: {message.from_user.id:<10} missed join in {'@' + message.chat.username + ': ' if message.chat.username else ''}{message.chat.title:<30}",
-                                    user_id=message.from_user.id,
-                                    inout_logmessage=f"{message.from_user.id} missed join detected, starting monitoring...",
-                                    user_name=message.from_user.username if message.from_user.username else "!UNDEFINED!",
-                                ),
-                                name=str(message.from_user.id),
+                            schedule_user_checks(
+                                event_record=f"{datetime.now().strftime('%H:%M:%S.%f')[:-3]}: {message.from_user.id:<10} missed join in {'@' + message.chat.username + ': ' if message.chat.username else ''}{message.chat.title:<30}",
+                                user_id=message.from_user.id,
+                                inout_logmessage=f"{message.from_user.id} missed join detected, starting monitoring...",
+                                user_name=message.from_user.username if message.from_user.username else "!UNDEFINED!",
                             )
                         
                         # If missed join user mentions a bot - this is spam! Delete, ban, and send to autoreport
@@ -9068,10 +9494,9 @@ if __name__ == "__main__":
                                 banned_user_ids.add(message.from_user.id)
                                 increment_session_ban_count()
                             
-                            # Cancel watchdog task if running
-                            for task in asyncio.all_tasks():
-                                if task.get_name() == str(message.from_user.id):
-                                    task.cancel()
+                            # Stop monitoring: drop the scheduled checks and the active entry
+                            MONITORING_SCHEDULER.cancel(message.from_user.id)
+                            active_user_checks_dict.pop(message.from_user.id, None)
                             
                             # Send notification to ADMIN_AUTOBAN with ban confirmation
                             _chat_link_html = build_chat_link(message.chat.id, message.chat.username, message.chat.title)
@@ -9228,18 +9653,17 @@ if __name__ == "__main__":
                         if missed_join_notification_sent:
                             try:
                                 # Update the first message record to mark it as a join event
-                                CURSOR.execute(
+                                await DB.execute(
                                     """
                                     UPDATE recent_messages 
                                     SET new_chat_member = 1 
-                                    WHERE user_id = ? AND received_date = ?
+                                    WHERE user_id = ? AND received_ts = ?
                                     """,
                                     (
                                         message.from_user.id,
-                                        user_first_message_date[0],  # Use original first seen date
+                                        user_first_message_date[1],  # Use original first seen date
                                     ),
                                 )
-                                CONN.commit()
                                 LOGGER.info(
                                     "%s:%s Marked first message as join event (date: %s) to prevent duplicate notifications",
                                     message.from_user.id,
@@ -9307,11 +9731,12 @@ if __name__ == "__main__":
                     
                     # Save synthetic join event to DB so future messages know when we first saw them
                     try:
-                        CURSOR.execute(
+                        _received_at = datetime.now(timezone.utc)
+                        await DB.execute(
                             """
                             INSERT INTO recent_messages
-                            (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, received_date, new_chat_member, left_chat_member)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, received_date, new_chat_member, left_chat_member, received_ts)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                             """,
                             (
                                 message.chat.id,
@@ -9320,12 +9745,12 @@ if __name__ == "__main__":
                                 message.from_user.username if message.from_user.username else None,
                                 message.from_user.first_name if message.from_user.first_name else None,
                                 message.from_user.last_name if message.from_user.last_name else None,
-                                datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00"),
+                                _received_at.strftime("%Y-%m-%d %H:%M:%S+00:00"),
                                 1,  # new_chat_member = 1 (synthetic join)
                                 None,  # left_chat_member = NULL
+                                int(_received_at.timestamp()),
                             ),
                         )
-                        CONN.commit()
                         LOGGER.info(
                             "Saved synthetic join event for user %s:%s (first message seen)",
                             message.from_user.id,
@@ -9443,7 +9868,7 @@ if __name__ == "__main__":
             # check if user flagged legit by setting
             # new_chat_member and left_chat_member in the DB to 1
             # to indicate that checks were cancelled
-            user_flagged_legit = check_user_legit(CURSOR, message.from_user.id)
+            user_flagged_legit = await DB.read(lambda conn: check_user_legit(conn.cursor(), message.from_user.id))
 
             # check if the message is a spam by checking the entities
             entity_spam_trigger = has_spam_entities(SPAM_TRIGGERS, message)
@@ -9485,7 +9910,7 @@ if __name__ == "__main__":
                 and message.forward_from.id != message.from_user.id
             ):
                 # Check if user is established - if so, just report to SUSPICIOUS, don't ban/delete
-                if is_established_user(message.from_user.id):
+                if await is_established_user(message.from_user.id):
                     # Established user forwarding from unknown source - report to SUSPICIOUS only
                     LOGGER.info(
                         "\033[92m%s:%s ESTABLISHED user forwarded from unknown source in %s - sending to SUSPICIOUS (NOT deleting, NOT banning)\033[0m",
@@ -9710,6 +10135,20 @@ if __name__ == "__main__":
                         autoreport_sent = True
                         await submit_autoreport(message, the_reason)
                         return  # stop further actions for this message since user was banned before
+            elif spam_wave is not None:
+                the_reason = spam_wave_reason(spam_wave, message.from_user.id)
+                if await check_n_ban(message, the_reason):
+                    return
+                else:
+                    LOGGER.info(
+                        "\033[93m%s possibly sent a spam wave message in chat %s\033[0m",
+                        message.from_user.id,
+                        message.chat.title,
+                    )
+                    if not autoreport_sent:
+                        autoreport_sent = True
+                        await submit_autoreport(message, the_reason)
+                        return
             elif check_message_for_capital_letters(
                 message
             ) and check_message_for_emojis(message):
@@ -9796,7 +10235,7 @@ if __name__ == "__main__":
                     message_key = f"{message.chat.id}_{message.message_id}"
                     active_user_checks_dict[message.from_user.id][message_key] = message_link
 
-                    # start the perform_checks coroutine
+                    # schedule the perform_checks ladder
                     # Note: need to delete the message if user is spammer
                     message_to_delete = message.chat.id, message.message_id
                     # Note: -100 prefix is required for supergroup API calls
@@ -9806,19 +10245,16 @@ if __name__ == "__main__":
                         format_username_for_log(message.from_user.username),
                         message_to_delete,
                     )
-                    asyncio.create_task(
-                        perform_checks(
-                            message_to_delete=message_to_delete,
-                            event_record=f"{datetime.now().strftime('%H:%M:%S.%f')[:-3]}: {message.from_user.id:<10} night message in {'@' + message.chat.username + ': ' if message.chat.username else ''}{message.chat.title:<30}",
-                            user_id=message.from_user.id,
-                            inout_logmessage=f"{message.from_user.id} message sent during the night, in {message.chat.title}, checking user activity...",
-                            user_name=(
-                                message.from_user.username
-                                if message.from_user.username
-                                else "!UNDEFINED!"
-                            ),
+                    schedule_user_checks(
+                        message_to_delete=message_to_delete,
+                        event_record=f"{datetime.now().strftime('%H:%M:%S.%f')[:-3]}: {message.from_user.id:<10} night message in {'@' + message.chat.username + ': ' if message.chat.username else ''}{message.chat.title:<30}",
+                        user_id=message.from_user.id,
+                        inout_logmessage=f"{message.from_user.id} message sent during the night, in {message.chat.title}, checking user activity...",
+                        user_name=(
+                            message.from_user.username
+                            if message.from_user.username
+                            else "!UNDEFINED!"
                         ),
-                        name=str(message.from_user.id),
                     )
                 # if not autoreport_sent:
                 #         autoreport_sent = True
@@ -9835,64 +10271,19 @@ if __name__ == "__main__":
             # This must run BEFORE "SUSPICIOUS MESSAGE CHECKING" to prioritize AUTOREPORT
             if not autoreport_sent and message.from_user.id in active_user_checks_dict:
                 _bot_mentions = []
-                # Check message text for bot mentions (@botname) and bot commands (/cmd@botname)
+                # Check bot mentions (@botname) and bot commands (/cmd@botname) in text or caption
                 # Only flag bots that are NOT members of the current chat
-                if message.entities and message.text:
-                    for entity in message.entities:
-                        entity_type = entity.type if hasattr(entity, 'type') else entity.get("type")
-                        offset = entity.offset if hasattr(entity, 'offset') else entity.get("offset", 0)
-                        length = entity.length if hasattr(entity, 'length') else entity.get("length", 0)
-                        
-                        if entity_type == "mention":
-                            mention = message.text[offset:offset + length].lower()
-                            if mention.endswith("bot"):
-                                # Check if bot is NOT in chat
-                                if not await is_bot_in_chat(mention, message.chat.id):
-                                    _bot_mentions.append(mention)
-                                else:
-                                    LOGGER.debug(
-                                        "%s:%s Bot mention %s IGNORED (bot IS member of chat)",
-                                        message.from_user.id,
-                                        format_username_for_log(message.from_user.username),
-                                        mention,
-                                    )
-                        elif entity_type == "bot_command":
-                            command = message.text[offset:offset + length]
-                            if "@" in command:
-                                bot_part = command.split("@", 1)[1].lower()
-                                if bot_part.endswith("bot"):
-                                    # Check if bot is NOT in chat
-                                    if not await is_bot_in_chat(bot_part, message.chat.id):
-                                        _bot_mentions.append(f"@{bot_part}")
-                                    else:
-                                        LOGGER.debug(
-                                            "%s:%s Bot command %s IGNORED (bot IS member of chat)",
-                                            message.from_user.id,
-                                            format_username_for_log(message.from_user.username),
-                                            command,
-                                        )
-                
-                # Check caption for bot mentions (same logic)
-                if message.caption_entities and message.caption:
-                    for entity in message.caption_entities:
-                        entity_type = entity.type if hasattr(entity, 'type') else entity.get("type")
-                        offset = entity.offset if hasattr(entity, 'offset') else entity.get("offset", 0)
-                        length = entity.length if hasattr(entity, 'length') else entity.get("length", 0)
-                        
-                        if entity_type == "mention":
-                            mention = message.caption[offset:offset + length].lower()
-                            if mention.endswith("bot"):
-                                # Check if bot is NOT in chat
-                                if not await is_bot_in_chat(mention, message.chat.id):
-                                    _bot_mentions.append(mention)
-                        elif entity_type == "bot_command":
-                            command = message.caption[offset:offset + length]
-                            if "@" in command:
-                                bot_part = command.split("@", 1)[1].lower()
-                                if bot_part.endswith("bot"):
-                                    # Check if bot is NOT in chat
-                                    if not await is_bot_in_chat(bot_part, message.chat.id):
-                                        _bot_mentions.append(f"@{bot_part}")
+                for _bot_ref in message_features.bot_mentions + message_features.bot_commands:
+                    _bot_ref = _bot_ref.lower()
+                    if not await is_bot_in_chat(_bot_ref, message.chat.id):
+                        _bot_mentions.append(_bot_ref)
+                    else:
+                        LOGGER.debug(
+                            "%s:%s Bot mention %s IGNORED (bot IS member of chat)",
+                            message.from_user.id,
+                            format_username_for_log(message.from_user.username),
+                            _bot_ref,
+                        )
                 
                 if _bot_mentions:
                     bot_mentions_str = ", ".join(_bot_mentions)
@@ -9908,17 +10299,18 @@ if __name__ == "__main__":
                     try:
                         await message.delete()
                         # Store deletion reason in database (use UTC for consistency)
-                        received_date = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00")
+                        _received_at = datetime.now(timezone.utc)
+                        received_date = _received_at.strftime("%Y-%m-%d %H:%M:%S+00:00")
                         if message.chat.id < 0:
                             report_id = int(str(message.chat.id)[4:] + str(message.message_id))
                         else:
                             report_id = int(str(message.chat.id) + str(message.message_id))
-                        CURSOR.execute(
+                        await DB.execute(
                             """
                             INSERT OR REPLACE INTO recent_messages 
                             (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, 
-                             received_date, from_chat_title, deletion_reason)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                             received_date, from_chat_title, deletion_reason, received_ts)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                             """,
                             (
                                 message.chat.id,
@@ -9930,9 +10322,9 @@ if __name__ == "__main__":
                                 received_date,
                                 message.chat.title,
                                 f"bot_mention: {bot_mentions_str}",
+                                int(_received_at.timestamp()),
                             ),
                         )
-                        CONN.commit()
                         LOGGER.info(
                             "\033[93m%s:%s Deleted message %s - mentioned external bots: %s\033[0m",
                             message.from_user.id,
@@ -10062,6 +10454,8 @@ if __name__ == "__main__":
                         # Build clickable chat link (public @username or internal /c/ link) with safe fallback
                         _chat_title_safe = html.escape(message.chat.title)
                         _chat_link_html = build_chat_link(message.chat.id, message.chat.username, message.chat.title)
+                        lols_link = f"https://t.me/oLolsBot?start={message.from_user.id}"
+                        inline_kb = create_inline_keyboard(message_link, lols_link, message)
 
                         await safe_send_message(
                             BOT,
@@ -10096,18 +10490,6 @@ if __name__ == "__main__":
                 has_suspicious_content = True
                 suspicious_items["high_user_id"] = True
 
-            # Helper function to extract text from entity
-            def extract_entity_text(text, entity):
-                """Extract text from message entity."""
-                offset = entity.get("offset", 0) if isinstance(entity, dict) else getattr(entity, "offset", 0)
-                length = entity.get("length", 0) if isinstance(entity, dict) else getattr(entity, "length", 0)
-                if text and offset is not None and length:
-                    # Handle UTF-16 encoding (Telegram uses UTF-16 for offsets)
-                    return text.encode("utf-16-le")[
-                        offset * 2 : (offset + length) * 2
-                    ].decode("utf-16-le")
-                return None
-
             # Helper function to show invisible characters as unicode codepoints
             def make_visible(text, max_len=100):
                 """Make invisible/special characters visible as unicode codepoints."""
@@ -10142,136 +10524,43 @@ if __name__ == "__main__":
                         result.append(char)
                 return "".join(result)
 
-            # Check message entities for links, mentions, phone numbers
-            if message.entities and message.text:
-                for entity in message.entities:
-                    entity_type = entity.get("type") if isinstance(entity, dict) else getattr(entity, "type", None)
-                    if entity_type in ["url", "text_link"]:
-                        has_suspicious_content = True
-                        # Extract URL from text_link or visible url
-                        if entity_type == "text_link":
-                            url = entity.get("url", "") if isinstance(entity, dict) else getattr(entity, "url", "")
-                            visible_text = extract_entity_text(message.text, entity)
-                            visible_clean = make_visible(visible_text, max_len=50)
-                            suspicious_items["links"].append(
-                                f"{url} (hidden as: {visible_clean})"
-                            )
-                        else:
-                            url = extract_entity_text(message.text, entity)
-                            if url:
-                                suspicious_items["links"].append(url)
-                    elif entity_type == "mention":
-                        has_suspicious_content = True
-                        mention = extract_entity_text(message.text, entity)
-                        if mention:
-                            suspicious_items["mentions"].append(mention)
-                            # Check if this is a bot mention (ends with "bot", case insensitive)
-                            if mention.lower().endswith("bot"):
-                                suspicious_items["bot_mentions"].append(mention)
-                    elif entity_type == "text_mention":
-                        # Direct mention of user by ID (users without username)
-                        has_suspicious_content = True
-                        user = entity.get("user") if isinstance(entity, dict) else getattr(entity, "user", None)
-                        if user:
-                            user_id = user.get("id") if isinstance(user, dict) else getattr(user, "id", None)
-                            user_name = user.get("username") if isinstance(user, dict) else getattr(user, "username", None)
-                            first_name = user.get("first_name", "") if isinstance(user, dict) else getattr(user, "first_name", "")
-                            if user_name:
-                                suspicious_items["mentions"].append(f"@{user_name}")
-                            else:
-                                # User has no username, show ID and first name
-                                suspicious_items["mentions"].append(
-                                    f"ID:{user_id} ({first_name})"
-                                )
-                    elif entity_type == "phone_number":
-                        has_suspicious_content = True
-                        phone = extract_entity_text(message.text, entity)
-                        if phone:
-                            suspicious_items["phones"].append(phone)
-                    elif entity_type == "hashtag":
-                        has_suspicious_content = True
-                        hashtag = extract_entity_text(message.text, entity)
-                        if hashtag:
-                            suspicious_items["hashtags"].append(hashtag)
-                    elif entity_type == "cashtag":
-                        has_suspicious_content = True
-                        cashtag = extract_entity_text(message.text, entity)
-                        if cashtag:
-                            suspicious_items["cashtags"].append(cashtag)
-                    elif entity_type == "bot_command":
-                        has_suspicious_content = True
-                        bot_cmd = extract_entity_text(message.text, entity)
-                        if bot_cmd:
-                            suspicious_items["bot_commands"].append(bot_cmd)
-                    elif entity_type == "email":
-                        has_suspicious_content = True
-                        email = extract_entity_text(message.text, entity)
-                        if email:
-                            suspicious_items["emails"].append(email)
-
-            # Check caption entities for media messages
-            if message.caption_entities and message.caption:
-                for entity in message.caption_entities:
-                    entity_type = entity.get("type") if isinstance(entity, dict) else getattr(entity, "type", None)
-                    if entity_type in ["url", "text_link"]:
-                        has_suspicious_content = True
-                        # Extract URL from text_link or visible url
-                        if entity_type == "text_link":
-                            url = entity.get("url", "") if isinstance(entity, dict) else getattr(entity, "url", "")
-                            visible_text = extract_entity_text(message.caption, entity)
-                            visible_clean = make_visible(visible_text, max_len=50)
-                            suspicious_items["links"].append(
-                                f"{url} (hidden as: {visible_clean})"
-                            )
-                        else:
-                            url = extract_entity_text(message.caption, entity)
-                            if url:
-                                suspicious_items["links"].append(url)
-                    elif entity_type == "mention":
-                        has_suspicious_content = True
-                        mention = extract_entity_text(message.caption, entity)
-                        if mention:
-                            suspicious_items["mentions"].append(mention)
-                    elif entity_type == "text_mention":
-                        # Direct mention of user by ID (users without username)
-                        has_suspicious_content = True
-                        user = entity.get("user") if isinstance(entity, dict) else getattr(entity, "user", None)
-                        if user:
-                            user_id = user.get("id") if isinstance(user, dict) else getattr(user, "id", None)
-                            user_name = user.get("username") if isinstance(user, dict) else getattr(user, "username", None)
-                            first_name = user.get("first_name", "") if isinstance(user, dict) else getattr(user, "first_name", "")
-                            if user_name:
-                                suspicious_items["mentions"].append(f"@{user_name}")
-                            else:
-                                # User has no username, show ID and first name
-                                suspicious_items["mentions"].append(
-                                    f"ID:{user_id} ({first_name})"
-                                )
-                    elif entity_type == "phone_number":
-                        has_suspicious_content = True
-                        phone = extract_entity_text(message.caption, entity)
-                        if phone:
-                            suspicious_items["phones"].append(phone)
-                    elif entity_type == "hashtag":
-                        has_suspicious_content = True
-                        hashtag = extract_entity_text(message.caption, entity)
-                        if hashtag:
-                            suspicious_items["hashtags"].append(hashtag)
-                    elif entity_type == "cashtag":
-                        has_suspicious_content = True
-                        cashtag = extract_entity_text(message.caption, entity)
-                        if cashtag:
-                            suspicious_items["cashtags"].append(cashtag)
-                    elif entity_type == "bot_command":
-                        has_suspicious_content = True
-                        bot_cmd = extract_entity_text(message.caption, entity)
-                        if bot_cmd:
-                            suspicious_items["bot_commands"].append(bot_cmd)
-                    elif entity_type == "email":
-                        has_suspicious_content = True
-                        email = extract_entity_text(message.caption, entity)
-                        if email:
-                            suspicious_items["emails"].append(email)
+            # Check message (or caption) entities for links, mentions, phone numbers
+            _entity_buckets = {
+                "url": "links",
+                "phone_number": "phones",
+                "hashtag": "hashtags",
+                "cashtag": "cashtags",
+                "bot_command": "bot_commands",
+                "email": "emails",
+            }
+            for entity in message_features.entities:
+                if entity.type == "text_link":
+                    has_suspicious_content = True
+                    visible_clean = make_visible(entity.text, max_len=50)
+                    suspicious_items["links"].append(
+                        f"{entity.url} (hidden as: {visible_clean})"
+                    )
+                elif entity.type == "mention":
+                    has_suspicious_content = True
+                    if entity.text:
+                        suspicious_items["mentions"].append(entity.text)
+                        # Check if this is a bot mention (ends with "bot", case insensitive)
+                        if entity.text.lower().endswith("bot"):
+                            suspicious_items["bot_mentions"].append(entity.text)
+                elif entity.type == "text_mention":
+                    # Direct mention of user by ID (users without username)
+                    has_suspicious_content = True
+                    if entity.user_name:
+                        suspicious_items["mentions"].append(f"@{entity.user_name}")
+                    elif entity.user_id:
+                        # User has no username, show ID and first name
+                        suspicious_items["mentions"].append(
+                            f"ID:{entity.user_id} ({entity.user_first_name})"
+                        )
+                elif entity.type in _entity_buckets:
+                    has_suspicious_content = True
+                    if entity.text:
+                        suspicious_items[_entity_buckets[entity.type]].append(entity.text)
 
             # Additional regex-based phone number detection for local numbers
             # Detect local numbers: +XXX, 00XXX country codes followed by digits
@@ -10576,15 +10865,11 @@ if __name__ == "__main__":
                         )
                         
                         # Get profile photo count for baseline
-                        try:
-                            _photos = await BOT.get_user_profile_photos(_user_id, limit=1)
-                            _photo_count = _photos.total_count if _photos else 0
-                        except TelegramBadRequest:
-                            _photo_count = 0
+                        _photo_count = await get_profile_photo_count(_user_id)
                         
                         # Save baseline to database
-                        save_user_baseline(
-                            conn=CONN,
+                        await DB.write(
+                            save_user_baseline,
                             user_id=_user_id,
                             username=_username,
                             first_name=message.from_user.first_name or "",
@@ -10613,14 +10898,11 @@ if __name__ == "__main__":
                         }
                         
                         # Start regular watchdog (24h monitoring)
-                        asyncio.create_task(
-                            perform_checks(
-                                event_record=f"SUSPICIOUS:{_user_id}:{_username}",
-                                user_id=_user_id,
-                                inout_logmessage=f"Suspicious content triggered monitoring for {_user_id}:@{_username or '!UNDEFINED!'}",
-                                user_name=_username or "!UNDEFINED!",
-                            ),
-                            name=str(_user_id),
+                        schedule_user_checks(
+                            event_record=f"SUSPICIOUS:{_user_id}:{_username}",
+                            user_id=_user_id,
+                            inout_logmessage=f"Suspicious content triggered monitoring for {_user_id}:@{_username or '!UNDEFINED!'}",
+                            user_name=_username or "!UNDEFINED!",
                         )
                         
                         # Start intensive watchdog (first few hours)
@@ -10709,7 +10991,7 @@ if __name__ == "__main__":
             return
         
         # Skip if user is flagged as legit
-        if check_user_legit(CURSOR, message.from_user.id):
+        if await DB.read(lambda conn: check_user_legit(conn.cursor(), message.from_user.id)):
             return
         
         user_id = message.from_user.id
@@ -10720,29 +11002,12 @@ if __name__ == "__main__":
         entity_spam_trigger = has_spam_entities(SPAM_TRIGGERS, message)
         
         # Check for bot mentions and other suspicious content
-        bot_mentions = []
-        suspicious_links = []
-        user_mentions = []
-        
-        if message.entities and message.text:
-            for entity in message.entities:
-                entity_type = entity.get("type") if isinstance(entity, dict) else getattr(entity, "type", None)
-                offset = entity.get("offset") if isinstance(entity, dict) else getattr(entity, "offset", 0)
-                length = entity.get("length") if isinstance(entity, dict) else getattr(entity, "length", 0)
-                
-                if entity_type == "mention" and message.text:
-                    mention = message.text[offset:offset + length].lower()
-                    if mention.endswith("bot"):
-                        bot_mentions.append(mention)
-                    else:
-                        user_mentions.append(mention)
-                elif entity_type in ["url", "text_link"]:
-                    if entity_type == "text_link":
-                        url = entity.get("url", "") if isinstance(entity, dict) else getattr(entity, "url", "")
-                    else:
-                        url = message.text[offset:offset + length] if message.text else ""
-                    if url:
-                        suspicious_links.append(url)
+        features = get_message_features(message)
+        bot_mentions = [mention.lower() for mention in features.bot_mentions]
+        user_mentions = [
+            mention.lower() for mention in features.mentions if mention not in features.bot_mentions
+        ]
+        suspicious_links = [url for url in features.urls if url]
         
         has_bot_mentions = bool(bot_mentions)
         has_suspicious_content = has_bot_mentions or suspicious_links or entity_spam_trigger
@@ -10898,11 +11163,11 @@ if __name__ == "__main__":
             report_msg_id = int(command_args[1])
             LOGGER.debug("Report message ID parsed: %d", report_msg_id)
 
-            CURSOR.execute(
-                "SELECT chat_id, message_id, forwarded_message_data, received_date FROM recent_messages WHERE message_id = ?",
+            await INGEST_BUFFER.barrier(message_id=report_msg_id)
+            result = await DB.fetchone(
+                REPORTED_MESSAGE_QUERY,
                 (report_msg_id,),
             )
-            result = CURSOR.fetchone()
             LOGGER.debug(
                 "Database query result for forwarded_message_data %d: %s",
                 report_msg_id,
@@ -10978,14 +11243,14 @@ if __name__ == "__main__":
                         format_username_for_log(forwarded_message_data[4] if forwarded_message_data[4] not in [0, "0", None] else None),
                         active_user_checks_dict,
                     )
-                # stop the perform_checks coroutine if it is running for author_id
-                for task in asyncio.all_tasks():
-                    if task.get_name() == str(author_id):
-                        task.cancel()
+                # stop monitoring author_id: drop the scheduled checks and the active entry
+                MONITORING_SCHEDULER.cancel(author_id)
+                active_user_checks_dict.pop(author_id, None)
 
             # add to the banned users set
             banned_user_ids.add(int(author_id))
             increment_session_ban_count()
+            await remember_reported_spam(report_msg_id, "admin_ban")
 
             # Attempting to ban user from channels
             for chat_id in CHANNEL_IDS:
@@ -11040,7 +11305,8 @@ if __name__ == "__main__":
                 AND chat_username IS NOT NULL
                 """
             params = {"author_id": author_id}
-            result = CURSOR.execute(query, params).fetchall()
+            await INGEST_BUFFER.barrier(user_id=author_id)
+            result = await DB.fetchall(query, params)
             # delete them one by one
             user_name = None  # Initialize before loop in case result is empty
             for chat_id, message_id, user_name in result:
@@ -11175,15 +11441,12 @@ if __name__ == "__main__":
             else:
                 active_user_checks_dict[user_id] = "!UNDEFINED!"
 
-            # start the perform_checks coroutine
-            asyncio.create_task(
-                perform_checks(
-                    event_record=f"{datetime.now().strftime('%H:%M:%S.%f')[:-3]}: {user_id:<10} 👀 manual check requested by admin {message.from_user.id}",
-                    user_id=user_id,
-                    inout_logmessage=f"{user_id} manual check requested, checking user activity requested by admin {message.from_user.id}...",
-                    user_name=active_user_checks_dict[user_id],
-                ),
-                name=str(user_id),
+            # schedule the perform_checks ladder
+            schedule_user_checks(
+                event_record=f"{datetime.now().strftime('%H:%M:%S.%f')[:-3]}: {user_id:<10} 👀 manual check requested by admin {message.from_user.id}",
+                user_id=user_id,
+                inout_logmessage=f"{user_id} manual check requested, checking user activity requested by admin {message.from_user.id}...",
+                user_name=active_user_checks_dict[user_id],
             )
 
             await message.reply(
@@ -11284,7 +11547,8 @@ if __name__ == "__main__":
                 )
         
         # Perform the lookup
-        whois_data = get_user_whois(CONN, user_id=user_id, username=username)
+        await INGEST_BUFFER.flush()
+        whois_data = await DB.read(get_user_whois, user_id=user_id, username=username)
         if whois_data is None:
             LOGGER.error("get_user_whois returned None for user_id=%s, username=%s", user_id, username)
             whois_data = {"found": False, "user_id": user_id, "username": username}
@@ -11396,17 +11660,17 @@ if __name__ == "__main__":
             user_details_reply_str = "⚠️ Author unknown - this may be a service message (join/leave), a message not tracked by the bot, or not found in DB"
 
             try:
-                CURSOR.execute(
+                await INGEST_BUFFER.barrier(chat_username=chat_username, message_id=message_id)
+                result = await DB.fetchone(
                     """
                     SELECT user_id, user_name, user_first_name, user_last_name
                     FROM recent_messages
                     WHERE chat_username = ? AND message_id = ?
-                    ORDER BY received_date DESC
+                    ORDER BY received_ts DESC
                     LIMIT 1
                     """,
                     (chat_username, message_id),
                 )
-                result = CURSOR.fetchone()
 
                 if result:
                     (
@@ -11717,7 +11981,7 @@ if __name__ == "__main__":
                     status_lines.append(f"• Runtime dict: {'🚫 Banned' if in_banned_dict else '✅ Not banned'}")
                     
                     # 2. Check local database
-                    db_banned = is_user_banned(CONN, rogue_chan_id)
+                    db_banned = await DB.read(is_user_banned, rogue_chan_id)
                     status_lines.append(f"• Local DB: {'🚫 Banned' if db_banned else '✅ Not banned'}")
                     
                     # 3. Check LOLS/CAS/P2P
@@ -11732,6 +11996,7 @@ if __name__ == "__main__":
                     # 4. Try to remove from P2P
                     try:
                         p2p_removed = await remove_spam_from_2p2p(rogue_chan_id, LOGGER, rogue_chan_username)
+                        SPAM_VERDICT_CACHE.invalidate(rogue_chan_id)
                         if p2p_removed:
                             status_lines.append("• P2P removal: ✅ Removed from P2P spam list")
                         else:
@@ -12965,9 +13230,6 @@ if __name__ == "__main__":
                     fail_count += 1
                     failed_chats.append(f"{chat_id}: {str(e)[:30]}")
                     LOGGER.error("Broadcast failed to %s: %s", chat_id, e)
-                
-                # Small delay to avoid flood limits
-                await asyncio.sleep(0.1)
 
             # Update status message
             result_text = (
@@ -13136,9 +13398,6 @@ if __name__ == "__main__":
                     fail_count += 1
                     failed_chats.append(f"{chat_id}: {str(e)[:30]}")
                     LOGGER.error("Broadcast failed to %s: %s", chat_id, e)
-                
-                # Small delay to avoid flood limits
-                await asyncio.sleep(0.1)
 
             # Update with results
             result_text = (
@@ -13183,7 +13442,7 @@ if __name__ == "__main__":
             LOGGER.debug("%d - User ID to unban", user_id)
 
             # Get username from active checks or DB
-            user_name_data = active_user_checks_dict.get(user_id) or get_user_baseline(CONN, user_id)
+            user_name_data = active_user_checks_dict.get(user_id) or await DB.read(get_user_baseline, user_id)
             user_name = "!UNDEFINED!"
             if isinstance(user_name_data, dict):
                 user_name = str(user_name_data.get("username", "!UNDEFINED!")).lstrip("@")
@@ -13201,20 +13460,21 @@ if __name__ == "__main__":
             if user_id in active_user_checks_dict:
                 del active_user_checks_dict[user_id]
             banned_user_ids.discard(user_id)
-            db_unban_user(CONN, user_id)
+            await DB.write(db_unban_user, user_id)
 
             # Mark monitoring as ended and user as legit in baselines DB
-            update_user_baseline_status(CONN, user_id, monitoring_active=False, is_legit=True)
+            await DB.write(update_user_baseline_status, user_id, monitoring_active=False, is_legit=True)
 
             # Mark user as legit in database
             admin_id = message.from_user.id
             admin_username = message.from_user.username
             try:
-                CURSOR.execute(
+                _received_at = datetime.now(timezone.utc)
+                await DB.execute(
                     """
                     INSERT OR REPLACE INTO recent_messages
-                    (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, received_date, new_chat_member, left_chat_member)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, received_date, new_chat_member, left_chat_member, received_ts)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
                         ADMIN_GROUP_ID,
@@ -13223,12 +13483,12 @@ if __name__ == "__main__":
                         user_name if user_name != "!UNDEFINED!" else None,
                         None,
                         None,
-                        datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00"),
+                        _received_at.strftime("%Y-%m-%d %H:%M:%S+00:00"),
                         1,
                         1,
+                        int(_received_at.timestamp()),
                     ),
                 )
-                CONN.commit()
                 LOGGER.info(
                     "\033[92m%s:%s marked as legitimate in database by admin %s:%s\033[0m",
                     user_id,
@@ -13244,6 +13504,7 @@ if __name__ == "__main__":
             # Remove from P2P network spam list
             try:
                 p2p_removed = await remove_spam_from_2p2p(user_id, LOGGER, user_name)
+                SPAM_VERDICT_CACHE.invalidate(user_id)
                 if p2p_removed:
                     LOGGER.info("\033[92m%s:%s removed from P2P spam list\033[0m", user_id, format_username_for_log(user_name))
                 else:
@@ -13423,11 +13684,12 @@ if __name__ == "__main__":
         clear_user_suspicious_tracking(user_id_legit)
 
         try:
-            CURSOR.execute(
+            _received_at = datetime.now(timezone.utc)
+            await DB.execute(
                 """
                 INSERT OR REPLACE INTO recent_messages
-                (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, received_date, new_chat_member, left_chat_member)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                (chat_id, message_id, user_id, user_name, user_first_name, user_last_name, received_date, new_chat_member, left_chat_member, received_ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     orig_chat_id,
@@ -13436,12 +13698,12 @@ if __name__ == "__main__":
                     user_name if user_name != "!UNDEFINED!" else None,
                     None,
                     None,
-                    datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00"),
+                    _received_at.strftime("%Y-%m-%d %H:%M:%S+00:00"),
                     1,
                     1,
+                    int(_received_at.timestamp()),
                 ),
             )
-            CONN.commit()
             LOGGER.info(
                 "%s:%s Recorded/Updated legitimization status in DB, linked to original context %s/%s",
                 user_id_legit,
@@ -13467,6 +13729,8 @@ if __name__ == "__main__":
     )  # exclude admins and technolog group, exclude join/left messages
     async def log_all_unhandled_messages(message: Message):
         """Function to log all unhandled messages to the technolog group and admin."""
+        if message.chat.type != "private" and shed_optional_output("unhandled_copy"):
+            return  # TECHNOLOG copy of unhandled messages skipped while updates are backed up
         try:
             # Convert the Message object to a dictionary, handling serialization errors
             try:
@@ -13999,11 +14263,11 @@ if __name__ == "__main__":
             try:
                 # Bulk delete all known recent messages from this user across chats
                 try:
-                    CURSOR.execute(
+                    await INGEST_BUFFER.barrier(user_id=susp_user_id)
+                    rows = await DB.fetchall(
                         "SELECT chat_id, message_id FROM recent_messages WHERE user_id = ?",
                         (susp_user_id,),
                     )
-                    rows = CURSOR.fetchall()
                     deleted_cnt = 0
                     db_pairs = set()
                     for _c, _m in rows:
@@ -14169,8 +14433,8 @@ if __name__ == "__main__":
                 banned_user_ids.add(susp_user_id)
                 increment_session_ban_count()
             # Add to database
-            add_banned_user(CONN, susp_user_id, susp_user_name, ban_source="admin_globalban",
-                          banned_by_admin_id=callback_query.from_user.id if callback_query.from_user else None)
+            await DB.write(add_banned_user, susp_user_id, susp_user_name, ban_source="admin_globalban",
+                           banned_by_admin_id=callback_query.from_user.id if callback_query.from_user else None)
 
         elif comand == "confirmban":
             # ban user in chat
@@ -14196,11 +14460,11 @@ if __name__ == "__main__":
             
             # Delete all messages from this user in THIS chat only (non-blocking)
             try:
-                CURSOR.execute(
+                await INGEST_BUFFER.barrier(user_id=susp_user_id)
+                rows = await DB.fetchall(
                     "SELECT message_id FROM recent_messages WHERE user_id = ? AND chat_id = ?",
                     (susp_user_id, susp_chat_id),
                 )
-                rows = CURSOR.fetchall()
                 chat_deleted = 0
                 chat_db_ids = set(_mid for (_mid,) in rows)
                 for (_mid,) in rows:
@@ -14343,8 +14607,8 @@ if __name__ == "__main__":
                 banned_user_ids.add(susp_user_id)
                 increment_session_ban_count()
             # Add to database
-            add_banned_user(CONN, susp_user_id, susp_user_name, ban_source="admin_confirmban",
-                          banned_by_admin_id=callback_query.from_user.id if callback_query.from_user else None)
+            await DB.write(add_banned_user, susp_user_id, susp_user_name, ban_source="admin_confirmban",
+                           banned_by_admin_id=callback_query.from_user.id if callback_query.from_user else None)
                 
         elif comand == "confirmdelmsg":
             callback_answer = "User suspicious message were deleted.\nForward message to the bot to ban user everywhere!"
@@ -14367,13 +14631,14 @@ if __name__ == "__main__":
                 )
                 # Also delete duplicate messages with the same content hash (multi-message spam)
                 try:
-                    _hash_row = CURSOR.execute(
+                    await INGEST_BUFFER.barrier(chat_id=susp_chat_id, message_id=susp_message_id)
+                    _hash_row = await DB.fetchone(
                         "SELECT message_content_hash FROM recent_messages WHERE chat_id = ? AND message_id = ?",
                         (susp_chat_id, susp_message_id),
-                    ).fetchone()
+                    )
                     _msg_hash = _hash_row[0] if _hash_row else None
                     if _msg_hash:
-                        _dup_msgs = get_duplicate_messages_by_hash(_msg_hash, susp_user_id)
+                        _dup_msgs = await get_duplicate_messages_by_hash(_msg_hash, susp_user_id)
                         _dup_deleted = 0
                         for _dup_cid, _dup_mid, _ in _dup_msgs:
                             if (_dup_cid, _dup_mid) == (susp_chat_id, susp_message_id):
@@ -14549,7 +14814,7 @@ if __name__ == "__main__":
         reset_session_ban_count()
         # Refresh from DB in case of any external changes
         banned_user_ids.clear()
-        banned_user_ids.update(get_banned_user_ids(CONN))
+        banned_user_ids.update(await DB.read(get_banned_user_ids))
         LOGGER.info("Daily reset: session_ban_count=0, reloaded %d banned IDs from DB", len(banned_user_ids))
 
     # NOTE: Night message check happens twice intentionally:
@@ -14592,18 +14857,46 @@ if __name__ == "__main__":
         # Register startup and shutdown callbacks
         DP.startup.register(on_startup)
         DP.shutdown.register(on_shutdown)
-        
+        DP.update.outer_middleware(UPDATE_PIPELINE)
+
+        if UPDATES_MODE == "webhook":
+            # aiohttp server feeding the same dispatcher; same startup/shutdown hooks
+            await run_webhook(
+                DP,
+                BOT,
+                path=WEBHOOK_PATH,
+                host=WEBHOOK_LISTEN_HOST,
+                port=WEBHOOK_LISTEN_PORT,
+                base_url=WEBHOOK_BASE_URL,
+                secret_token=WEBHOOK_SECRET,
+                ssl_cert=WEBHOOK_SSL_CERT,
+                ssl_key=WEBHOOK_SSL_KEY,
+                allowed_updates=ALLOWED_UPDATES,
+                max_connections=WEBHOOK_MAX_CONNECTIONS,
+                # Answer Telegram once UPDATE_PIPELINE accepted the update (backpressure)
+                handle_in_background=False,
+                logger=LOGGER,
+            )
+            return
+
         # Delete webhook and skip pending updates before polling
         await BOT.delete_webhook(drop_pending_updates=True)
         
         # Start polling with close_bot_session=False to prevent flood errors
-        # We handle cleanup ourselves in on_shutdown
-        await DP.start_polling(BOT, allowed_updates=ALLOWED_UPDATES, close_bot_session=False)
+        # We handle cleanup ourselves in on_shutdown.
+        # handle_as_tasks=False: UPDATE_PIPELINE queues the updates, and a full
+        # queue holds back the next getUpdates instead of piling up tasks
+        await DP.start_polling(
+            BOT,
+            allowed_updates=ALLOWED_UPDATES,
+            close_bot_session=False,
+            handle_as_tasks=False,
+        )
     
     try:
         asyncio.run(main())
     except TelegramRetryAfter as e:
         LOGGER.warning("Bot shutdown rate limited by Telegram (retry after %s seconds). Exiting anyway.", e.retry_after)
     finally:
-        # Close SQLite connection
-        CONN.close()
+        # Finish queued DB writes and close SQLite connections
+        DB.close()
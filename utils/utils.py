@@ -8,6 +8,7 @@ Functions:
     load_predetermined_sentences(txt_file: str):
         Load predetermined sentences from a plain text file, normalize to lowercase, remove extra spaces and punctuation marks,
         check for duplicates, rewrite the file excluding duplicates if any, and log the results.
+        Returns them compiled into a SentenceMatcher (word -> sentence IDs inverted index).
     get_latest_commit_info():
         Function to get the latest commit info.
     extract_spammer_info(message: types.Message):
@@ -25,6 +26,10 @@ Functions:
         Function to check if the message contains 5 or more emojis in a single line.
     check_message_for_capital_letters(message: types.Message):
         Function to check if the message contains 5 or more consecutive capital letters in a line, excluding URLs.
+    canonicalize_text(text: str) -> str:
+        NFKC, zero-width removal and homoglyph folding shared by the content detectors.
+    get_message_features(message: types.Message) -> MessageFeatures:
+        Entities (UTF-16 offsets), mentions, links, caps/emoji stats parsed once per message.
     has_custom_emoji_spam(message):
         Function to check if a message contains spammy custom emojis.
     format_spam_report(message: types.Message) -> str:
@@ -42,6 +47,10 @@ import re
 import sqlite3
 import subprocess
 import sys
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from sqlite3 import Connection, Cursor
@@ -657,7 +666,7 @@ async def safe_send_message(
         try:
             return await bot.send_message(chat_id, text, **kwargs)
         except RetryAfter as e:
-            wait = getattr(e, "timeout", 1) or 1
+            wait = getattr(e, "retry_after", None) or getattr(e, "timeout", 1) or 1
             if attempt < retries:
                 if logger:
                     logger.warning(
@@ -685,10 +694,305 @@ async def safe_send_message(
             return None
 
 
+# Invisible/zero-width characters commonly used by spammers to split words and mentions
+ZERO_WIDTH_CHARS = frozenset(
+    {
+        "\u200b",  # Zero-width space
+        "\u200c",  # Zero-width non-joiner
+        "\u200d",  # Zero-width joiner
+        "\u200e",  # Left-to-right mark
+        "\u200f",  # Right-to-left mark
+        "\u2060",  # Word joiner
+        "\u2061",  # Function application
+        "\u2062",  # Invisible times
+        "\u2063",  # Invisible separator
+        "\u2064",  # Invisible plus
+        "\ufeff",  # Zero-width no-break space (BOM)
+        "\u034f",  # Combining grapheme joiner
+        "\u00ad",  # Soft hyphen
+        "\u180e",  # Mongolian vowel separator
+        "\u061c",  # Arabic letter mark
+    }
+)
+
+# Cyrillic/Latin pairs that render the same ("вceгo 12 чaca" style spam)
+_CYRILLIC_LATIN_PAIRS = "аaеeоoрpсcуyхxкkіiјjѕsԁdһhАAВBЕEКKМMНHОOРPСCТTУYХXІIЈJЅS"
+_CYRILLIC_TO_LATIN = str.maketrans(_CYRILLIC_LATIN_PAIRS[0::2], _CYRILLIC_LATIN_PAIRS[1::2])
+_LATIN_TO_CYRILLIC = str.maketrans(_CYRILLIC_LATIN_PAIRS[1::2], _CYRILLIC_LATIN_PAIRS[0::2])
+# Applied to the whole text: drop zero-width characters, fold Greek lookalikes to Latin
+_GREEK_LATIN_PAIRS = "αaεeιiκkνvοoρpτtυuχxΑAΒBΕEΖZΗHΙIΚKΜMΝNΟOΡPΤTΥYΧX"
+_CANONICAL_BASE_TABLE = {
+    **{ord(char): None for char in ZERO_WIDTH_CHARS},
+    **str.maketrans(_GREEK_LATIN_PAIRS[0::2], _GREEK_LATIN_PAIRS[1::2]),
+}
+_LETTERS_RE = re.compile(r"[^\W\d_]+")
+
+
+def _fold_mixed_script_word(match) -> str:
+    """Fold the lookalike letters of a mixed Cyrillic/Latin word into one script.
+
+    The script is chosen by the letters that exist in only one of them
+    (б, ч, я / f, g, r ...); if there are none, the majority wins, ties go
+    to Cyrillic.
+    """
+    word = match.group()
+    if word.isascii():
+        return word
+    cyrillic = latin = cyrillic_only = latin_only = 0
+    for char in word:
+        if "\u0400" <= char <= "\u04ff":
+            cyrillic += 1
+            cyrillic_only += ord(char) not in _CYRILLIC_TO_LATIN
+        elif char.isascii():
+            latin += 1
+            latin_only += ord(char) not in _LATIN_TO_CYRILLIC
+    if not cyrillic or not latin:
+        return word
+    if cyrillic_only != latin_only:
+        to_cyrillic = cyrillic_only > latin_only
+    else:
+        to_cyrillic = cyrillic >= latin
+    return word.translate(_LATIN_TO_CYRILLIC if to_cyrillic else _CYRILLIC_TO_LATIN)
+
+
+def canonicalize_text(text: Optional[str]) -> str:
+    """Return the canonical form of text for content detectors.
+
+    Applies NFKC (fullwidth/stylized letters to plain ones), removes
+    zero-width characters and folds homoglyphs so each word is in one
+    script. Case is preserved. Offsets do not map back to the original
+    text, so entity offsets must still be applied to the raw text.
+    """
+    if not text:
+        return ""
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKC", text).translate(_CANONICAL_BASE_TABLE)
+    return _LETTERS_RE.sub(_fold_mixed_script_word, text)
+
+
+_TME_DEEPLINK_RE = re.compile(r"(?:https?://)?(?:t\.me|telegram\.me)/m/([A-Za-z0-9_-]+)")
+_PLAIN_USERNAME_RE = re.compile(r"@([A-Za-z][A-Za-z0-9_]{4,31})")
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_CAPITAL_RUN_RE = re.compile(r"[A-Z]{5,}")
+
+
+@dataclass
+class EntityInfo:
+    """One message entity resolved against the message text."""
+    type: str
+    offset: int  # UTF-16 code units, as sent by Telegram
+    length: int
+    text: str  # visible text of the entity
+    in_caption: bool = False
+    url: Optional[str] = None  # text_link target
+    user_id: Optional[int] = None  # text_mention user
+    user_name: Optional[str] = None
+    user_first_name: str = ""
+    hidden_chars: bool = False  # zero-width characters within 3 code units around it
+
+
+@dataclass
+class MessageFeatures:
+    """Content features of one message, parsed once by get_message_features().
+
+    text is message.text or message.caption (a message never has both);
+    entities are resolved with UTF-16 offsets. The capital-letter and emoji
+    stats and custom_emoji_count cover message.text only, as the detectors
+    always did.
+    """
+    text: str = ""
+    canonical_text: str = ""  # canonicalize_text(text)
+    in_caption: bool = False
+    entities: list = field(default_factory=list)  # EntityInfo in message order
+    mentions: list = field(default_factory=list)  # "@username" of mention entities
+    text_mentions: list = field(default_factory=list)  # EntityInfo of text_mention entities
+    bot_mentions: list = field(default_factory=list)  # "@somebot" mention entities
+    bot_commands: list = field(default_factory=list)  # "@somebot" targets of /cmd@somebot
+    urls: list = field(default_factory=list)  # visible url entities and text_link targets
+    bot_links: list = field(default_factory=list)  # t.me/...bot links among urls
+    tme_deeplinks: list = field(default_factory=list)  # https://t.me/m/... profile deeplinks
+    fake_mentions: list = field(default_factory=list)  # {visible_text, hidden_url} of text_links to t.me/m/
+    plain_usernames: list = field(default_factory=list)  # @username patterns in canonical_text
+    hidden_mentions: list = field(default_factory=list)  # mentions with zero-width chars around them
+    custom_emoji_count: int = 0
+    has_capital_run: bool = False  # 5+ consecutive capital letters in a line, URLs excluded
+    max_line_emojis: int = 0  # most emojis in a single line
+
+
+def _entity_field(obj, name: str, default=None):
+    """Read a field of an entity/user given as an aiogram object or a plain dict."""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _utf16_slice(encoded: bytes, offset: int, length: int) -> str:
+    """Slice UTF-16-LE encoded text by Telegram offset/length (code units)."""
+    return encoded[offset * 2 : (offset + length) * 2].decode("utf-16-le", errors="ignore")
+
+
+def _is_bot_link(url: str) -> bool:
+    url = url.lower()
+    return ("t.me/" in url or "telegram.me/" in url) and url.rstrip("/").endswith("bot")
+
+
+def extract_message_features(message: types.Message) -> MessageFeatures:
+    """Parse text, entities and caps/emoji stats of message in one pass.
+    Use get_message_features() to share the result between detectors."""
+    in_caption = message.text is None
+    text = (message.caption or "") if in_caption else message.text
+    raw_entities = (message.caption_entities if in_caption else message.entities) or []
+    features = MessageFeatures(
+        text=text, canonical_text=canonicalize_text(text), in_caption=in_caption
+    )
+    features.tme_deeplinks = [
+        f"https://t.me/m/{code}" for code in _TME_DEEPLINK_RE.findall(features.canonical_text)
+    ]
+    features.plain_usernames = _PLAIN_USERNAME_RE.findall(features.canonical_text)
+
+    encoded = text.encode("utf-16-le")
+    for entity in raw_entities:
+        offset = _entity_field(entity, "offset", 0) or 0
+        length = _entity_field(entity, "length", 0) or 0
+        context_start = max(offset - 3, 0)
+        context = _utf16_slice(encoded, context_start, offset + length + 3 - context_start)
+        info = EntityInfo(
+            type=_entity_field(entity, "type"),
+            offset=offset,
+            length=length,
+            text=_utf16_slice(encoded, offset, length),
+            in_caption=in_caption,
+            hidden_chars=any(char in ZERO_WIDTH_CHARS for char in context),
+        )
+        features.entities.append(info)
+
+        if info.type == "mention":
+            if not info.text.startswith("@"):
+                continue
+            features.mentions.append(info.text)
+            if info.text.lower().endswith("bot"):
+                features.bot_mentions.append(info.text)
+            if info.hidden_chars:
+                features.hidden_mentions.append(info.text)
+        elif info.type == "text_mention":
+            user = _entity_field(entity, "user")
+            if user:
+                info.user_id = _entity_field(user, "id")
+                info.user_name = _entity_field(user, "username")
+                info.user_first_name = _entity_field(user, "first_name", "") or ""
+            features.text_mentions.append(info)
+            if info.user_id and info.hidden_chars:
+                features.hidden_mentions.append(f"ID:{info.user_id}")
+        elif info.type == "bot_command":
+            if "@" in info.text:
+                target = info.text.split("@", 1)[1]
+                if target.lower().endswith("bot"):
+                    features.bot_commands.append(f"@{target}")
+        elif info.type == "url":
+            features.urls.append(info.text)
+            if _is_bot_link(info.text):
+                features.bot_links.append(info.text)
+        elif info.type == "text_link":
+            info.url = _entity_field(entity, "url", "") or ""
+            if not info.url:
+                continue
+            features.urls.append(info.url)
+            if _is_bot_link(info.url):
+                features.bot_links.append(info.url)
+            if _TME_DEEPLINK_RE.search(info.url):
+                # Visible text hides a t.me/m/ deeplink
+                full_url = info.url if info.url.startswith("http") else f"https://{info.url}"
+                features.fake_mentions.append({"visible_text": info.text, "hidden_url": full_url})
+                if full_url not in features.tme_deeplinks:
+                    features.tme_deeplinks.append(full_url)
+        elif info.type == "custom_emoji" and not in_caption:
+            features.custom_emoji_count += 1
+
+    if not in_caption:
+        for line in features.canonical_text.split("\n"):
+            if _CAPITAL_RUN_RE.search(_URL_RE.sub("", line)):
+                features.has_capital_run = True
+                break
+        features.max_line_emojis = max(
+            (sum(1 for char in line if emoji.is_emoji(char)) for line in text.split("\n")),
+            default=0,
+        )
+    return features
+
+
+# Recently parsed messages; aiogram messages are frozen, so the features are
+# kept here by id() together with the message itself (which pins the id)
+_MESSAGE_FEATURES: "OrderedDict[int, Tuple[types.Message, MessageFeatures]]" = OrderedDict()
+_MESSAGE_FEATURES_MAX = 256
+
+
+def get_message_features(message: types.Message) -> MessageFeatures:
+    """Return the MessageFeatures of message, parsing it only on first use."""
+    entry = _MESSAGE_FEATURES.get(id(message))
+    if entry is not None and entry[0] is message:
+        return entry[1]
+    features = extract_message_features(message)
+    _MESSAGE_FEATURES[id(message)] = (message, features)
+    while len(_MESSAGE_FEATURES) > _MESSAGE_FEATURES_MAX:
+        _MESSAGE_FEATURES.popitem(last=False)
+    return features
+
+
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
+class SentenceMatcher:
+    """Predetermined sentences compiled into an inverted index.
+
+    A sentence matches a text when every one of its words occurs in the
+    canonicalized text (any order, any position). The index maps each word to the IDs of
+    the sentences containing it, so a text is checked in one pass over its
+    distinct words instead of re-tokenizing every sentence per message.
+    Iterating, len() and truthiness behave like the plain list of sentences.
+    """
+
+    def __init__(self, sentences):
+        self.sentences = list(sentences)
+        self._index = {}
+        self._required = []
+        # Sentences without any word: all() over no words is True
+        self._always = False
+        for sentence_id, sentence in enumerate(self.sentences):
+            words = set(_WORD_RE.findall(canonicalize_text(sentence).lower()))
+            self._required.append(len(words))
+            if not words:
+                self._always = True
+            for word in words:
+                self._index.setdefault(word, []).append(sentence_id)
+
+    def __iter__(self):
+        return iter(self.sentences)
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def match(self, text: str) -> bool:
+        """Return True if all words of any sentence are present in text.
+
+        text is expected to be canonicalize_text() output.
+        """
+        if self._always:
+            return True
+        found = {}
+        for word in set(_WORD_RE.findall(text.lower())):
+            for sentence_id in self._index.get(word, ()):
+                found[sentence_id] = found.get(sentence_id, 0) + 1
+                if found[sentence_id] == self._required[sentence_id]:
+                    return True
+        return False
+
+
 def load_predetermined_sentences(txt_file: str, logger):
     """Load predetermined sentences from a plain text file, normalize to lowercase,
     remove extra spaces and punctuation marks, check for duplicates, rewrite the file
     excluding duplicates if any, and log the results. Return None if the file doesn't exist.
+    The sentences are returned compiled into a SentenceMatcher.
 
     :param txt_file: str: The path to the plain text file containing predetermined sentences.
     """
@@ -696,10 +1000,15 @@ def load_predetermined_sentences(txt_file: str, logger):
         return None
 
     with open(txt_file, "r", encoding="utf-8") as file:
-        lines = [line.strip().lower() for line in file if line.strip()]
-
-    # Normalize lines by removing extra spaces and punctuation marks
-    normalized_lines = [re.sub(r"[^\w\s]", "", line).strip() for line in lines]
+        raw_lines = [line.strip() for line in file if line.strip()]
+    lines = [line.lower() for line in raw_lines]
+
+    # Normalize lines by canonicalizing homoglyphs, removing extra spaces and punctuation marks,
+    # so lookalike variants of one entry collapse into a single line
+    normalized_lines = [
+        re.sub(r"[^\w\s]", "", canonicalize_text(line).lower()).strip()
+        for line in raw_lines
+    ]
 
     unique_lines = list(set(normalized_lines))
     duplicates = [line for line in normalized_lines if normalized_lines.count(line) > 1]
@@ -727,7 +1036,7 @@ def load_predetermined_sentences(txt_file: str, logger):
             "No duplicates or normalization changes found. File not rewritten.\n"
         )
 
-    return unique_lines
+    return SentenceMatcher(unique_lines)
 
 
 def get_latest_commit_info(logger):
@@ -847,52 +1156,22 @@ def check_message_for_emojis(message: types.Message):
     if message.text is None:
         return False
 
-    # Split the message text into lines
-    lines = message.text.split("\n")
-
-    # Check each line for 5 or more emojis
-    for line in lines:
-        emojis = [char for char in line if emoji.is_emoji(char)]
-        if len(emojis) >= 5:
-            return True
-
-    return False
+    return get_message_features(message).max_line_emojis >= 5
 
 
 def check_message_for_capital_letters(message: types.Message):
-    """Function to check if the message contains 5 or more consecutive capital letters in a line, excluding URLs."""
+    """Function to check if the message contains 5 or more consecutive capital letters in a line, excluding URLs.
+    Lines are checked in canonical form, so lookalike Cyrillic capitals count."""
     # Check if the message contains text
     if message.text is None:
         return False
 
-    # Initialize a list to hold lines from the text
-    lines = message.text.split("\n")
-
-    # Regular expression to match URLs
-    url_pattern = re.compile(r"https?://\S+|www\.\S+")
-
-    # Regular expression to match 5 or more consecutive capital letters
-    capital_pattern = re.compile(r"[A-Z]{5,}")
-
-    # Check if any line contains 5 or more consecutive capital letters, excluding URLs
-    for line in lines:
-        # Remove URLs from the line
-        line_without_urls = re.sub(url_pattern, "", line)
-        # Check if the line contains 5 or more consecutive capital letters
-        if capital_pattern.search(line_without_urls):
-            return True
-
-    return False
+    return get_message_features(message).has_capital_run
 
 
 def has_custom_emoji_spam(message):
     """Function to check if a message contains spammy custom emojis."""
-    message_dict = message.model_dump()
-    entities = message_dict.get("entities") or []
-    custom_emoji_count = sum(
-        1 for entity in entities if entity.get("type") == "custom_emoji"
-    )
-    return custom_emoji_count >= 5
+    return get_message_features(message).custom_emoji_count >= 5
 
 
 def format_spam_report(message: types.Message) -> str:
@@ -948,28 +1227,21 @@ def extract_chat_name_and_message_id_from_link(message_link):
 def check_message_for_sentences(
     message: types.Message, predetermined_sentences, logger
 ):
-    """Function to check the message for predetermined word sentences."""
+    """Function to check the message for predetermined word sentences
+    (matched on the canonical message text)."""
 
     if not predetermined_sentences:
         logger.warning(
             "spam_dict.txt not found. Automated spam detection will not check for predetermined sentences."
         )
+        return False
     # Check if the message contains text
     if message.text is None:
         return False
 
-    # Convert the message text to lowercase and tokenize it into words
-    message_words = re.findall(r"\b\w+\b", message.text.lower())
-
-    # Check if the message contains any of the predetermined sentences
-    for sentence in predetermined_sentences:
-        # Tokenize the predetermined sentence into words
-        sentence_words = re.findall(r"\b\w+\b", sentence.lower())
-
-        # Check if all words in the predetermined sentence are in the message words
-        if all(word in message_words for word in sentence_words):
-            return True
-    return False
+    if not isinstance(predetermined_sentences, SentenceMatcher):
+        predetermined_sentences = SentenceMatcher(predetermined_sentences)
+    return predetermined_sentences.match(get_message_features(message).canonical_text)
 
 
 def get_channel_id_by_name(channel_dict, channel_name):
@@ -995,11 +1267,10 @@ def has_spam_entities(spam_triggers, message: types.Message):
     Returns:
         bool: True if the message is spam, False otherwise.
     """
-    if message.entities:
-        for entity in message.entities:
-            if entity.type in spam_triggers:
-                # Spam detected
-                return entity.type
+    for entity in get_message_features(message).entities:
+        if not entity.in_caption and entity.type in spam_triggers:
+            # Spam detected
+            return entity.type
     return None
 
 
@@ -1020,12 +1291,47 @@ def compute_message_hash(text: str) -> str | None:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
-def store_message_to_db(cursor: Cursor, conn: Connection, message: types.message):
-    """store message data to DB
+def to_epoch(value) -> Optional[int]:
+    """Convert a DB timestamp to integer epoch seconds (UTC).
+
+    Accepts datetimes, epoch numbers and the text formats found in the DB
+    ("2025-12-04 15:30:00+00:00" and legacy naive "2025-12-04 15:30:00",
+    which is treated as UTC). Returns None for empty or unparsable values.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip().replace(" ", "T"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+# Columns written for every ingested message, in INSERT order
+RECENT_MESSAGES_INGEST_COLUMNS = (
+    "chat_id", "chat_username", "message_id", "user_id", "user_name", "user_first_name",
+    "user_last_name", "forward_date", "forward_sender_name", "received_date", "from_chat_title",
+    "forwarded_from_id", "forwarded_from_username", "forwarded_from_first_name",
+    "forwarded_from_last_name", "new_chat_member", "left_chat_member", "via_bot_id",
+    "message_content_hash", "received_ts", "forward_ts",
+)
+
+
+def message_to_db_row(message: types.message) -> dict:
+    """Build the recent_messages row (RECENT_MESSAGES_INGEST_COLUMNS) for a message.
     
     Note: All timestamps are stored in UTC with timezone suffix (+00:00) for portability.
     This makes the database timezone-independent and deployable across different servers.
     Format: ISO 8601 (e.g., "2025-12-04 15:30:00+00:00")
+    The same instants are stored as epoch seconds in received_ts/forward_ts,
+    which are the columns to filter and order by.
     """
     # Store UTC timestamps with timezone info for portability
     # Ensure timestamps are converted to UTC before formatting
@@ -1035,38 +1341,50 @@ def store_message_to_db(cursor: Cursor, conn: Connection, message: types.message
     via_bot_id = message.via_bot.id if message.via_bot else None
     # Compute content hash for privacy-preserving lookup (text or caption, not both)
     content_hash = compute_message_hash(message.text or message.caption)
-    
-    cursor.execute(
-        """
+
+    return {
+        "chat_id": getattr(message.chat, "id", None),
+        "chat_username": getattr(message.chat, "username", ""),
+        "message_id": getattr(message, "message_id", None),
+        "user_id": getattr(message.from_user, "id", None),
+        "user_name": getattr(message.from_user, "username", ""),
+        "user_first_name": getattr(message.from_user, "first_name", ""),
+        "user_last_name": getattr(message.from_user, "last_name", ""),
+        "forward_date": forward_date_utc,
+        "forward_sender_name": getattr(message, "forward_sender_name", ""),
+        "received_date": received_date_utc,
+        "from_chat_title": getattr(message.forward_from_chat, "title", None),
+        "forwarded_from_id": getattr(message.forward_from, "id", None),
+        "forwarded_from_username": getattr(message.forward_from, "username", ""),
+        "forwarded_from_first_name": getattr(message.forward_from, "first_name", ""),
+        "forwarded_from_last_name": getattr(message.forward_from, "last_name", ""),
+        "new_chat_member": None,
+        "left_chat_member": None,
+        "via_bot_id": via_bot_id,
+        "message_content_hash": content_hash,
+        "received_ts": to_epoch(message.date),
+        "forward_ts": to_epoch(message.forward_date),
+    }
+
+
+def store_messages_to_db(cursor: Cursor, conn: Connection, rows: list):
+    """Store message rows (see message_to_db_row) in a single transaction"""
+    cursor.executemany(
+        f"""
         INSERT OR REPLACE INTO recent_messages 
-        (chat_id, chat_username, message_id, user_id, user_name, user_first_name, user_last_name, forward_date, forward_sender_name, received_date, from_chat_title, forwarded_from_id, forwarded_from_username, forwarded_from_first_name, forwarded_from_last_name, new_chat_member, left_chat_member, via_bot_id, message_content_hash) 
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ({", ".join(RECENT_MESSAGES_INGEST_COLUMNS)}) 
+        VALUES ({", ".join("?" * len(RECENT_MESSAGES_INGEST_COLUMNS))})
         """,
-        (
-            getattr(message.chat, "id", None),
-            getattr(message.chat, "username", ""),
-            getattr(message, "message_id", None),
-            getattr(message.from_user, "id", None),
-            getattr(message.from_user, "username", ""),
-            getattr(message.from_user, "first_name", ""),
-            getattr(message.from_user, "last_name", ""),
-            forward_date_utc,
-            getattr(message, "forward_sender_name", ""),
-            received_date_utc,
-            getattr(message.forward_from_chat, "title", None),
-            getattr(message.forward_from, "id", None),
-            getattr(message.forward_from, "username", ""),
-            getattr(message.forward_from, "first_name", ""),
-            getattr(message.forward_from, "last_name", ""),
-            None,
-            None,
-            via_bot_id,
-            content_hash,
-        ),
+        [tuple(row[column] for column in RECENT_MESSAGES_INGEST_COLUMNS) for row in rows],
     )
     conn.commit()
 
 
+def store_message_to_db(cursor: Cursor, conn: Connection, message: types.message):
+    """store message data to DB (see message_to_db_row for the stored format)"""
+    store_messages_to_db(cursor, conn, [message_to_db_row(message)])
+
+
 def db_init(cursor: Cursor, conn: Connection):
     """DB init function"""
 
@@ -1100,6 +1418,8 @@ def db_init(cursor: Cursor, conn: Connection):
         membership_status TEXT,
         deletion_reason TEXT,
         via_bot_id INTEGER,
+        received_ts INTEGER,
+        forward_ts INTEGER,
         PRIMARY KEY (chat_id, message_id)
     )
     """
@@ -1134,6 +1454,14 @@ def db_init(cursor: Cursor, conn: Connection):
     except sqlite3.OperationalError:
         pass  # Column already exists
 
+    # Add epoch seconds columns mirroring received_date/forward_date (filled by backfill_epoch_columns)
+    for column in ("received_ts INTEGER", "forward_ts INTEGER"):
+        try:
+            cursor.execute(f"ALTER TABLE recent_messages ADD COLUMN {column}")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
     # User baselines table - stores monitoring state and profile snapshots
     cursor.execute(
         """
@@ -1192,12 +1520,317 @@ def db_init(cursor: Cursor, conn: Connection):
         reserved_text3 TEXT,
         -- Timestamps
         created_at TEXT,
-        updated_at TEXT
+        updated_at TEXT,
+        -- Persisted monitoring schedule (epoch seconds, see save_monitoring_schedule)
+        monitoring_started_at INTEGER,
+        monitoring_step INTEGER,
+        monitoring_next_check_at INTEGER,
+        -- Epoch seconds mirrors of joined_at/banned_at/updated_at for filtering and ordering
+        joined_ts INTEGER,
+        banned_ts INTEGER,
+        updated_ts INTEGER
+    )
+    """
+    )
+    conn.commit()
+
+    # Add persisted monitoring schedule and epoch columns if they don't exist (for existing databases)
+    for column in (
+        "monitoring_started_at INTEGER",
+        "monitoring_step INTEGER",
+        "monitoring_next_check_at INTEGER",
+        "joined_ts INTEGER",
+        "banned_ts INTEGER",
+        "updated_ts INTEGER",
+    ):
+        try:
+            cursor.execute(f"ALTER TABLE user_baselines ADD COLUMN {column}")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+    # Key/value table for schema bookkeeping (index set version etc.)
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS db_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
     )
     """
     )
     conn.commit()
 
+    # Fingerprints (message_content_hash) of messages confirmed as spam by a ban
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS known_spam_hashes (
+        content_hash TEXT PRIMARY KEY,
+        source TEXT,
+        added_ts INTEGER,
+        hits INTEGER DEFAULT 0
+    )
+    """
+    )
+    conn.commit()
+
+    db_ensure_indexes(cursor, conn)
+
+
+# ============================================================================
+# Secondary indexes
+# ============================================================================
+
+# Bump RECENT_MESSAGES_INDEX_VERSION whenever RECENT_MESSAGES_INDEXES changes;
+# indexes with the idx_recent_messages_ prefix that are no longer listed are dropped.
+RECENT_MESSAGES_INDEX_VERSION = 3
+RECENT_MESSAGES_INDEXES = {
+    # is_established_user, check_user_legit, get_user_whois, join/first message lookups
+    "idx_recent_messages_user_received": "recent_messages(user_id, received_ts)",
+    # get_spammer_details / Deleted Account matching by message date
+    "idx_recent_messages_received_ts": "recent_messages(received_ts)",
+    # get_duplicate_messages_by_hash, get_spammer_details content hash match
+    "idx_recent_messages_content_hash": "recent_messages(message_content_hash)",
+    # get_user_whois case-insensitive username lookup
+    "idx_recent_messages_lower_user_name": "recent_messages(LOWER(user_name))",
+    # get_spammer_details forwarded-forwarded messages
+    "idx_recent_messages_forwarded_from": "recent_messages(forwarded_from_id, forward_ts)",
+    # get_spammer_details sender branches (each OR branch needs an index)
+    "idx_recent_messages_from_chat_title": "recent_messages(from_chat_title)",
+    "idx_recent_messages_forward_sender": "recent_messages(forward_sender_name, forward_ts)",
+    "idx_recent_messages_via_bot": "recent_messages(via_bot_id)",
+    # report callbacks looking up a message by id only
+    "idx_recent_messages_message_id": "recent_messages(message_id)",
+}
+
+# Hot recent_messages queries. The code runs these exact strings and
+# check_query_plans() explains the same ones, so the startup check can't
+# drift from what is actually executed.
+USER_MESSAGE_COUNT_QUERY = "SELECT COUNT(*) FROM recent_messages WHERE user_id = ?"
+USER_FIRST_MESSAGE_QUERY = (
+    "SELECT received_date FROM recent_messages WHERE user_id = ? ORDER BY received_ts ASC LIMIT 1"
+)
+USER_LEGIT_MARKER_QUERY = """
+        SELECT 1 FROM recent_messages
+        WHERE user_id = ? AND new_chat_member = 1 AND left_chat_member = 1
+        LIMIT 1
+        """
+USER_BY_USERNAME_QUERY = """
+            SELECT DISTINCT user_id, user_name, user_first_name, user_last_name
+            FROM recent_messages 
+            WHERE LOWER(user_name) = ?
+            ORDER BY received_ts DESC
+            LIMIT 1
+            """
+DUPLICATE_MESSAGES_QUERY = """
+            SELECT chat_id, message_id, chat_username
+            FROM recent_messages
+            WHERE message_content_hash = :hash
+                AND new_chat_member IS NULL AND left_chat_member IS NULL
+            ORDER BY received_ts DESC
+        """
+DUPLICATE_USER_MESSAGES_QUERY = """
+            SELECT chat_id, message_id, chat_username
+            FROM recent_messages
+            WHERE message_content_hash = :hash AND user_id = :user_id
+                AND new_chat_member IS NULL AND left_chat_member IS NULL
+            ORDER BY received_ts DESC
+        """
+REPORTED_MESSAGE_QUERY = (
+    "SELECT chat_id, message_id, forwarded_message_data, received_date FROM recent_messages WHERE message_id = ?"
+)
+
+# get_spammer_details: SPAMMER_DETAILS_QUERY.format(condition=...) with one
+# of the conditions below. Every OR branch must be indexed, otherwise SQLite
+# falls back to walking the received_ts index (a full scan). Dates match on
+# the epoch columns; rows the background backfill has not reached yet
+# (NULL *_ts) match on the text date instead, with the '+00:00' suffix
+# stripped (:message_forward_text is naive UTC "YYYY-MM-DD HH:MM:SS").
+_RECEIVED_DATE_TEXT_MATCH = "REPLACE(received_date, '+00:00', '') = :message_forward_text"
+_FORWARD_DATE_TEXT_MATCH = "REPLACE(forward_date, '+00:00', '') = :message_forward_text"
+SPAMMER_DETAILS_QUERY = """
+        SELECT chat_id, message_id, chat_username, user_id, user_name, user_first_name, user_last_name, received_date
+        FROM recent_messages
+        WHERE ({condition}) AND new_chat_member IS NULL AND left_chat_member IS NULL
+        ORDER BY received_ts DESC
+        LIMIT 1
+    """
+SPAMMER_BY_SENDER_CONDITION = (
+    "(user_first_name = :sender_first_name AND received_ts = :message_forward_ts)"
+    f" OR (user_first_name = :sender_first_name AND received_ts IS NULL AND {_RECEIVED_DATE_TEXT_MATCH})"
+    " OR (user_id = :user_id)"
+    " OR (from_chat_title = :from_chat_title)"
+    " OR (user_id = :user_id AND user_first_name = :sender_first_name AND user_last_name = :sender_last_name)"
+    " OR (forward_sender_name = :forward_sender_name AND forward_ts = :message_forward_ts)"
+    f" OR (forward_sender_name = :forward_sender_name AND forward_ts IS NULL AND {_FORWARD_DATE_TEXT_MATCH})"
+)
+SPAMMER_BY_CONTENT_HASH_CONDITION = "message_content_hash = :message_content_hash"
+SPAMMER_BY_VIA_BOT_CONDITION = (
+    "(via_bot_id = :via_bot_id AND received_ts = :message_forward_ts)"
+    f" OR (via_bot_id = :via_bot_id AND received_ts IS NULL AND {_RECEIVED_DATE_TEXT_MATCH})"
+    " OR (via_bot_id = :via_bot_id AND user_first_name = :sender_first_name)"
+)
+SPAMMER_BY_DATE_CONDITION = (
+    f"(received_ts = :message_forward_ts) OR (received_ts IS NULL AND {_RECEIVED_DATE_TEXT_MATCH})"
+)
+SPAMMER_BY_USER_ID_CONDITION = (
+    "(user_id = :user_id)"
+    " OR (user_id = :user_id AND user_first_name = :sender_first_name AND user_last_name = :sender_last_name)"
+)
+SPAMMER_BY_FORWARDED_FROM_CONDITION = (
+    "(forwarded_from_id = :forwarded_from_id AND forward_ts = :forward_ts)"
+    f" OR (forwarded_from_id = :forwarded_from_id AND forward_ts IS NULL AND {_FORWARD_DATE_TEXT_MATCH})"
+)
+
+RECENT_MESSAGES_HOT_QUERIES = {
+    "user message count": USER_MESSAGE_COUNT_QUERY,
+    "user first message": USER_FIRST_MESSAGE_QUERY,
+    "check_user_legit": USER_LEGIT_MARKER_QUERY,
+    "get_user_whois by username": USER_BY_USERNAME_QUERY,
+    "duplicate messages by hash": DUPLICATE_MESSAGES_QUERY,
+    "duplicate user messages by hash": DUPLICATE_USER_MESSAGES_QUERY,
+    "report lookup by message_id": REPORTED_MESSAGE_QUERY,
+    # Widest variant of each get_spammer_details branch
+    "spammer details by sender": SPAMMER_DETAILS_QUERY.format(
+        condition=f"{SPAMMER_BY_SENDER_CONDITION} OR ({SPAMMER_BY_CONTENT_HASH_CONDITION})"
+        f" OR {SPAMMER_BY_VIA_BOT_CONDITION}"
+    ),
+    "spammer details by message date": SPAMMER_DETAILS_QUERY.format(
+        condition=f"{SPAMMER_BY_DATE_CONDITION} OR ({SPAMMER_BY_CONTENT_HASH_CONDITION})"
+    ),
+    "spammer details by user_id": SPAMMER_DETAILS_QUERY.format(condition=SPAMMER_BY_USER_ID_CONDITION),
+    "spammer details by forwarded_from_id": SPAMMER_DETAILS_QUERY.format(
+        condition=SPAMMER_BY_FORWARDED_FROM_CONDITION
+    ),
+    "spammer details by content hash": SPAMMER_DETAILS_QUERY.format(
+        condition=SPAMMER_BY_CONTENT_HASH_CONDITION
+    ),
+}
+
+
+def db_ensure_indexes(cursor: Cursor, conn: Connection):
+    """Create the versioned recent_messages index set, dropping obsolete indexes."""
+    logger = logging.getLogger(__name__)
+    row = cursor.execute(
+        "SELECT value FROM db_meta WHERE key = 'recent_messages_index_version'"
+    ).fetchone()
+    stored_version = int(row[0]) if row else 0
+
+    if stored_version != RECENT_MESSAGES_INDEX_VERSION:
+        existing = cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'recent_messages' AND name LIKE 'idx_recent_messages_%'"
+        ).fetchall()
+        for (name,) in existing:
+            if name not in RECENT_MESSAGES_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+                logger.info("Dropped obsolete index %s", name)
+
+    for name, definition in RECENT_MESSAGES_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+    if stored_version != RECENT_MESSAGES_INDEX_VERSION:
+        cursor.execute(
+            "INSERT OR REPLACE INTO db_meta (key, value) VALUES ('recent_messages_index_version', ?)",
+            (str(RECENT_MESSAGES_INDEX_VERSION),),
+        )
+        cursor.execute("ANALYZE recent_messages")
+        logger.info(
+            "recent_messages index set upgraded from v%s to v%s",
+            stored_version,
+            RECENT_MESSAGES_INDEX_VERSION,
+        )
+    conn.commit()
+
+
+def check_query_plans(conn: Connection, logger) -> list:
+    """Run EXPLAIN QUERY PLAN on the hot recent_messages queries and warn about full scans.
+
+    Returns:
+        List of query names that still fall back to a full table scan
+    """
+    full_scans = []
+    cursor = conn.cursor()
+    for name, query in RECENT_MESSAGES_HOT_QUERIES.items():
+        named = re.findall(r":(\w+)", query)
+        params = dict.fromkeys(named) if named else (None,) * query.count("?")
+        try:
+            plan = cursor.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("EXPLAIN QUERY PLAN failed for %s: %s", name, e)
+            continue
+        details = [row[-1] for row in plan]
+        if any(detail.startswith("SCAN recent_messages") for detail in details):
+            full_scans.append(name)
+            logger.warning(
+                "\033[93mQuery '%s' does a full scan of recent_messages: %s\033[0m",
+                name,
+                "; ".join(details),
+            )
+        else:
+            logger.debug("Query '%s' plan: %s", name, "; ".join(details))
+    if not full_scans:
+        logger.info("All %d hot recent_messages queries use indexes", len(RECENT_MESSAGES_HOT_QUERIES))
+    return full_scans
+
+
+# ============================================================================
+# Epoch timestamp backfill
+# ============================================================================
+
+# table -> {epoch column: text column it mirrors}
+EPOCH_COLUMNS = {
+    "recent_messages": {"received_ts": "received_date", "forward_ts": "forward_date"},
+    "user_baselines": {"joined_ts": "joined_at", "banned_ts": "banned_at", "updated_ts": "updated_at"},
+}
+
+
+def backfill_epoch_columns(conn: Connection, table: str, batch_size: int = 5000) -> int:
+    """Fill the epoch columns of one batch of pre-existing rows of table.
+
+    Walks the table in rowid order and stores its progress in db_meta, so the
+    backfill can run in small transactions while the bot is online and resumes
+    after a restart. Text dates are converted by SQLite, which reads both the
+    "+00:00" and the legacy naive (UTC) format.
+
+    Returns:
+        Number of rows visited in this batch, 0 once the table is done
+    """
+    columns = EPOCH_COLUMNS[table]
+    meta_key = f"epoch_backfill_{table}"
+    cursor = conn.cursor()
+    row = cursor.execute("SELECT value FROM db_meta WHERE key = ?", (meta_key,)).fetchone()
+    if row and row[0] == "done":
+        return 0
+    last_rowid = int(row[0]) if row else 0
+
+    batch_end, visited = cursor.execute(
+        f"SELECT MAX(rowid), COUNT(*) FROM "
+        f"(SELECT rowid FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+        (last_rowid, batch_size),
+    ).fetchone()
+    if not visited:
+        cursor.execute(
+            "INSERT OR REPLACE INTO db_meta (key, value) VALUES (?, 'done')", (meta_key,)
+        )
+        # Index statistics were gathered while the epoch columns were still empty
+        cursor.execute(f"ANALYZE {table}")
+        conn.commit()
+        return 0
+
+    assignments = ", ".join(
+        f"{ts_column} = COALESCE({ts_column}, CAST(strftime('%s', {text_column}) AS INTEGER))"
+        for ts_column, text_column in columns.items()
+    )
+    cursor.execute(
+        f"UPDATE {table} SET {assignments} WHERE rowid > ? AND rowid <= ?",
+        (last_rowid, batch_end),
+    )
+    cursor.execute(
+        "INSERT OR REPLACE INTO db_meta (key, value) VALUES (?, ?)", (meta_key, str(batch_end))
+    )
+    conn.commit()
+    return visited
+
 
 # ============================================================================
 # User Baselines Helper Functions
@@ -1236,6 +1869,7 @@ def save_user_baseline(
     cursor = conn.cursor()
     # Use UTC for all timestamps (DB convention is UTC)
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00")
+    now_ts = to_epoch(now)
     metadata_json = json.dumps(metadata) if metadata else None
     
     try:
@@ -1245,8 +1879,8 @@ def save_user_baseline(
                 user_id, username, first_name, last_name, photo_count,
                 monitoring_active, joined_at,
                 join_chat_id, join_chat_username, join_chat_title,
-                metadata, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+                metadata, created_at, updated_at, joined_ts, updated_ts
+            ) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(user_id) DO UPDATE SET
                 username = excluded.username,
                 first_name = excluded.first_name,
@@ -1258,12 +1892,14 @@ def save_user_baseline(
                 join_chat_username = excluded.join_chat_username,
                 join_chat_title = excluded.join_chat_title,
                 metadata = excluded.metadata,
-                updated_at = excluded.updated_at
+                updated_at = excluded.updated_at,
+                joined_ts = excluded.joined_ts,
+                updated_ts = excluded.updated_ts
             """,
             (
                 user_id, username, first_name, last_name, photo_count,
                 now, join_chat_id, join_chat_username, join_chat_title,
-                metadata_json, now, now,
+                metadata_json, now, now, now_ts, now_ts,
             ),
         )
         conn.commit()
@@ -1346,7 +1982,9 @@ def get_active_user_baselines(conn: Connection) -> list:
         SELECT user_id, username, first_name, last_name, photo_count,
                monitoring_active, joined_at, monitoring_ended_at,
                join_chat_id, join_chat_username, join_chat_title,
-               is_legit, is_banned, metadata, created_at, updated_at
+               is_legit, is_banned, metadata, created_at, updated_at,
+               monitoring_started_at, monitoring_step, monitoring_next_check_at,
+               joined_ts, updated_ts
         FROM user_baselines WHERE monitoring_active = 1
         """
     )
@@ -1370,10 +2008,60 @@ def get_active_user_baselines(conn: Connection) -> list:
             "metadata": json.loads(row[13]) if row[13] else None,
             "created_at": row[14],
             "updated_at": row[15],
+            "monitoring_started_at": row[16],
+            "monitoring_step": row[17],
+            "monitoring_next_check_at": row[18],
+            "joined_ts": row[19],
+            "updated_ts": row[20],
         })
     return results
 
 
+def save_monitoring_schedule(
+    conn: Connection,
+    user_id: int,
+    step: int,
+    next_check_at: float,
+    started_at: float = None,
+) -> bool:
+    """Persist the monitoring ladder position of a user so restarts can resume it.
+    
+    Args:
+        conn: Database connection
+        user_id: Telegram user ID
+        step: Index of the next check in the monitoring ladder
+        next_check_at: Epoch seconds when the next check is due
+        started_at: Epoch seconds when monitoring started (kept if None)
+    
+    Returns:
+        True if a baseline row was updated, False otherwise
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            UPDATE user_baselines SET
+                monitoring_started_at = COALESCE(?, monitoring_started_at),
+                monitoring_step = ?,
+                monitoring_next_check_at = ?
+            WHERE user_id = ?
+            """,
+            (
+                int(started_at) if started_at is not None else None,
+                step,
+                int(next_check_at),
+                user_id,
+            ),
+        )
+        conn.commit()
+        return cursor.rowcount > 0
+    except sqlite3.Error as e:
+        logging.getLogger(__name__).error(
+            "Error saving monitoring schedule for %s: %s", user_id, e
+        )
+        return False
+
+
 def update_user_baseline_status(
     conn: Connection,
     user_id: int,
@@ -1423,8 +2111,10 @@ def update_user_baseline_status(
     # Use UTC for all timestamps (DB convention is UTC)
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00")
     
-    updates = ["updated_at = ?"]
-    params = [now]
+    now_ts = to_epoch(now)
+    
+    updates = ["updated_at = ?", "updated_ts = ?"]
+    params = [now, now_ts]
     
     if monitoring_active is not None:
         updates.append("monitoring_active = ?")
@@ -1443,6 +2133,8 @@ def update_user_baseline_status(
         if is_banned:
             updates.append("banned_at = ?")
             params.append(now)
+            updates.append("banned_ts = ?")
+            params.append(now_ts)
     
     if ban_reason is not None:
         updates.append("ban_reason = ?")
@@ -1577,6 +2269,7 @@ def add_banned_user(
     """
     cursor = conn.cursor()
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S+00:00")
+    now_ts = to_epoch(now)
     
     try:
         # Check if user exists in baselines
@@ -1590,24 +2283,28 @@ def add_banned_user(
                    is_banned = 1, 
                    monitoring_active = 0,
                    banned_at = ?,
+                   banned_ts = ?,
                    ban_source = COALESCE(?, ban_source),
                    ban_reason = COALESCE(?, ban_reason),
                    banned_by_admin_id = COALESCE(?, banned_by_admin_id),
                    username = COALESCE(?, username),
                    first_name = COALESCE(?, first_name),
                    last_name = COALESCE(?, last_name),
-                   updated_at = ?
+                   updated_at = ?,
+                   updated_ts = ?
                    WHERE user_id = ?""",
-                (now, ban_source, ban_reason, banned_by_admin_id, username, first_name, last_name, now, user_id),
+                (now, now_ts, ban_source, ban_reason, banned_by_admin_id, username, first_name, last_name, now, now_ts, user_id),
             )
         else:
             # Create new record
             cursor.execute(
                 """INSERT INTO user_baselines 
                    (user_id, username, first_name, last_name, is_banned, monitoring_active,
-                    banned_at, ban_source, ban_reason, banned_by_admin_id, created_at, updated_at)
-                   VALUES (?, ?, ?, ?, 1, 0, ?, ?, ?, ?, ?, ?)""",
-                (user_id, username, first_name, last_name, now, ban_source, ban_reason, banned_by_admin_id, now, now),
+                    banned_at, ban_source, ban_reason, banned_by_admin_id, created_at, updated_at,
+                    banned_ts, updated_ts)
+                   VALUES (?, ?, ?, ?, 1, 0, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (user_id, username, first_name, last_name, now, ban_source, ban_reason, banned_by_admin_id, now, now,
+                 now_ts, now_ts),
             )
         conn.commit()
         return True
@@ -1674,7 +2371,7 @@ def get_banned_users(conn: Connection, limit: int = None) -> list:
                    banned_at, ban_source, ban_reason
             FROM user_baselines 
             WHERE is_banned = 1
-            ORDER BY banned_at DESC
+            ORDER BY banned_ts DESC
         """
         if limit:
             query += f" LIMIT {int(limit)}"
@@ -1719,6 +2416,106 @@ def get_banned_user_ids(conn: Connection) -> set[int]:
         return set()
 
 
+def add_known_spam_hashes(conn: Connection, content_hashes, source: str) -> int:
+    """Persist fingerprints of confirmed spam messages.
+
+    A fingerprint that is already known keeps its first source, only
+    added_ts is refreshed so recently confirmed texts survive pruning.
+
+    Args:
+        conn: Database connection
+        content_hashes: Iterable of message_content_hash values
+        source: What confirmed the spam (check_n_ban/admin_ban/autoban)
+
+    Returns:
+        Number of fingerprints written
+    """
+    now_ts = int(time.time())
+    rows = [(content_hash, source, now_ts) for content_hash in content_hashes if content_hash]
+    if not rows:
+        return 0
+    try:
+        conn.executemany(
+            """INSERT INTO known_spam_hashes (content_hash, source, added_ts)
+               VALUES (?, ?, ?)
+               ON CONFLICT(content_hash) DO UPDATE SET added_ts = excluded.added_ts""",
+            rows,
+        )
+        conn.commit()
+        return len(rows)
+    except sqlite3.Error as e:
+        logging.getLogger(__name__).error("Error adding known spam hashes: %s", e)
+        return 0
+
+
+def record_known_spam_hit(conn: Connection, content_hash: str) -> None:
+    """Count a repost of a known spam fingerprint and refresh its added_ts."""
+    try:
+        conn.execute(
+            "UPDATE known_spam_hashes SET hits = hits + 1, added_ts = ? WHERE content_hash = ?",
+            (int(time.time()), content_hash),
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        logging.getLogger(__name__).error("Error recording known spam hit: %s", e)
+
+
+def load_known_spam_hashes(conn: Connection, limit: int) -> list[str]:
+    """Load the newest known spam fingerprints, oldest first, and prune the rest.
+
+    Rows beyond limit (by added_ts) are deleted so the table stays the
+    same size as the in-memory set it backs.
+
+    Args:
+        conn: Database connection (writer, since it prunes)
+        limit: Maximum number of fingerprints to keep
+
+    Returns:
+        List of content hashes ordered from oldest to newest
+    """
+    try:
+        conn.execute(
+            """DELETE FROM known_spam_hashes WHERE content_hash NOT IN (
+                   SELECT content_hash FROM known_spam_hashes
+                   ORDER BY added_ts DESC LIMIT ?)""",
+            (int(limit),),
+        )
+        conn.commit()
+        rows = conn.execute(
+            "SELECT content_hash FROM known_spam_hashes ORDER BY added_ts ASC"
+        ).fetchall()
+        return [row[0] for row in rows]
+    except sqlite3.Error as e:
+        logging.getLogger(__name__).error("Error loading known spam hashes: %s", e)
+        return []
+
+
+def set_deletion_reasons(conn: Connection, deleted_messages, reason: str) -> int:
+    """Record why messages were deleted, all rows in one transaction.
+
+    Args:
+        conn: Database connection
+        deleted_messages: Iterable of (chat_id, message_id) pairs
+        reason: Stored in recent_messages.deletion_reason
+
+    Returns:
+        Number of recent_messages rows updated
+    """
+    rows = [(reason, chat_id, message_id) for chat_id, message_id in deleted_messages]
+    if not rows:
+        return 0
+    try:
+        cursor = conn.executemany(
+            "UPDATE recent_messages SET deletion_reason = ? WHERE chat_id = ? AND message_id = ?",
+            rows,
+        )
+        conn.commit()
+        return cursor.rowcount
+    except sqlite3.Error as e:
+        logging.getLogger(__name__).error("Error setting deletion reasons: %s", e)
+        return 0
+
+
 def unban_user(conn: Connection, user_id: int) -> bool:
     """Remove ban status from a user (mark as not banned).
     
@@ -1735,9 +2532,10 @@ def unban_user(conn: Connection, user_id: int) -> bool:
         cursor.execute(
             """UPDATE user_baselines SET 
                is_banned = 0, 
-               updated_at = ?
+               updated_at = ?,
+               updated_ts = ?
                WHERE user_id = ?""",
-            (now, user_id),
+            (now, to_epoch(now), user_id),
         )
         conn.commit()
         return cursor.rowcount > 0
@@ -1782,16 +2580,7 @@ def get_user_whois(conn: Connection, user_id: int = None, username: str = None)
     # If we only have username, try to find user_id from recent_messages
     if not user_id and username:
         clean_username = username.lstrip("@").lower()
-        cursor.execute(
-            """
-            SELECT DISTINCT user_id, user_name, user_first_name, user_last_name
-            FROM recent_messages 
-            WHERE LOWER(user_name) = ?
-            ORDER BY received_date DESC
-            LIMIT 1
-            """,
-            (clean_username,),
-        )
+        cursor.execute(USER_BY_USERNAME_QUERY, (clean_username,))
         row = cursor.fetchone()
         if row:
             user_id = row[0]
@@ -1877,7 +2666,7 @@ def get_user_whois(conn: Connection, user_id: int = None, username: str = None)
                forwarded_from_last_name
         FROM recent_messages 
         WHERE user_id = ?
-        ORDER BY received_date DESC
+        ORDER BY received_ts DESC
         LIMIT 50
         """,
         (user_id,),
@@ -1911,12 +2700,11 @@ def get_user_whois(conn: Connection, user_id: int = None, username: str = None)
         # Track chats
         result["chats_seen"].add((chat_id, chat_username or "", chat_title or ""))
         
-        # Track dates
+        # Track dates (rows are ordered newest first by received_ts)
         if received_date:
-            if not result["first_seen"] or received_date < result["first_seen"]:
-                result["first_seen"] = received_date
-            if not result["last_seen"] or received_date > result["last_seen"]:
+            if not result["last_seen"]:
                 result["last_seen"] = received_date
+            result["first_seen"] = received_date
         
         # Track join/leave events
         # Build "by whom" info if someone else performed the action
@@ -2294,14 +3082,7 @@ def check_user_legit(cursor: Cursor, user_id: int) -> bool:
     """Function to check if user is marked as legit
     having new_chat_member and left_chat_member set to 1."""
 
-    cursor.execute(
-        """
-        SELECT 1 FROM recent_messages
-        WHERE user_id = ? AND new_chat_member = 1 AND left_chat_member = 1
-        LIMIT 1
-        """,
-        (user_id,),
-    )
+    cursor.execute(USER_LEGIT_MARKER_QUERY, (user_id,))
     result = cursor.fetchone()
     return result is not None
 
@@ -0,0 +1,479 @@
+#! module utils_cache
+"""utils_cache.py
+This module provides in-memory caches used to cut down repeated Bot API
+round-trips in the hot message path.
+Classes:
+    AdminRosterCache:
+        TTL cache of chat administrator IDs keyed by chat_id, with explicit
+        invalidation, bulk warm-up and hit/miss counters.
+    VerdictCache:
+        Bounded LRU cache of spam reputation verdicts with separate TTLs for
+        positive and negative answers and single-flight lookups.
+    KnownSpamSet:
+        Bounded set of content fingerprints of confirmed spam messages with
+        per-fingerprint hit counts, for O(1) repost checks.
+    ExpiringDict / ExpiringSet:
+        Mappings/sets whose entries expire a fixed TTL after they were last
+        set, bounded by entry count, with amortized O(1) expiry.
+    MembershipCache:
+        Known member / non-member state per (chat_id, user_id), kept current
+        from chat_member updates and expiring after a TTL.
+    ProfileSnapshotCache:
+        Latest known names, username and profile photo count per user, fed
+        from incoming updates and refreshed in batches, for profile-change
+        checks without an API call per message.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from aiogram.exceptions import TelegramAPIError
+
+
+async def _single_flight(
+    pending: Dict[Hashable, asyncio.Task],
+    key: Hashable,
+    fetch: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Run fetch() once per key; concurrent callers await the same task.
+
+    The shared task is shielded, so a caller being cancelled does not
+    cancel the lookup for everyone else waiting on it.
+    """
+    task = pending.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        pending[key] = task
+
+        def _done(finished: asyncio.Task):
+            if pending.get(key) is finished:
+                del pending[key]
+            # Mark retrieved so a failure with no waiters is not reported as unhandled
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
+
+
+class AdminRosterCache:
+    """Cache of chat administrator IDs keyed by chat_id.
+
+    ``fetch_admins`` is the coroutine used on a miss (normally
+    ``BOT.get_chat_administrators``). Concurrent misses for the same chat
+    share a single request.
+    """
+
+    def __init__(
+        self,
+        fetch_admins: Callable[[int], Awaitable[list]],
+        ttl_seconds: int = 600,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self._fetch_admins = fetch_admins
+        self.ttl_seconds = ttl_seconds
+        self._logger = logger or logging.getLogger(__name__)
+        # chat_id -> (expires_at monotonic, set of admin user ids)
+        self._rosters: Dict[int, Tuple[float, Set[int]]] = {}
+        self._pending: Dict[int, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_admin_ids(self, chat_id: int) -> Set[int]:
+        """Return the admin IDs of chat_id, fetching them if absent or expired."""
+        entry = self._rosters.get(chat_id)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+
+        async def fetch() -> Set[int]:
+            admins = await self._fetch_admins(chat_id)
+            admin_ids = {admin.user.id for admin in admins}
+            self._rosters[chat_id] = (time.monotonic() + self.ttl_seconds, admin_ids)
+            return admin_ids
+
+        return await _single_flight(self._pending, chat_id, fetch)
+
+    async def is_admin(self, user_id: int, chat_id: int) -> bool:
+        """Check if user_id is an administrator of chat_id."""
+        return user_id in await self.get_admin_ids(chat_id)
+
+    def is_cached_admin(self, user_id: int, chat_id: int) -> bool:
+        """Memory-only check: True if the last fetched roster of chat_id lists user_id.
+
+        Never fetches, an expired roster still counts.
+        """
+        entry = self._rosters.get(chat_id)
+        return entry is not None and user_id in entry[1]
+
+    def invalidate(self, chat_id: Optional[int] = None):
+        """Drop the cached roster of chat_id, or every roster if chat_id is None."""
+        if chat_id is None:
+            self._rosters.clear()
+        else:
+            self._rosters.pop(chat_id, None)
+
+    async def warm_up(self, chat_ids: Iterable[int]) -> int:
+        """Fetch rosters for all chat_ids concurrently, return how many were loaded."""
+        chat_ids = [chat_id for chat_id in dict.fromkeys(chat_ids) if chat_id]
+        results = await asyncio.gather(
+            *(self.get_admin_ids(chat_id) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+        loaded = 0
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, TelegramAPIError):
+                self._logger.warning(
+                    "Could not load admin roster for %s: %s", chat_id, result
+                )
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                loaded += 1
+        return loaded
+
+    def stats(self) -> dict:
+        """Return cache counters for logging."""
+        total = self.hits + self.misses
+        return {
+            "chats": len(self._rosters),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class VerdictCache:
+    """LRU cache of (verdict, provider) pairs keyed by user/chat ID.
+
+    Positive verdicts rarely flip, so they live for ``positive_ttl``;
+    negatives expire after the shorter ``negative_ttl`` so a fresh spammer
+    is picked up quickly. Inconclusive answers (a provider failed) are never
+    cached, so an outage can't clear senders for ``negative_ttl``. The least
+    recently used entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(
+        self,
+        positive_ttl: int = 86400,
+        negative_ttl: int = 300,
+        max_entries: int = 10000,
+    ):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        # key -> (expires_at monotonic, verdict, provider)
+        self._entries: "OrderedDict[Hashable, Tuple[float, bool, Optional[str]]]" = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.inconclusive = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[bool, Optional[str]]]:
+        """Return the cached (verdict, provider) for key, or None if absent/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def put(self, key: Hashable, verdict: bool, provider: Optional[str] = None):
+        """Store a verdict, evicting the least recently used entries if full."""
+        ttl = self.positive_ttl if verdict else self.negative_ttl
+        self._entries[key] = (time.monotonic() + ttl, verdict, provider)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Forget the verdict for key, or every verdict if key is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Tuple[Optional[bool], Optional[str]]]],
+        force_refresh: bool = False,
+    ) -> Tuple[bool, Optional[str]]:
+        """Return the cached verdict or run fetch() once for all concurrent callers.
+
+        force_refresh skips the cached value but still joins a lookup that
+        is already in flight, which is fresh by definition. A verdict of
+        None from fetch() is inconclusive: returned as (False, None) and
+        not cached, so the next call asks again.
+        """
+        if not force_refresh:
+            cached = self.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+        self.misses += 1
+
+        async def fetch_and_store() -> Tuple[bool, Optional[str]]:
+            verdict, provider = await fetch()
+            if verdict is None:
+                self.inconclusive += 1
+                return False, None
+            self.put(key, verdict, provider)
+            return verdict, provider
+
+        return await _single_flight(self._pending, key, fetch_and_store)
+
+    def stats(self) -> dict:
+        """Return cache counters for logging."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "inconclusive": self.inconclusive,
+        }
+
+
+class KnownSpamSet:
+    """Bounded set of message_content_hash values of confirmed spam.
+
+    Insertion order is kept (re-adding or hitting a fingerprint makes it the
+    newest), so the least recently confirmed fingerprint is dropped once
+    ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = 20000):
+        self.max_entries = max_entries
+        self._hashes: "OrderedDict[str, None]" = OrderedDict()
+        self.added = 0
+        self.hits = 0
+
+    def __contains__(self, content_hash: Optional[str]) -> bool:
+        return content_hash is not None and content_hash in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, content_hash: Optional[str]) -> bool:
+        """Remember a fingerprint, return True if it was not known yet."""
+        if not content_hash:
+            return False
+        known = content_hash in self._hashes
+        self._hashes[content_hash] = None
+        self._hashes.move_to_end(content_hash)
+        while len(self._hashes) > self.max_entries:
+            self._hashes.popitem(last=False)
+        if not known:
+            self.added += 1
+        return not known
+
+    def update(self, content_hashes: Iterable[str]):
+        """Bulk add, e.g. when loading persisted fingerprints oldest first."""
+        for content_hash in content_hashes:
+            self.add(content_hash)
+
+    def hit(self, content_hash: str):
+        """Count a repost of a known fingerprint and keep it from being evicted."""
+        self.hits += 1
+        if content_hash in self._hashes:
+            self._hashes.move_to_end(content_hash)
+
+    def stats(self) -> dict:
+        """Return set counters for logging."""
+        return {
+            "entries": len(self._hashes),
+            "added": self.added,
+            "hits": self.hits,
+        }
+
+
+class ExpiringDict:
+    """Dict whose entries expire ``ttl`` seconds after they were last set.
+
+    All entries share one TTL, so insertion order (an entry moves to the end
+    when it is set again) is also expiry order: expired entries are popped
+    from the front on every access, which is amortized O(1) per entry and
+    never rescans the whole dict. Beyond ``max_entries`` the oldest entries
+    are dropped early.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (expires_at monotonic, value), oldest first
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.expired = 0
+        self.evicted = 0
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[key]
+            self.expired += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._expire()
+        return key in self._entries
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for key, or default if absent/expired."""
+        self._expire()
+        entry = self._entries.get(key)
+        return default if entry is None else entry[1]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self._expire()
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value, or default if absent/expired."""
+        self._expire()
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return counters for logging."""
+        return {
+            "entries": len(self),
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+class ExpiringSet(ExpiringDict):
+    """Set whose members expire ``ttl`` seconds after they were last added."""
+
+    def add(self, key: Hashable):
+        """Add key, or restart its TTL if it is already a member."""
+        self[key] = None
+
+    def discard(self, key: Hashable):
+        self.pop(key)
+
+
+class MembershipCache:
+    """Whether a user is a member of a chat, keyed by (chat_id, user_id).
+
+    Entries come from chat_member updates, messages seen in the chat, ban
+    results and get_chat_member answers; ``ttl`` bounds how long a state
+    nobody reported on is trusted.
+    """
+
+    def __init__(self, ttl: float = 21600, max_entries: int = 100000):
+        self._states = ExpiringDict(ttl, max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chat_id: int, user_id: int) -> Optional[bool]:
+        """Return True/False if the membership is known, None if it has to be asked."""
+        state = self._states.get((chat_id, user_id))
+        if state is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return state
+
+    def set(self, chat_id: int, user_id: int, is_member: bool):
+        self._states[(chat_id, user_id)] = is_member
+
+    def stats(self) -> dict:
+        """Return cache counters for logging."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._states),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+@dataclass
+class ProfileSnapshot:
+    """Last known profile of a user; fields are None until seen or fetched."""
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    username: Optional[str] = None
+    photo_count: Optional[int] = None
+    refreshed_at: float = 0.0  # monotonic time of the last API answer, 0 if none
+
+
+class ProfileSnapshotCache:
+    """Latest name, username and profile photo count per user.
+
+    Names arrive for free with every update the user appears in and are
+    updated in place by observe(); the photo count only comes from
+    getUserProfilePhotos, stored by set_photo_count(), which also restarts
+    the entry's TTL. An entry thus expires ``ttl`` seconds after the last
+    API answer, however often the user writes, so a cached photo count is
+    never older than ``ttl``.
+    """
+
+    def __init__(self, ttl: float = 21600, max_entries: int = 50000):
+        self._profiles = ExpiringDict(ttl, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get(self, user_id: int) -> Optional[ProfileSnapshot]:
+        """Return the snapshot of user_id if it has a photo count, else None."""
+        snapshot = self._profiles.get(user_id)
+        if snapshot is None or snapshot.photo_count is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return snapshot
+
+    def observe(self, user: Any):
+        """Update names from an aiogram User seen in an update."""
+        if user is None:
+            return
+        snapshot = self._profiles.get(user.id)
+        if snapshot is None:
+            # No photo count yet: get() misses until the first refresh
+            snapshot = ProfileSnapshot()
+            self._profiles[user.id] = snapshot
+        snapshot.first_name = user.first_name or ""
+        snapshot.last_name = user.last_name or ""
+        snapshot.username = user.username or ""
+
+    def set_photo_count(self, user_id: int, photo_count: int):
+        snapshot = self._profiles.get(user_id) or ProfileSnapshot()
+        snapshot.photo_count = photo_count
+        snapshot.refreshed_at = time.monotonic()
+        self._profiles[user_id] = snapshot
+        self.refreshes += 1
+
+    def stats(self) -> dict:
+        """Return cache counters for logging."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._profiles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "refreshes": self.refreshes,
+        }
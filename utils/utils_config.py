@@ -95,6 +95,78 @@ class BotConfig:
     NIGHT_END_HOUR: int = 6      # Exclusive: messages before this hour:minute are "night"
     NIGHT_END_MINUTE: int = 0
 
+    # Admin roster cache lifetime (seconds) for is_admin() lookups
+    ADMIN_CACHE_TTL_SECONDS: int = 600
+
+    # spam_check() verdict cache: positives are long-lived, negatives short
+    SPAM_CACHE_POSITIVE_TTL_SECONDS: int = 86400
+    SPAM_CACHE_NEGATIVE_TTL_SECONDS: int = 300
+    SPAM_CACHE_MAX_ENTRIES: int = 10000
+
+    # Max perform_checks() steps running at once in the monitoring scheduler
+    MONITORING_MAX_CONCURRENCY: int = 20
+
+    # SQLite reader connections (threads) used by the async DB facade
+    DB_READER_POOL_SIZE: int = 4
+    # Group commit of ingested messages: flush every N ms or once N rows wait
+    INGEST_FLUSH_INTERVAL_MS: int = 200
+    INGEST_FLUSH_MAX_ROWS: int = 200
+
+    # Near-duplicate spam waves: N new users posting near-identical text across chats
+    SPAM_WAVE_WINDOW_SECONDS: int = 900
+    SPAM_WAVE_MIN_USERS: int = 3
+    SPAM_WAVE_MIN_CHATS: int = 2
+    SPAM_WAVE_SIMILARITY_PERCENT: int = 70
+    SPAM_WAVE_MAX_ENTRIES: int = 5000
+    KNOWN_SPAM_MAX_ENTRIES: int = 20000
+    KNOWN_SPAM_MIN_TEXT_LENGTH: int = 20
+
+    # Duplicate-report trackers (autoreported / suspicious messages and users)
+    # and TECHNO_NAMES usernames forget entries after a TTL and beyond a cap
+    REPORT_TRACKING_TTL_HOURS: int = 48
+    REPORT_TRACKING_MAX_ENTRIES: int = 50000
+    POSTED_USERNAMES_TTL_HOURS: int = 168
+    POSTED_USERNAMES_MAX_ENTRIES: int = 50000
+
+    # Update pipeline in front of the handlers: worker pool, bounded queue,
+    # optional work (debug dumps, technolog copies) shed above N% of the queue
+    UPDATE_WORKERS: int = 16
+    UPDATE_QUEUE_SIZE: int = 1000
+    UPDATE_SHED_PERCENT: int = 50
+
+    # Bans/unbans fanned out over all monitored chats: global call rate and calls in flight
+    BAN_FANOUT_RATE_PER_SECOND: int = 20
+    BAN_FANOUT_CONCURRENCY: int = 10
+
+    # Outbound Bot API scheduler: Telegram's flood limits (global, per group, per private chat)
+    OUTBOUND_GLOBAL_RATE_PER_SECOND: int = 30
+    OUTBOUND_GROUP_RATE_PER_MINUTE: int = 20
+    OUTBOUND_PRIVATE_RATE_PER_SECOND: int = 1
+    # Optional TECHNOLOG output (JSON dumps, copies) is dropped once N log messages wait
+    OUTBOUND_LOG_SHED_WAITING: int = 50
+    # Short TECHNOLOG log lines are collected this long and sent packed per thread
+    TECHNOLOG_BATCH_WINDOW_MS: int = 2000
+
+    # Membership of users in monitored chats (get_user_other_chats)
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 21600
+    MEMBERSHIP_CACHE_MAX_ENTRIES: int = 100000
+    MEMBERSHIP_PROBE_CONCURRENCY: int = 8
+
+    # Profile snapshots of users (names, username, photo count) for profile-change checks
+    PROFILE_SNAPSHOT_TTL_SECONDS: int = 21600
+    PROFILE_SNAPSHOT_MAX_ENTRIES: int = 50000
+
+    # Update delivery: "polling" (default) or "webhook" (aiohttp server)
+    UPDATES_MODE: str = "polling"
+    WEBHOOK_BASE_URL: Optional[str] = None  # public https URL Telegram posts to; unset = don't register
+    WEBHOOK_PATH: str = "/telegram/webhook"
+    WEBHOOK_LISTEN_HOST: str = "127.0.0.1"  # behind a reverse proxy; 0.0.0.0 when exposed directly
+    WEBHOOK_LISTEN_PORT: int = 8090
+    WEBHOOK_SECRET: Optional[str] = None  # X-Telegram-Bot-Api-Secret-Token; random per run if unset
+    WEBHOOK_SSL_CERT: Optional[str] = None  # serve TLS directly (no proxy), cert is uploaded if self-signed
+    WEBHOOK_SSL_KEY: Optional[str] = None
+    WEBHOOK_MAX_CONNECTIONS: int = 40
+
 
 # Single config instance - modify attributes, no global keyword needed
 config = BotConfig()
@@ -261,6 +333,76 @@ def load_from_env() -> bool:
     config.NIGHT_END_HOUR = _get_env_int("NIGHT_END_HOUR", 6) or 6
     config.NIGHT_END_MINUTE = _get_env_int("NIGHT_END_MINUTE", 0) or 0
 
+    # Admin roster cache lifetime
+    config.ADMIN_CACHE_TTL_SECONDS = _get_env_int("ADMIN_CACHE_TTL_SECONDS", 600) or 600
+
+    # spam_check() verdict cache
+    config.SPAM_CACHE_POSITIVE_TTL_SECONDS = _get_env_int("SPAM_CACHE_POSITIVE_TTL_SECONDS", 86400) or 86400
+    config.SPAM_CACHE_NEGATIVE_TTL_SECONDS = _get_env_int("SPAM_CACHE_NEGATIVE_TTL_SECONDS", 300) or 300
+    config.SPAM_CACHE_MAX_ENTRIES = _get_env_int("SPAM_CACHE_MAX_ENTRIES", 10000) or 10000
+
+    # Monitoring scheduler
+    config.MONITORING_MAX_CONCURRENCY = _get_env_int("MONITORING_MAX_CONCURRENCY", 20) or 20
+
+    # Database
+    config.DB_READER_POOL_SIZE = _get_env_int("DB_READER_POOL_SIZE", 4) or 4
+    config.INGEST_FLUSH_INTERVAL_MS = _get_env_int("INGEST_FLUSH_INTERVAL_MS", 200) or 200
+    config.INGEST_FLUSH_MAX_ROWS = _get_env_int("INGEST_FLUSH_MAX_ROWS", 200) or 200
+
+    # Spam wave detector
+    config.SPAM_WAVE_WINDOW_SECONDS = _get_env_int("SPAM_WAVE_WINDOW_SECONDS", 900) or 900
+    config.SPAM_WAVE_MIN_USERS = _get_env_int("SPAM_WAVE_MIN_USERS", 3) or 3
+    config.SPAM_WAVE_MIN_CHATS = _get_env_int("SPAM_WAVE_MIN_CHATS", 2) or 2
+    config.SPAM_WAVE_SIMILARITY_PERCENT = _get_env_int("SPAM_WAVE_SIMILARITY_PERCENT", 70) or 70
+    config.SPAM_WAVE_MAX_ENTRIES = _get_env_int("SPAM_WAVE_MAX_ENTRIES", 5000) or 5000
+    config.KNOWN_SPAM_MAX_ENTRIES = _get_env_int("KNOWN_SPAM_MAX_ENTRIES", 20000) or 20000
+    config.KNOWN_SPAM_MIN_TEXT_LENGTH = _get_env_int("KNOWN_SPAM_MIN_TEXT_LENGTH", 20) or 20
+
+    # Duplicate-report trackers
+    config.REPORT_TRACKING_TTL_HOURS = _get_env_int("REPORT_TRACKING_TTL_HOURS", 48) or 48
+    config.REPORT_TRACKING_MAX_ENTRIES = _get_env_int("REPORT_TRACKING_MAX_ENTRIES", 50000) or 50000
+    config.POSTED_USERNAMES_TTL_HOURS = _get_env_int("POSTED_USERNAMES_TTL_HOURS", 168) or 168
+    config.POSTED_USERNAMES_MAX_ENTRIES = _get_env_int("POSTED_USERNAMES_MAX_ENTRIES", 50000) or 50000
+
+    # Update pipeline
+    config.UPDATE_WORKERS = _get_env_int("UPDATE_WORKERS", 16) or 16
+    config.UPDATE_QUEUE_SIZE = _get_env_int("UPDATE_QUEUE_SIZE", 1000) or 1000
+    config.UPDATE_SHED_PERCENT = _get_env_int("UPDATE_SHED_PERCENT", 50) or 50
+
+    # Ban fan-out
+    config.BAN_FANOUT_RATE_PER_SECOND = _get_env_int("BAN_FANOUT_RATE_PER_SECOND", 20) or 20
+    config.BAN_FANOUT_CONCURRENCY = _get_env_int("BAN_FANOUT_CONCURRENCY", 10) or 10
+
+    # Outbound scheduler
+    config.OUTBOUND_GLOBAL_RATE_PER_SECOND = _get_env_int("OUTBOUND_GLOBAL_RATE_PER_SECOND", 30) or 30
+    config.OUTBOUND_GROUP_RATE_PER_MINUTE = _get_env_int("OUTBOUND_GROUP_RATE_PER_MINUTE", 20) or 20
+    config.OUTBOUND_PRIVATE_RATE_PER_SECOND = _get_env_int("OUTBOUND_PRIVATE_RATE_PER_SECOND", 1) or 1
+    config.OUTBOUND_LOG_SHED_WAITING = _get_env_int("OUTBOUND_LOG_SHED_WAITING", 50) or 50
+    config.TECHNOLOG_BATCH_WINDOW_MS = _get_env_int("TECHNOLOG_BATCH_WINDOW_MS", 2000) or 2000
+
+    # Chat membership cache
+    config.MEMBERSHIP_CACHE_TTL_SECONDS = _get_env_int("MEMBERSHIP_CACHE_TTL_SECONDS", 21600) or 21600
+    config.MEMBERSHIP_CACHE_MAX_ENTRIES = _get_env_int("MEMBERSHIP_CACHE_MAX_ENTRIES", 100000) or 100000
+    config.MEMBERSHIP_PROBE_CONCURRENCY = _get_env_int("MEMBERSHIP_PROBE_CONCURRENCY", 8) or 8
+
+    # Profile snapshot cache
+    config.PROFILE_SNAPSHOT_TTL_SECONDS = _get_env_int("PROFILE_SNAPSHOT_TTL_SECONDS", 21600) or 21600
+    config.PROFILE_SNAPSHOT_MAX_ENTRIES = _get_env_int("PROFILE_SNAPSHOT_MAX_ENTRIES", 50000) or 50000
+
+    # Update delivery (polling / webhook)
+    config.UPDATES_MODE = (_get_env_or_none("UPDATES_MODE") or "polling").lower()
+    if config.UPDATES_MODE not in ("polling", "webhook"):
+        LOGGER.warning("Invalid UPDATES_MODE %s, using polling", config.UPDATES_MODE)
+        config.UPDATES_MODE = "polling"
+    config.WEBHOOK_BASE_URL = _get_env_or_none("WEBHOOK_BASE_URL")
+    config.WEBHOOK_PATH = _get_env_or_none("WEBHOOK_PATH") or "/telegram/webhook"
+    config.WEBHOOK_LISTEN_HOST = _get_env_or_none("WEBHOOK_LISTEN_HOST") or "127.0.0.1"
+    config.WEBHOOK_LISTEN_PORT = _get_env_int("WEBHOOK_LISTEN_PORT", 8090) or 8090
+    config.WEBHOOK_SECRET = _get_env_or_none("WEBHOOK_SECRET")
+    config.WEBHOOK_SSL_CERT = _get_env_or_none("WEBHOOK_SSL_CERT")
+    config.WEBHOOK_SSL_KEY = _get_env_or_none("WEBHOOK_SSL_KEY")
+    config.WEBHOOK_MAX_CONNECTIONS = _get_env_int("WEBHOOK_MAX_CONNECTIONS", 40) or 40
+
     # Content types
     config.ALLOWED_CONTENT_TYPES = _get_allowed_content_types()
 
@@ -338,3 +480,46 @@ NIGHT_START_HOUR = config.NIGHT_START_HOUR
 NIGHT_START_MINUTE = config.NIGHT_START_MINUTE
 NIGHT_END_HOUR = config.NIGHT_END_HOUR
 NIGHT_END_MINUTE = config.NIGHT_END_MINUTE
+ADMIN_CACHE_TTL_SECONDS = config.ADMIN_CACHE_TTL_SECONDS
+SPAM_CACHE_POSITIVE_TTL_SECONDS = config.SPAM_CACHE_POSITIVE_TTL_SECONDS
+SPAM_CACHE_NEGATIVE_TTL_SECONDS = config.SPAM_CACHE_NEGATIVE_TTL_SECONDS
+SPAM_CACHE_MAX_ENTRIES = config.SPAM_CACHE_MAX_ENTRIES
+MONITORING_MAX_CONCURRENCY = config.MONITORING_MAX_CONCURRENCY
+DB_READER_POOL_SIZE = config.DB_READER_POOL_SIZE
+INGEST_FLUSH_INTERVAL_MS = config.INGEST_FLUSH_INTERVAL_MS
+INGEST_FLUSH_MAX_ROWS = config.INGEST_FLUSH_MAX_ROWS
+SPAM_WAVE_WINDOW_SECONDS = config.SPAM_WAVE_WINDOW_SECONDS
+SPAM_WAVE_MIN_USERS = config.SPAM_WAVE_MIN_USERS
+SPAM_WAVE_MIN_CHATS = config.SPAM_WAVE_MIN_CHATS
+SPAM_WAVE_SIMILARITY_PERCENT = config.SPAM_WAVE_SIMILARITY_PERCENT
+SPAM_WAVE_MAX_ENTRIES = config.SPAM_WAVE_MAX_ENTRIES
+KNOWN_SPAM_MAX_ENTRIES = config.KNOWN_SPAM_MAX_ENTRIES
+KNOWN_SPAM_MIN_TEXT_LENGTH = config.KNOWN_SPAM_MIN_TEXT_LENGTH
+REPORT_TRACKING_TTL_HOURS = config.REPORT_TRACKING_TTL_HOURS
+REPORT_TRACKING_MAX_ENTRIES = config.REPORT_TRACKING_MAX_ENTRIES
+POSTED_USERNAMES_TTL_HOURS = config.POSTED_USERNAMES_TTL_HOURS
+POSTED_USERNAMES_MAX_ENTRIES = config.POSTED_USERNAMES_MAX_ENTRIES
+UPDATE_WORKERS = config.UPDATE_WORKERS
+UPDATE_QUEUE_SIZE = config.UPDATE_QUEUE_SIZE
+UPDATE_SHED_PERCENT = config.UPDATE_SHED_PERCENT
+BAN_FANOUT_RATE_PER_SECOND = config.BAN_FANOUT_RATE_PER_SECOND
+BAN_FANOUT_CONCURRENCY = config.BAN_FANOUT_CONCURRENCY
+OUTBOUND_GLOBAL_RATE_PER_SECOND = config.OUTBOUND_GLOBAL_RATE_PER_SECOND
+OUTBOUND_GROUP_RATE_PER_MINUTE = config.OUTBOUND_GROUP_RATE_PER_MINUTE
+OUTBOUND_PRIVATE_RATE_PER_SECOND = config.OUTBOUND_PRIVATE_RATE_PER_SECOND
+OUTBOUND_LOG_SHED_WAITING = config.OUTBOUND_LOG_SHED_WAITING
+TECHNOLOG_BATCH_WINDOW_MS = config.TECHNOLOG_BATCH_WINDOW_MS
+MEMBERSHIP_CACHE_TTL_SECONDS = config.MEMBERSHIP_CACHE_TTL_SECONDS
+MEMBERSHIP_CACHE_MAX_ENTRIES = config.MEMBERSHIP_CACHE_MAX_ENTRIES
+MEMBERSHIP_PROBE_CONCURRENCY = config.MEMBERSHIP_PROBE_CONCURRENCY
+PROFILE_SNAPSHOT_TTL_SECONDS = config.PROFILE_SNAPSHOT_TTL_SECONDS
+PROFILE_SNAPSHOT_MAX_ENTRIES = config.PROFILE_SNAPSHOT_MAX_ENTRIES
+UPDATES_MODE = config.UPDATES_MODE
+WEBHOOK_BASE_URL = config.WEBHOOK_BASE_URL
+WEBHOOK_PATH = config.WEBHOOK_PATH
+WEBHOOK_LISTEN_HOST = config.WEBHOOK_LISTEN_HOST
+WEBHOOK_LISTEN_PORT = config.WEBHOOK_LISTEN_PORT
+WEBHOOK_SECRET = config.WEBHOOK_SECRET
+WEBHOOK_SSL_CERT = config.WEBHOOK_SSL_CERT
+WEBHOOK_SSL_KEY = config.WEBHOOK_SSL_KEY
+WEBHOOK_MAX_CONNECTIONS = config.WEBHOOK_MAX_CONNECTIONS
@@ -0,0 +1,347 @@
+#! module utils_db
+"""utils_db.py
+This module provides an asyncio facade over SQLite so that database work
+(commits/fsyncs and slow queries) runs off the event loop.
+Classes:
+    AsyncDatabase:
+        One writer thread that serializes all writes on its own connection
+        and a small pool of reader threads with one WAL connection each.
+        Handlers await futures instead of blocking the loop.
+    WriteBehindBuffer:
+        Collects rows for one table and writes them through AsyncDatabase in
+        batches (group commit), while keeping not-yet-written rows visible
+        to lookups.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class AsyncDatabase:
+    """Run DB helpers on dedicated threads and await their results.
+
+    ``write(fn, *args)`` and ``read(fn, *args)`` call ``fn(conn, *args)`` with
+    the writer or a reader connection, so the existing helpers taking a
+    ``conn`` keep their semantics. All writes go through one thread in
+    submission order; a read started after a write future completed sees
+    that write (WAL readers see every committed transaction).
+
+    ``conn`` is the writer connection. It may be used directly only before
+    the event loop starts (schema setup) - afterwards it belongs to the
+    writer thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        readers: int = 4,
+        busy_timeout_ms: int = 5000,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._logger = logger or logging.getLogger(__name__)
+        self.conn = self._connect()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(
+            max_workers=max(readers, 1),
+            thread_name_prefix="db-reader",
+            initializer=self._open_reader,
+        )
+        self._local = threading.local()
+        self._reader_conns: List[sqlite3.Connection] = []
+        self._reader_conns_lock = threading.Lock()
+        self.writes = 0
+        self.reads = 0
+        self.write_errors = 0
+
+    def _connect(self, query_only: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False
+        )
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        if query_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _open_reader(self):
+        conn = self._connect(query_only=True)
+        self._local.conn = conn
+        with self._reader_conns_lock:
+            self._reader_conns.append(conn)
+
+    def _call_write(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        self.writes += 1
+        try:
+            return fn(self.conn, *args, **kwargs)
+        except BaseException:
+            self.write_errors += 1
+            # Don't leave a half-done transaction holding the write lock
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            raise
+
+    def _call_read(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        self.reads += 1
+        return fn(self._local.conn, *args, **kwargs)
+
+    async def write(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(conn, *args, **kwargs) on the writer thread and return its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._writer, partial(self._call_write, fn, args, kwargs)
+        )
+
+    def submit_write(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue fn(conn, *args, **kwargs) on the writer thread without waiting.
+
+        For synchronous callers; failures are logged instead of raised.
+        """
+        future = self._writer.submit(self._call_write, fn, args, kwargs)
+
+        def _log_failure(done: Future):
+            if not done.cancelled() and done.exception() is not None:
+                self._logger.error(
+                    "DB write %s failed: %s", getattr(fn, "__name__", fn), done.exception()
+                )
+
+        future.add_done_callback(_log_failure)
+        return future
+
+    async def read(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(conn, *args, **kwargs) on a reader thread and return its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._readers, partial(self._call_read, fn, args, kwargs)
+        )
+
+    async def execute(self, query: str, params=()) -> int:
+        """Execute one write statement and commit it, return the row count."""
+
+        def _execute(conn: sqlite3.Connection) -> int:
+            cursor = conn.execute(query, params)
+            conn.commit()
+            return cursor.rowcount
+
+        return await self.write(_execute)
+
+    async def fetchone(self, query: str, params=()) -> Optional[tuple]:
+        """Run a query on a reader connection and return the first row."""
+        return await self.read(lambda conn: conn.execute(query, params).fetchone())
+
+    async def fetchall(self, query: str, params=()) -> list:
+        """Run a query on a reader connection and return all rows."""
+        return await self.read(lambda conn: conn.execute(query, params).fetchall())
+
+    def stats(self) -> dict:
+        """Return facade counters for logging."""
+        return {
+            "writes": self.writes,
+            "write_errors": self.write_errors,
+            "reads": self.reads,
+            "reader_connections": len(self._reader_conns),
+            "write_queue": self._writer._work_queue.qsize(),  # pylint: disable=protected-access
+        }
+
+    def close(self):
+        """Finish queued work, then close every connection."""
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        with self._reader_conns_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+        self.conn.close()
+
+
+class WriteBehindBuffer:
+    """Group-commit buffer in front of AsyncDatabase for append-heavy tables.
+
+    ``add(key, row)`` only records the row; ``write_rows(conn, rows)`` is
+    run on the writer thread with every buffered row in one transaction,
+    every ``flush_interval_ms`` or as soon as ``max_rows`` are waiting.
+    A later row with the same key replaces the earlier one (INSERT OR
+    REPLACE semantics).
+
+    Rows stay visible through ``pending()`` until their transaction is
+    committed; callers that need SQL over the table await ``barrier(**match)``
+    (flush if a matching row is buffered) or ``flush()`` first. If a batch
+    fails, its rows are retried one by one; a row that keeps failing is
+    dropped after ``max_row_failures`` flushes so it can't block the rest.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        write_rows: Callable[[sqlite3.Connection, List[dict]], Any],
+        flush_interval_ms: int = 200,
+        max_rows: int = 200,
+        logger: Optional[logging.Logger] = None,
+        name: str = "write-behind",
+        max_row_failures: int = 3,
+    ):
+        self._db = db
+        self._write_rows = write_rows
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_rows = max_rows
+        self.max_row_failures = max_row_failures
+        self._logger = logger or logging.getLogger(__name__)
+        self.name = name
+        self._pending: Dict[Hashable, dict] = {}
+        # rows handed to the writer thread but not yet committed
+        self._flushing: Dict[Hashable, dict] = {}
+        # key -> failed flushes of its row so far
+        self._row_failures: Dict[Hashable, int] = {}
+        self._lock = asyncio.Lock()
+        self._runner: Optional[asyncio.Task] = None
+        self._size_flush: Optional[asyncio.Task] = None
+        self.rows_added = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.rows_dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._flushing)
+
+    def add(self, key: Hashable, row: dict):
+        """Buffer row under key; triggers an early flush once max_rows are waiting."""
+        self._pending[key] = row
+        self.rows_added += 1
+        if len(self._pending) >= self.max_rows and (
+            self._size_flush is None or self._size_flush.done()
+        ):
+            self._size_flush = asyncio.ensure_future(self.flush())
+
+    def pending(self, **match) -> List[dict]:
+        """Return buffered (uncommitted) rows whose columns equal all match values."""
+        rows = list(self._flushing.values()) + list(self._pending.values())
+        return [
+            row for row in rows if all(row.get(column) == value for column, value in match.items())
+        ]
+
+    async def barrier(self, **match) -> int:
+        """Flush only if a buffered row matches, so a following SQL read sees it.
+
+        Cheaper than flush() on the hot path: lookups for users with nothing
+        buffered don't force a commit.
+        """
+        if self.pending(**match):
+            return await self.flush()
+        return 0
+
+    async def flush(self) -> int:
+        """Write every buffered row in one transaction, return how many were written.
+
+        Concurrent callers queue on a lock, so when flush() returns every row
+        added before the call is committed.
+        """
+        async with self._lock:
+            if not self._pending:
+                return 0
+            self._flushing, self._pending = self._pending, {}
+            rows = list(self._flushing.values())
+            try:
+                await self._db.write(self._write_rows, rows)
+            except Exception as e:  # pylint: disable=broad-except
+                # sqlite3.Error, but also e.g. RuntimeError from a shut-down executor;
+                # retry the rows separately so one bad row can't sink the batch
+                self.flush_errors += 1
+                self._logger.error(
+                    "%s flush of %d rows failed, retrying one by one: %s: %s",
+                    self.name,
+                    len(rows),
+                    type(e).__name__,
+                    e,
+                )
+                written = await self._write_one_by_one()
+                self.rows_written += written
+                return written
+            else:
+                if self._row_failures:
+                    # Rows that failed an earlier flush made it this time
+                    for key in self._flushing:
+                        self._row_failures.pop(key, None)
+            finally:
+                self._flushing = {}
+            self.flushes += 1
+            self.rows_written += len(rows)
+            return len(rows)
+
+    async def _write_one_by_one(self) -> int:
+        """Write the rows of a failed flush separately, return how many were written.
+
+        A row that fails again goes back to the buffer for the next flush,
+        unless a newer row with its key replaced it meanwhile or it has now
+        failed max_row_failures flushes, in which case it is logged and dropped.
+        """
+        written = 0
+        for key, row in self._flushing.items():
+            try:
+                await self._db.write(self._write_rows, [row])
+            except Exception as e:  # pylint: disable=broad-except
+                failures = self._row_failures.pop(key, 0) + 1
+                if key in self._pending:
+                    continue
+                if failures >= self.max_row_failures:
+                    self.rows_dropped += 1
+                    self._logger.error(
+                        "%s dropped row %r after %d failed flushes: %s: %s",
+                        self.name,
+                        key,
+                        failures,
+                        type(e).__name__,
+                        e,
+                    )
+                    continue
+                self._row_failures[key] = failures
+                self._pending[key] = row
+                continue
+            self._row_failures.pop(key, None)
+            written += 1
+        return written
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if not self._pending:
+                continue
+            try:
+                await self.flush()
+            except Exception as e:  # pylint: disable=broad-except
+                # The periodic flush must outlive any single failure
+                self._logger.error("%s periodic flush failed: %s: %s", self.name, type(e).__name__, e)
+
+    def start(self):
+        """Start the periodic flush loop (idempotent)."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self):
+        """Stop the flush loop and write whatever is still buffered."""
+        if self._runner is not None:
+            # Don't interrupt a flush that is already handed to the writer thread
+            async with self._lock:
+                self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        """Return buffer counters for logging."""
+        return {
+            "buffered": len(self),
+            "rows_added": self.rows_added,
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "rows_dropped": self.rows_dropped,
+        }
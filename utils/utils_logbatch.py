@@ -0,0 +1,122 @@
+#! module utils_logbatch
+"""utils_logbatch.py
+This module coalesces short log lines sent to the technolog group: lines
+for the same (chat, thread) arriving within a short window are packed into
+as few messages as fit Telegram's length limit, instead of one API call per
+line.
+Classes:
+    LogBatcher:
+        Per-(chat, thread) collector that flushes after a window, as soon as
+        the next line would not fit, and on stop().
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+BatchKey = Tuple[int, Optional[int]]
+
+
+class LogBatcher:
+    """Collect HTML log lines per (chat_id, thread_id) and send them packed.
+
+    ``send(chat_id, thread_id, text)`` sends one HTML message and returns
+    a falsy value if it failed (like safe_send_message). Every line
+    must be valid HTML on its own (escape user data before adding); lines
+    are never split, only joined with newlines, so a packed message stays
+    valid and lines keep their order. A line longer than ``max_length`` is
+    sent on its own (and left to the sender to reject).
+    """
+
+    def __init__(
+        self,
+        send: Callable[[int, Optional[int], str], Awaitable],
+        window_seconds: float = 2.0,
+        max_length: int = 4096,
+        logger: Optional[logging.Logger] = None,
+        name: str = "logbatch",
+    ):
+        self._send = send
+        self.window_seconds = window_seconds
+        self.max_length = max_length
+        self._logger = logger or logging.getLogger(__name__)
+        self.name = name
+        # key -> (lines waiting, their packed length incl. separators)
+        self._pending: Dict[BatchKey, Tuple[List[str], int]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        # One flush at a time per key keeps the messages in line order
+        self._locks: Dict[BatchKey, asyncio.Lock] = {}
+        self._tasks: set = set()
+        self.lines = 0
+        self.messages = 0
+        self.failed = 0
+
+    def add(self, chat_id: int, thread_id: Optional[int], line: str):
+        """Queue an HTML line; it is sent within window_seconds."""
+        key = (chat_id, thread_id)
+        self.lines += 1
+        lines, length = self._pending.get(key, ([], 0))
+        if lines and length + 1 + len(line) > self.max_length:
+            # The line doesn't fit: send what is waiting now, start a new batch
+            self._start_flush(key)
+            lines, length = [], 0
+        lines.append(line)
+        self._pending[key] = (lines, length + len(line) + (1 if length else 0))
+        if key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.window_seconds, self._start_flush, key
+            )
+
+    def _start_flush(self, key: BatchKey):
+        # Take the batch now, so lines added from here on start a new one
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        task = asyncio.ensure_future(self._send_batch(key, pending[0]))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, key: BatchKey, lines: List[str]):
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            try:
+                if await self._send(key[0], key[1], "\n".join(lines)):
+                    self.messages += 1
+                else:
+                    self.failed += 1
+            except Exception as e:  # pylint: disable=broad-except
+                # A lost log batch must not break the caller that triggered the flush
+                self.failed += 1
+                self._logger.error(
+                    "%s: failed to send %d lines to %s/%s: %s", self.name, len(lines), key[0], key[1], e
+                )
+
+    async def flush(self):
+        """Send everything waiting now and wait for sends in progress."""
+        for key in list(self._pending):
+            self._start_flush(key)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def stop(self):
+        """Flush on shutdown; lines added afterwards are still batched normally."""
+        started = time.monotonic()
+        waiting = sum(len(lines) for lines, _ in self._pending.values())
+        await self.flush()
+        if waiting:
+            self._logger.info(
+                "%s: flushed %d lines on stop in %.2fs", self.name, waiting, time.monotonic() - started
+            )
+
+    def stats(self) -> dict:
+        """Return batcher counters for logging."""
+        return {
+            "waiting_lines": sum(len(lines) for lines, _ in self._pending.values()),
+            "lines": self.lines,
+            "messages": self.messages,
+            "failed": self.failed,
+        }
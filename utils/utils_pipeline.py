@@ -0,0 +1,169 @@
+#! module utils_pipeline
+"""utils_pipeline.py
+This module provides the update pipeline stage that sits in front of the
+dispatcher handlers, so a raid can't start thousands of handler coroutines
+(each firing API calls and DB writes) at once.
+Classes:
+    UpdatePipeline:
+        Outer update middleware with a bounded queue and a fixed worker
+        pool. Updates with the same ordering key run one at a time in arrival
+        order, different keys run in parallel. A full queue makes the
+        producer (polling loop / webhook request) wait instead of dropping
+        updates, and callers can shed optional work while it is backed up.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from aiogram.types import Update
+
+Handler = Callable[[Update, Dict[str, Any]], Awaitable[Any]]
+
+
+class UpdatePipeline:
+    """Bounded, per-key ordered worker pool for aiogram updates.
+
+    Register with ``DP.update.outer_middleware(pipeline)``: the middleware
+    only enqueues ``(handler, update, data)`` and returns, a worker calls
+    ``handler(update, data)`` later. Updates are keyed by (chat, user) from
+    aiogram's event context, so one account's join, messages and edits stay
+    in order while the many accounts of a raid are handled in parallel.
+
+    At most ``max_queue`` updates wait; the next one blocks its producer
+    until a slot frees up (polling mode should run with
+    ``handle_as_tasks=False`` so this throttles getUpdates itself). Once the
+    backlog reaches ``shed_ratio`` of the queue, ``should_shed()`` tells
+    callers to skip optional work (debug dumps, technolog copies).
+    """
+
+    def __init__(
+        self,
+        workers: int = 16,
+        max_queue: int = 1000,
+        shed_ratio: float = 0.5,
+        logger: Optional[logging.Logger] = None,
+        name: str = "updates",
+    ):
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 1)
+        self.shed_threshold = max(int(self.max_queue * shed_ratio), 1)
+        self._logger = logger or logging.getLogger(__name__)
+        self.name = name
+        self._slots = asyncio.Semaphore(self.max_queue)
+        # key -> updates waiting for that key, in arrival order
+        self._lanes: Dict[Hashable, Deque[Tuple[Handler, Update, Dict[str, Any], float]]] = {}
+        # keys with waiting updates and no update of theirs running
+        self._ready: "asyncio.Queue[Hashable]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self.depth = 0
+        self.max_depth = 0
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.producer_waits = 0
+        self.shed: Dict[str, int] = {}
+        self.max_wait = 0.0
+
+    @staticmethod
+    def _ordering_key(data: Dict[str, Any]) -> Hashable:
+        context = data.get("event_context")
+        chat_id = getattr(context, "chat_id", None)
+        user_id = getattr(context, "user_id", None)
+        return chat_id, user_id
+
+    async def __call__(self, handler: Handler, event: Update, data: Dict[str, Any]) -> Any:
+        """Outer middleware entry point: enqueue the update, waiting if the queue is full."""
+        if not self._tasks:
+            # Not started (or stopped): behave like a plain dispatcher
+            return await handler(event, data)
+        if self._slots.locked():
+            self.producer_waits += 1
+        await self._slots.acquire()
+        key = self._ordering_key(data)
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = deque()
+            self._ready.put_nowait(key)
+        lane.append((handler, event, data, time.monotonic()))
+        self.depth += 1
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        return None
+
+    @property
+    def backlogged(self) -> bool:
+        """True while at least shed_threshold updates are waiting."""
+        return self.depth >= self.shed_threshold
+
+    def should_shed(self, kind: str) -> bool:
+        """Return True (and count it) if optional work of this kind should be skipped now."""
+        if not self.backlogged:
+            return False
+        self.shed[kind] = self.shed.get(kind, 0) + 1
+        return True
+
+    async def _work(self):
+        while True:
+            key = await self._ready.get()
+            lane = self._lanes[key]
+            handler, event, data, queued_at = lane.popleft()
+            self.depth -= 1
+            self._slots.release()
+            self.max_wait = max(self.max_wait, time.monotonic() - queued_at)
+            try:
+                await handler(event, data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # pylint: disable=broad-except
+                # One failing update must not stop its worker
+                self.failed += 1
+                self._logger.exception(
+                    "%s: update %s raised %s: %s", self.name, event.update_id, type(e).__name__, e
+                )
+            finally:
+                self.processed += 1
+                # Hand the key back only now, so its next update can't overtake this one
+                if lane:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._lanes[key]
+
+    def start(self):
+        """Start the worker pool (idempotent)."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"{self.name}-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float = 30.0):
+        """Let the workers finish the queued updates (up to timeout), then stop them."""
+        if not self._tasks:
+            return
+        deadline = time.monotonic() + timeout
+        while (self.depth or self._lanes) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        if self.depth:
+            self._logger.warning("%s: stopping with %d updates still queued", self.name, self.depth)
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Return pipeline counters for logging."""
+        return {
+            "queued": self.depth,
+            "max_queued": self.max_depth,
+            "active_keys": len(self._lanes),
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "producer_waits": self.producer_waits,
+            "max_wait_s": round(self.max_wait, 2),
+            "shed": dict(self.shed),
+        }
@@ -0,0 +1,398 @@
+#! module utils_ratelimit
+"""utils_ratelimit.py
+This module provides rate limiting for outbound Bot API calls: one
+scheduler every request goes through, and a fan-out helper for calls that
+go to all monitored chats (bans, unbans).
+Classes:
+    TokenBucket:
+        Async token bucket (rate per second, burst capacity) serving waiters
+        by priority, that can be paused as a whole when Telegram answers
+        with RetryAfter.
+    ChatResult:
+        Outcome of one per-chat call of a fan-out.
+    ChatFanout:
+        Runs one call per chat concurrently under a shared TokenBucket,
+        retrying RetryAfter answers and collecting per-chat results.
+    OutboundLane:
+        Priority classes of outbound calls (moderation, alerts, logs,
+        background polling).
+    outbound_lane:
+        Context manager putting the Bot API calls made inside it (and in
+        tasks started from it) into a given lane.
+    OutboundScheduler:
+        aiogram request middleware that makes every Bot API call wait for
+        the global bucket (and message sends for their chat's bucket) in
+        lane order, and pauses all of them when Telegram answers with
+        RetryAfter.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+
+from utils.utils_cache import ExpiringDict
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second with bursts of up to ``capacity``.
+
+    Waiters get tokens by ``priority`` (lower first), then in arrival order.
+    ``pause(seconds)`` stops every acquirer until the pause is over; it is
+    how a RetryAfter from Telegram is applied to all pending calls instead
+    of only to the one that got it.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # (priority, arrival, future) of callers waiting for a token
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._drainer: Optional[asyncio.Task] = None
+        self.waits = 0
+        self.pauses = 0
+
+    def __len__(self) -> int:
+        """Number of callers waiting for a token."""
+        return len(self._waiters)
+
+    def _take(self) -> bool:
+        now = time.monotonic()
+        if now < self._paused_until:
+            return False
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def _drain(self):
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                # Waiter was cancelled
+                heapq.heappop(self._waiters)
+                continue
+            if self._take():
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+                continue
+            now = time.monotonic()
+            if now < self._paused_until:
+                delay = self._paused_until - now
+            else:
+                delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(max(delay, 0.001))
+
+    async def acquire(self, priority: int = 0):
+        """Wait until a token is available (and no pause is active), then take it."""
+        if not self._waiters and self._take():
+            return
+        self.waits += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        await future
+
+    def pause(self, seconds: float):
+        """Hold every acquirer for seconds (extends, never shortens, a running pause)."""
+        self.pauses += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # Calls already in flight when the limit hit count against the new window
+        self._tokens = 0
+
+    async def wait_unpaused(self):
+        """Wait until a running pause is over, without taking a token."""
+        while time.monotonic() < self._paused_until:
+            await asyncio.sleep(self._paused_until - time.monotonic())
+
+
+@dataclass
+class ChatResult:
+    """Outcome of one chat in a fan-out; error is the API error text when not ok."""
+    chat_id: int
+    ok: bool
+    error: Optional[str] = None
+    retries: int = 0
+
+
+class ChatFanout:
+    """Run ``call(chat_id)`` for many chats concurrently under one rate limit.
+
+    At most ``concurrency`` calls are in flight and all of them take a token
+    from ``bucket`` first. A RetryAfter pauses the bucket (so every chat
+    waits, not only the one that hit the limit) and the call is retried up
+    to ``max_retries`` times; any other Telegram API error is recorded as
+    that chat's failure without affecting the others.
+    """
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        concurrency: int = 10,
+        max_retries: int = 3,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.bucket = bucket
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self._logger = logger or logging.getLogger(__name__)
+        self.runs = 0
+        self.calls = 0
+        self.failures = 0
+        self.retry_afters = 0
+
+    async def _call_chat(self, chat_id: int, call: Callable[[int], Awaitable]) -> ChatResult:
+        retries = 0
+        async with self._semaphore:
+            while True:
+                await self.bucket.acquire()
+                self.calls += 1
+                try:
+                    await call(chat_id)
+                    return ChatResult(chat_id, True, retries=retries)
+                except TelegramRetryAfter as e:
+                    self.retry_afters += 1
+                    self.bucket.pause(e.retry_after)
+                    if retries >= self.max_retries:
+                        self.failures += 1
+                        return ChatResult(chat_id, False, str(e), retries)
+                    retries += 1
+                    self._logger.warning(
+                        "Flood limit in chat %s, all fan-out calls paused for %s seconds",
+                        chat_id,
+                        e.retry_after,
+                    )
+                except TelegramAPIError as e:
+                    self.failures += 1
+                    return ChatResult(chat_id, False, str(e), retries)
+
+    async def run(self, chat_ids: Iterable[int], call: Callable[[int], Awaitable]) -> List[ChatResult]:
+        """Call call(chat_id) for every chat, return the results in chat_ids order."""
+        self.runs += 1
+        return list(await asyncio.gather(*(self._call_chat(chat_id, call) for chat_id in chat_ids)))
+
+    def stats(self) -> dict:
+        """Return fan-out counters for logging."""
+        return {
+            "runs": self.runs,
+            "calls": self.calls,
+            "failures": self.failures,
+            "retry_afters": self.retry_afters,
+            "bucket_waits": self.bucket.waits,
+            "bucket_pauses": self.bucket.pauses,
+        }
+
+
+class OutboundLane(IntEnum):
+    """Priority class of an outbound call; lower lanes get tokens first."""
+    MODERATION = 0  # bans, deletions, callback answers
+    ALERT = 1  # admin group / private messages and everything else
+    LOG = 2  # messages to the technolog/log chats
+    BACKGROUND = 3  # periodic polling nobody is waiting for (outbound_lane())
+
+
+# Lane set by outbound_lane() for the calls of the current task
+_LANE_HINT: ContextVar[Optional[OutboundLane]] = ContextVar("outbound_lane_hint", default=None)
+
+
+@contextmanager
+def outbound_lane(lane: OutboundLane):
+    """Put the Bot API calls made in this block into lane (overrides lane_of()).
+
+    Tasks created inside the block (asyncio.gather, create_task) copy the
+    context, so their calls are in the lane too.
+    """
+    token = _LANE_HINT.set(lane)
+    try:
+        yield
+    finally:
+        _LANE_HINT.reset(token)
+
+
+class OutboundScheduler(BaseRequestMiddleware):
+    """Request middleware enforcing Telegram's flood limits for one bot.
+
+    Register with ``BOT.session.middleware(scheduler)``. Every call except
+    getUpdates (a long poll) takes a token from the global bucket
+    (``global_rate`` calls per second). Calls that post a message
+    (send*/forward*/copy*) first take a token from their chat's bucket:
+    ``group_rate_per_minute`` for groups and channels, ``private_rate`` per
+    second for private chats.
+
+    Waiting calls are served by lane (OutboundLane), then in arrival order:
+    moderation actions first, then alerts, messages to ``log_chat_ids``,
+    and last background polling marked with outbound_lane(), so debug
+    output and polling are deferred while anything more important is
+    queued. Once ``log_shed_waiting`` log-lane calls wait,
+    ``should_shed()`` tells callers to drop optional log output altogether.
+
+    A RetryAfter on a call to a chat pauses that chat's bucket, which every
+    later call to the chat waits out; one without a chat pauses the global
+    bucket, so every queued call waits instead of running into the limit.
+    The error is still raised to the caller, whose retry then queues
+    behind the pause.
+    """
+
+    _UNLIMITED_METHODS = frozenset({"getUpdates"})
+    _MESSAGE_METHOD_PREFIXES = ("send", "forward", "copy")
+    _MODERATION_METHODS = frozenset(
+        {
+            "banChatMember",
+            "unbanChatMember",
+            "restrictChatMember",
+            "banChatSenderChat",
+            "unbanChatSenderChat",
+            "deleteMessage",
+            "deleteMessages",
+            "declineChatJoinRequest",
+            "answerCallbackQuery",
+        }
+    )
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        group_rate_per_minute: float = 20,
+        private_rate: float = 1,
+        log_chat_ids: Iterable[Any] = (),
+        log_shed_waiting: int = 50,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.bucket = TokenBucket(global_rate)
+        self.group_rate = group_rate_per_minute / 60
+        self.group_capacity = group_rate_per_minute
+        self.private_rate = private_rate
+        self.log_chat_ids = {chat_id for chat_id in log_chat_ids if chat_id is not None}
+        self.log_shed_waiting = max(log_shed_waiting, 1)
+        self._logger = logger or logging.getLogger(__name__)
+        # chat_id -> TokenBucket; idle chats are forgotten (a fresh bucket starts full anyway)
+        self._chat_buckets = ExpiringDict(ttl=600, max_entries=10000)
+        self.lanes: Dict[OutboundLane, Dict[str, Any]] = {
+            lane: {"waiting": 0, "max_waiting": 0, "calls": 0, "delayed": 0, "wait_seconds": 0.0, "max_wait": 0.0, "shed": 0}
+            for lane in OutboundLane
+        }
+        self.retry_afters = 0
+        self.methods: Dict[str, int] = {}
+        self.shed: Dict[str, int] = {}
+
+    def _chat_bucket(self, chat_id: Any) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if isinstance(chat_id, int) and chat_id > 0:
+                bucket = TokenBucket(self.private_rate)
+            else:
+                # Groups, channels and @username targets
+                bucket = TokenBucket(self.group_rate, self.group_capacity)
+        # Set again on every use so an active chat's bucket doesn't expire
+        self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def lane_of(self, api_method: str, chat_id: Any) -> OutboundLane:
+        """Return the lane of a call (the outbound_lane() hint wins)."""
+        hint = _LANE_HINT.get()
+        if hint is not None:
+            return hint
+        if api_method in self._MODERATION_METHODS:
+            return OutboundLane.MODERATION
+        if chat_id in self.log_chat_ids:
+            return OutboundLane.LOG
+        return OutboundLane.ALERT
+
+    def should_shed(self, kind: str) -> bool:
+        """Return True (and count it) if optional log output of this kind should be dropped now."""
+        lane = self.lanes[OutboundLane.LOG]
+        if lane["waiting"] < self.log_shed_waiting:
+            return False
+        lane["shed"] += 1
+        self.shed[kind] = self.shed.get(kind, 0) + 1
+        return True
+
+    async def __call__(self, make_request, bot, method):
+        api_method = getattr(method, "__api_method__", type(method).__name__)
+        if api_method in self._UNLIMITED_METHODS:
+            return await make_request(bot, method)
+
+        self.methods[api_method] = self.methods.get(api_method, 0) + 1
+        chat_id = getattr(method, "chat_id", None)
+        lane = self.lane_of(api_method, chat_id)
+        counters = self.lanes[lane]
+        counters["calls"] += 1
+        started = time.monotonic()
+        counters["waiting"] += 1
+        counters["max_waiting"] = max(counters["max_waiting"], counters["waiting"])
+        try:
+            if chat_id is not None and api_method.startswith(self._MESSAGE_METHOD_PREFIXES):
+                await self._chat_bucket(chat_id).acquire(lane)
+            elif chat_id is not None:
+                # Not rate limited per chat, but a flood limit on the chat still applies
+                chat_bucket = self._chat_buckets.get(chat_id)
+                if chat_bucket is not None:
+                    await chat_bucket.wait_unpaused()
+            await self.bucket.acquire(lane)
+        finally:
+            counters["waiting"] -= 1
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            counters["delayed"] += 1
+            counters["wait_seconds"] += waited
+            counters["max_wait"] = max(counters["max_wait"], waited)
+
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter as e:
+            self.retry_afters += 1
+            if chat_id is not None:
+                self._chat_bucket(chat_id).pause(e.retry_after)
+                self._logger.warning(
+                    "Flood limit on %s: calls to chat %s paused for %s seconds",
+                    api_method,
+                    chat_id,
+                    e.retry_after,
+                )
+            else:
+                self.bucket.pause(e.retry_after)
+                self._logger.warning(
+                    "Flood limit on %s: all Bot API calls paused for %s seconds",
+                    api_method,
+                    e.retry_after,
+                )
+            raise
+
+    def stats(self) -> dict:
+        """Return scheduler counters (per lane) for logging."""
+        lanes = {}
+        for lane, counters in self.lanes.items():
+            lanes[lane.name] = {
+                "waiting": counters["waiting"],
+                "max_waiting": counters["max_waiting"],
+                "calls": counters["calls"],
+                "delayed": counters["delayed"],
+                "avg_wait_ms": (
+                    round(counters["wait_seconds"] / counters["delayed"] * 1000, 1) if counters["delayed"] else 0.0
+                ),
+                "max_wait_s": round(counters["max_wait"], 2),
+                "shed": counters["shed"],
+            }
+        return {
+            "lanes": lanes,
+            "retry_afters": self.retry_afters,
+            "chat_buckets": len(self._chat_buckets),
+            "shed": dict(self.shed),
+            "top_methods": dict(sorted(self.methods.items(), key=lambda item: -item[1])[:5]),
+        }
@@ -0,0 +1,230 @@
+#! module utils_scheduler
+"""utils_scheduler.py
+This module provides a single due-time scheduler that replaces long-lived
+sleeping tasks (one per monitored user) with one heap of next-due times.
+Classes:
+    ScheduledJob:
+        A keyed job with its next due time (epoch seconds) and payload.
+    DueTimeScheduler:
+        Heap-based scheduler that dispatches due jobs in batches with bounded
+        concurrency and supports schedule/reschedule/cancel/inspect by key.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class ScheduledJob:
+    """A scheduled job; payload is owned and mutated by the handler."""
+    key: Hashable
+    due_at: float
+    payload: Any = None
+    running: bool = False
+    cancelled: bool = False
+    runs: int = 0
+    failures: int = 0  # consecutive failed runs of the current step
+    created_at: float = field(default_factory=time.time)
+
+
+class DueTimeScheduler:
+    """Dispatch keyed jobs when their due time (time.time() based) is reached.
+
+    ``handler(job)`` performs one run of a job and returns the next due time
+    (epoch seconds) or None when the job is finished. At most one job per
+    key exists; scheduling an existing key replaces it. Stale heap entries
+    are skipped lazily instead of being removed on cancel/reschedule.
+
+    A run that raises is retried after ``retry_delays[n]`` seconds (n-th
+    consecutive failure); once they are used up, ``on_give_up(job, error)``
+    decides like the handler (next due time or None). Without it the job
+    is dropped.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[ScheduledJob], Awaitable[Optional[float]]],
+        max_concurrency: int = 20,
+        logger: Optional[logging.Logger] = None,
+        name: str = "scheduler",
+        retry_delays: Sequence[float] = (30, 120, 600),
+        on_give_up: Optional[Callable[[ScheduledJob, Exception], Awaitable[Optional[float]]]] = None,
+    ):
+        self._handler = handler
+        self.retry_delays = tuple(retry_delays)
+        self._on_give_up = on_give_up
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._logger = logger or logging.getLogger(__name__)
+        self.name = name
+        self._jobs: Dict[Hashable, ScheduledJob] = {}
+        self._heap: List[Tuple[float, int, ScheduledJob]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._in_flight: set = set()
+        self.dispatched = 0
+        self.failed = 0
+        self.retried = 0
+        self.given_up = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._jobs
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _push(self, job: ScheduledJob):
+        heapq.heappush(self._heap, (job.due_at, next(self._seq), job))
+        # Wake the runner only if this job is now the earliest one
+        if self._heap[0][2] is job:
+            self._wakeup.set()
+
+    def schedule(self, key: Hashable, due_at: float, payload: Any = None) -> ScheduledJob:
+        """Schedule payload under key at due_at, replacing any existing job for key."""
+        self.cancel(key)
+        job = ScheduledJob(key=key, due_at=due_at, payload=payload)
+        self._jobs[key] = job
+        self._push(job)
+        return job
+
+    def reschedule(self, key: Hashable, due_at: float) -> bool:
+        """Move the job for key to a new due time, return False if there is none."""
+        job = self._jobs.get(key)
+        if job is None:
+            return False
+        job.due_at = due_at
+        if not job.running:
+            self._push(job)
+        return True
+
+    def cancel(self, key: Hashable) -> Optional[ScheduledJob]:
+        """Remove the job for key; a run already in progress is not interrupted."""
+        job = self._jobs.pop(key, None)
+        if job is not None:
+            job.cancelled = True
+        return job
+
+    def get(self, key: Hashable) -> Optional[ScheduledJob]:
+        """Return the job scheduled for key, if any."""
+        return self._jobs.get(key)
+
+    def jobs(self) -> List[ScheduledJob]:
+        """Return all jobs ordered by due time."""
+        return sorted(self._jobs.values(), key=lambda job: job.due_at)
+
+    def stats(self) -> dict:
+        """Return scheduler counters for logging."""
+        upcoming = min((job.due_at for job in self._jobs.values()), default=None)
+        return {
+            "jobs": len(self._jobs),
+            "running": len(self._in_flight),
+            "next_due_in": round(upcoming - time.time(), 1) if upcoming else None,
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+            "retried": self.retried,
+            "given_up": self.given_up,
+        }
+
+    def start(self):
+        """Start the dispatch loop (idempotent)."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self):
+        """Stop dispatching and cancel runs in progress; schedules are kept."""
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        for task in list(self._in_flight):
+            task.cancel()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _pop_due(self, now: float) -> List[ScheduledJob]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, _, job = heapq.heappop(self._heap)
+            # Skip entries left behind by cancel/reschedule/replace
+            if self._jobs.get(job.key) is not job or job.running or job.due_at != due_at:
+                continue
+            job.running = True
+            due.append(job)
+        return due
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            for job in self._pop_due(now):
+                task = asyncio.create_task(self._run_job(job), name=f"{self.name}:{job.key}")
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+            if self._heap:
+                delay = max(self._heap[0][0] - time.time(), 0)
+            else:
+                delay = None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: ScheduledJob):
+        next_due = None
+        dispatched_due_at = job.due_at
+        async with self._semaphore:
+            self.dispatched += 1
+            job.runs += 1
+            try:
+                next_due = await self._handler(job)
+                job.failures = 0
+            except Exception as e:  # pylint: disable=broad-except
+                # One failing job must not stop the scheduler: retry it later
+                self.failed += 1
+                next_due = await self._after_failure(job, e)
+            finally:
+                job.running = False
+        if job.cancelled or self._jobs.get(job.key) is not job:
+            return
+        if job.due_at != dispatched_due_at:
+            # reschedule() was called while the job was running - it wins
+            self._push(job)
+            return
+        if next_due is None:
+            self._jobs.pop(job.key, None)
+            return
+        job.due_at = next_due
+        self._push(job)
+
+    async def _after_failure(self, job: ScheduledJob, error: Exception) -> Optional[float]:
+        job.failures += 1
+        if job.failures <= len(self.retry_delays):
+            delay = self.retry_delays[job.failures - 1]
+            self.retried += 1
+            self._logger.warning(
+                "%s job %s raised %s: %s - retry %d/%d in %ss",
+                self.name, job.key, type(error).__name__, error,
+                job.failures, len(self.retry_delays), delay,
+            )
+            return time.time() + delay
+        self.given_up += 1
+        self._logger.error(
+            "%s job %s raised %s: %s - giving up after %d retries",
+            self.name, job.key, type(error).__name__, error, len(self.retry_delays),
+        )
+        job.failures = 0
+        if self._on_give_up is None:
+            return None
+        try:
+            return await self._on_give_up(job, error)
+        except Exception as e:  # pylint: disable=broad-except
+            self._logger.error("%s give-up handler for job %s raised %s: %s", self.name, job.key, type(e).__name__, e)
+            return None
@@ -0,0 +1,222 @@
+#! module utils_spamwave
+"""utils_spamwave.py
+This module detects coordinated spam waves: the same text with small
+mutations (an emoji, spacing, lookalike letters) posted by several new
+accounts across the monitored chats within minutes.
+Functions:
+    minhash_signature(text: str, num_perm: int) -> Optional[tuple]:
+        MinHash signature of the character 5-gram shingles of text.
+Classes:
+    SpamWave:
+        A detected wave: the near-identical messages and who posted them.
+    SpamWaveDetector:
+        In-memory LSH index (banded MinHash) over a sliding time window,
+        bounded by entry count and age.
+"""
+
+import random
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+_SHINGLE_SIZE = 5
+_MERSENNE_PRIME = (1 << 61) - 1
+# Fixed seed: signatures must be comparable for the lifetime of the process
+_RANDOM = random.Random(0x5BA7)
+_PERMUTATIONS = [
+    (_RANDOM.randrange(1, _MERSENNE_PRIME), _RANDOM.randrange(0, _MERSENNE_PRIME))
+    for _ in range(128)
+]
+
+
+def _normalize(text: str) -> str:
+    """Lowercase words only: emoji, punctuation and spacing changes don't count."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def minhash_signature(text: str, num_perm: int = 32, min_length: int = 0) -> Optional[tuple]:
+    """Return the MinHash signature of text, or None if it is shorter than min_length.
+
+    text should already be canonicalized (utils.canonicalize_text) so
+    homoglyph variants produce the same shingles. The share of equal
+    positions of two signatures estimates the Jaccard similarity of their
+    shingle sets.
+    """
+    normalized = _normalize(text or "")
+    if len(normalized) < max(min_length, _SHINGLE_SIZE):
+        return None
+    hashes = {
+        zlib.crc32(normalized[i : i + _SHINGLE_SIZE].encode("utf-8"))
+        for i in range(len(normalized) - _SHINGLE_SIZE + 1)
+    }
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS[:num_perm]
+    )
+
+
+def _similarity(left: tuple, right: tuple) -> float:
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+@dataclass
+class _WaveEntry:
+    seen_at: float
+    chat_id: int
+    message_id: int
+    user_id: int
+    signature: tuple
+    flagged: bool = False
+
+
+@dataclass
+class SpamWave:
+    """Near-identical messages from min_users users in min_chats chats.
+
+    new is True only for the message that completed the wave; later
+    messages joining it are reported with new=False.
+    """
+    members: List[Tuple[int, int, int]] = field(default_factory=list)  # (chat_id, message_id, user_id), oldest first
+    similarity: float = 1.0  # lowest estimated similarity to the latest message
+    new: bool = True
+
+    @property
+    def user_ids(self) -> Set[int]:
+        return {user_id for _, _, user_id in self.members}
+
+    @property
+    def chat_ids(self) -> Set[int]:
+        return {chat_id for chat_id, _, _ in self.members}
+
+
+class SpamWaveDetector:
+    """Banded MinHash LSH index of recent messages from new users.
+
+    Each signature is split into ``bands`` bands of ``rows`` values; two
+    messages become candidates when any band is equal, and count as
+    near-identical when the estimated similarity is at least
+    ``similarity``. Entries older than ``window_seconds`` are evicted on
+    every add, and the oldest ones are dropped beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = 900,
+        min_users: int = 3,
+        min_chats: int = 2,
+        similarity: float = 0.7,
+        max_entries: int = 5000,
+        min_text_length: int = 40,
+        bands: int = 8,
+        rows: int = 4,
+    ):
+        self.window_seconds = window_seconds
+        self.min_users = min_users
+        self.min_chats = min_chats
+        self.similarity = similarity
+        self.max_entries = max_entries
+        self.min_text_length = min_text_length
+        self.bands = bands
+        self.rows = rows
+        self._seq = 0
+        # entry id -> entry, in arrival order (so eviction pops from the front)
+        self._entries: "OrderedDict[int, _WaveEntry]" = OrderedDict()
+        # (band index, band values) -> entry ids
+        self._buckets: Dict[Tuple[int, tuple], Set[int]] = {}
+        self.indexed = 0
+        self.waves = 0
+        self.flagged = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, signature: tuple):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows : (band + 1) * self.rows]
+
+    def _evict(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._entries:
+            entry_id, entry = next(iter(self._entries.items()))
+            if entry.seen_at >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[entry_id]
+            for key in self._band_keys(entry.signature):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(entry_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def add(
+        self,
+        text: str,
+        chat_id: int,
+        message_id: int,
+        user_id: int,
+        now: Optional[float] = None,
+    ) -> Optional[SpamWave]:
+        """Index a message and return the SpamWave it belongs to, if any.
+
+        text should be the canonical message text. Messages shorter than
+        min_text_length are ignored (short greetings repeat naturally).
+        """
+        now = time.time() if now is None else now
+        self._evict(now)
+        signature = minhash_signature(text, self.bands * self.rows, self.min_text_length)
+        if signature is None:
+            return None
+
+        candidate_ids = set()
+        for key in self._band_keys(signature):
+            candidate_ids.update(self._buckets.get(key, ()))
+        matches = []
+        lowest = 1.0
+        for entry_id in candidate_ids:
+            entry = self._entries[entry_id]
+            similarity = _similarity(signature, entry.signature)
+            if similarity >= self.similarity:
+                matches.append((entry_id, entry))
+                lowest = min(lowest, similarity)
+
+        self._seq += 1
+        entry = _WaveEntry(now, chat_id, message_id, user_id, signature)
+        self._entries[self._seq] = entry
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(self._seq)
+        self.indexed += 1
+        self._evict(now)
+
+        matches.sort()
+        cluster = [matched for _, matched in matches] + [entry]
+        if (
+            len({member.user_id for member in cluster}) < self.min_users
+            or len({member.chat_id for member in cluster}) < self.min_chats
+        ):
+            return None
+        newly_flagged = [member for member in cluster if not member.flagged]
+        new = len(newly_flagged) == len(cluster)
+        for member in newly_flagged:
+            member.flagged = True
+        self.waves += new
+        # A new wave flags its whole cluster at once; later ones add the new message
+        self.flagged += len(newly_flagged)
+        return SpamWave(
+            members=[(member.chat_id, member.message_id, member.user_id) for member in cluster],
+            similarity=lowest,
+            new=new,
+        )
+
+    def stats(self) -> dict:
+        """Return index counters for logging."""
+        return {
+            "entries": len(self._entries),
+            "buckets": len(self._buckets),
+            "indexed": self.indexed,
+            "waves": self.waves,
+            "flagged_messages": self.flagged,
+        }
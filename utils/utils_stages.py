@@ -0,0 +1,105 @@
+#! module utils_stages
+"""utils_stages.py
+This module provides a cheap-first check runner for the message handler:
+checks are declared as stages with a cost hint and always run from the
+cheapest to the most expensive, stopping at the first verdict.
+Classes:
+    StageCost:
+        Cost classes in execution order (memory, local, DB, network).
+    Stage:
+        One declared check with its counters.
+    StagedChecks:
+        Ordered collection of stages; run() returns the first verdict and
+        records per-stage runs, verdicts and time spent.
+"""
+
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class StageCost(IntEnum):
+    """Cost hint of a stage; stages run in this order."""
+    MEMORY = 0  # in-process sets/dicts
+    LOCAL = 1  # regex / parsing / feature checks on the message itself
+    DB = 2  # SQLite queries
+    NETWORK = 3  # Bot API or HTTP calls (even if usually cached)
+
+
+@dataclass
+class Stage:
+    """A declared check; check(*args) returns a verdict or None to go on."""
+    name: str
+    cost: StageCost
+    check: Callable[..., Any]
+    runs: int = 0
+    verdicts: int = 0
+    seconds: float = 0.0
+
+
+class StagedChecks:
+    """Run declared stages cheapest first until one returns a verdict.
+
+    Stages are kept sorted by (cost, declaration order), so declaring a
+    network stage before a memory one can't make the network call run
+    first. A check may be a plain function or a coroutine function.
+    """
+
+    def __init__(self, name: str = "stages", logger: Optional[logging.Logger] = None):
+        self.name = name
+        self._logger = logger or logging.getLogger(__name__)
+        self._stages: List[Stage] = []
+        self.runs = 0
+        self.no_verdict = 0
+
+    def stage(self, name: str, cost: StageCost):
+        """Decorator declaring check as a stage named name with the given cost hint."""
+
+        def register(check: Callable[..., Any]) -> Callable[..., Any]:
+            if any(stage.name == name for stage in self._stages):
+                raise ValueError(f"{self.name}: stage {name} is already declared")
+            self._stages.append(Stage(name, StageCost(cost), check))
+            # sort() is stable: declaration order is kept within a cost class
+            self._stages.sort(key=lambda stage: stage.cost)
+            return check
+
+        return register
+
+    async def run(self, *args, **kwargs) -> Tuple[Optional[str], Any]:
+        """Return (stage name, verdict) of the first stage with a verdict, or (None, None)."""
+        self.runs += 1
+        for stage in self._stages:
+            started = time.perf_counter()
+            verdict = stage.check(*args, **kwargs)
+            if inspect.isawaitable(verdict):
+                verdict = await verdict
+            stage.seconds += time.perf_counter() - started
+            stage.runs += 1
+            if verdict is not None:
+                stage.verdicts += 1
+                return stage.name, verdict
+        self.no_verdict += 1
+        return None, None
+
+    def order(self) -> List[str]:
+        """Return "name:COST" for every stage in execution order."""
+        return [f"{stage.name}:{stage.cost.name}" for stage in self._stages]
+
+    def stats(self) -> dict:
+        """Return per-stage counters for logging."""
+        return {
+            "runs": self.runs,
+            "no_verdict": self.no_verdict,
+            "stages": {
+                stage.name: {
+                    "cost": stage.cost.name,
+                    "runs": stage.runs,
+                    "verdicts": stage.verdicts,
+                    "avg_ms": round(stage.seconds / stage.runs * 1000, 3) if stage.runs else 0.0,
+                }
+                for stage in self._stages
+            },
+        }
@@ -0,0 +1,147 @@
+#! module utils_webhook
+"""utils_webhook.py
+This module runs the dispatcher in webhook mode: an aiohttp server receives
+updates from Telegram (or from a reverse proxy in front of it) and feeds
+them into the same dispatcher the polling mode uses.
+Functions:
+    build_webhook_app(dispatcher: Dispatcher, bot: Bot, path: str, secret_token: str) -> web.Application:
+        aiohttp application with the update endpoint and the dispatcher
+        startup/shutdown hooks.
+    run_webhook(dispatcher: Dispatcher, bot: Bot, ...):
+        Serve the application, register the webhook with Telegram and run
+        until SIGINT/SIGTERM.
+
+Local testing: run with UPDATES_MODE=webhook and no WEBHOOK_BASE_URL, then
+POST a recorded update (the JSON of one Update object):
+
+    curl -X POST http://127.0.0.1:8090/telegram/webhook \\
+         -H "Content-Type: application/json" \\
+         -H "X-Telegram-Bot-Api-Secret-Token: $WEBHOOK_SECRET" \\
+         --data @update.json
+"""
+
+import asyncio
+import logging
+import re
+import secrets
+import signal
+import ssl
+from typing import List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import FSInputFile
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+# Telegram accepts 1-256 characters A-Z, a-z, 0-9, _ and -
+_SECRET_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{1,256}$")
+
+
+def build_webhook_app(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    path: str,
+    secret_token: str,
+    handle_in_background: bool = True,
+) -> web.Application:
+    """Return the aiohttp application serving updates on path.
+
+    Requests without the matching X-Telegram-Bot-Api-Secret-Token header are
+    rejected with 401. With handle_in_background updates are answered
+    immediately and processed in background tasks; without it the response
+    waits for the dispatcher, which with a queueing middleware means until
+    the update is accepted, so Telegram's max_connections limits the backlog.
+    """
+    app = web.Application()
+    # Dispatcher startup/shutdown hooks (on_startup/on_shutdown) run with the app;
+    # registered before the request handler so the bot session is closed last
+    setup_application(app, dispatcher, bot=bot)
+    SimpleRequestHandler(
+        dispatcher=dispatcher,
+        bot=bot,
+        secret_token=secret_token,
+        handle_in_background=handle_in_background,
+    ).register(app, path=path)
+    return app
+
+
+async def run_webhook(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    path: str = "/telegram/webhook",
+    host: str = "127.0.0.1",
+    port: int = 8090,
+    base_url: Optional[str] = None,
+    secret_token: Optional[str] = None,
+    ssl_cert: Optional[str] = None,
+    ssl_key: Optional[str] = None,
+    allowed_updates: Optional[List[str]] = None,
+    max_connections: int = 40,
+    handle_in_background: bool = True,
+    logger: Optional[logging.Logger] = None,
+):
+    """Serve updates on host:port until SIGINT/SIGTERM.
+
+    With base_url set the webhook base_url + path is registered with
+    Telegram once the dispatcher startup hooks have finished (pending
+    updates are dropped, as in polling mode). Without it nothing is
+    registered, which is the local testing / manual proxy setup.
+
+    ssl_cert and ssl_key make the server speak TLS itself (no reverse
+    proxy); the certificate is uploaded to Telegram so self-signed ones work.
+    Behind a reverse proxy leave them unset and listen on localhost.
+    """
+    logger = logger or logging.getLogger(__name__)
+    generated_secret = secret_token is None
+    if generated_secret:
+        # Re-registered on every start, so a per-run secret is enough
+        secret_token = secrets.token_urlsafe(32)
+    elif not _SECRET_TOKEN_RE.match(secret_token):
+        raise ValueError("WEBHOOK_SECRET must be 1-256 characters of A-Z, a-z, 0-9, _ and -")
+
+    ssl_context = None
+    if ssl_cert and ssl_key:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(ssl_cert, ssl_key)
+
+    app = build_webhook_app(dispatcher, bot, path, secret_token, handle_in_background)
+    runner = web.AppRunner(app, handle_signals=False)
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    # setup() runs the startup hooks before the socket is opened
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port, ssl_context=ssl_context).start()
+        logger.info(
+            "\033[92mWebhook server listening on %s://%s:%s%s\033[0m",
+            "https" if ssl_context else "http",
+            host,
+            port,
+            path,
+        )
+        if base_url:
+            await bot.set_webhook(
+                url=base_url.rstrip("/") + path,
+                certificate=FSInputFile(ssl_cert) if ssl_context else None,
+                max_connections=max_connections,
+                allowed_updates=allowed_updates,
+                drop_pending_updates=True,
+                secret_token=secret_token,
+            )
+            logger.info("Webhook registered: %s%s", base_url.rstrip("/"), path)
+        else:
+            logger.warning(
+                "WEBHOOK_BASE_URL is not set: webhook not registered with Telegram, "
+                "updates must be POSTed to %s by a proxy or manually%s",
+                path,
+                " (set WEBHOOK_SECRET to know the secret token)" if generated_secret else "",
+            )
+        await stop_event.wait()
+    finally:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+        # Runs the shutdown hooks, then closes the bot session
+        await runner.cleanup()